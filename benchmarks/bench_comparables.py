@@ -0,0 +1,109 @@
+"""
+Benchmark for the comparable-player index.
+- Replicates the batters table 1x, 10x and 100x with renamed, slightly jittered players
+- Times "cheaper comparables" queries: a brute-force pandas distance over the normalized table per query (the
+  notebook approach) against ComparablesIndex.comparables, and checks both return the same players and distances
+- For reference, times an unfiltered k-NN query on sklearn's KDTree built over the same vectors
+- Times inserting 1% new players into the index against rebuilding it
+
+Usage:
+    python benchmarks/bench_comparables.py [--scales 1 10 100] [--queries 200] [-k 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.clean_data import DB_PATH, get_batters_df
+from src.similarity.comparables import ComparablesIndex
+
+
+def make_table(base, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    numeric = [col for col in base.select_dtypes(include='number').columns if col != 'salary']
+    copies = []
+    for i in range(scale):
+        copy = base.copy()
+        copy[numeric] = copy[numeric].astype('float64')
+        if i:
+            copy[numeric] = copy[numeric] * rng.normal(1, 0.05, size=(len(copy), len(numeric)))
+        copy['fullName'] = copy['fullName'] + f" #{i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def brute_force(normalized, salary, names, player_name, k):
+    """
+    Per-query full-table distance with pandas, filtered to cheaper players.
+    """
+    row = names.index(player_name)
+    distances = np.sqrt(((normalized - normalized.iloc[row]) ** 2).sum(axis=1))
+    distances = distances[(salary < salary.iloc[row]).to_numpy()]
+    nearest = distances.nsmallest(k)
+    return [names[i] for i in nearest.index], nearest.to_numpy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark comparable-player queries against brute force.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database '{DB_PATH}' does not exist. Please run clean_data.py first.")
+        sys.exit(1)
+    base = get_batters_df()
+    rng = np.random.default_rng(1)
+
+    print(f"{'scale':>6} {'rows':>8} {'build ms':>9} {'brute ms/q':>11} {'index ms/q':>11} {'kdtree ms/q':>12} "
+          f"{'insert 1% ms':>13} {'rebuild ms':>11}")
+    for scale in args.scales:
+        df = make_table(base, scale)
+        start = time.perf_counter()
+        index = ComparablesIndex.build(df, 'batters')
+        build_time = time.perf_counter() - start
+
+        # The notebook view: the same scaling applied to the whole table with pandas
+        normalized = pd.DataFrame(index._scale(df), columns=index.columns)
+        names = df['fullName'].tolist()
+        queries = [names[i] for i in rng.choice(len(names), size=args.queries)]
+
+        start = time.perf_counter()
+        expected = [brute_force(normalized, df['salary'], names, name, args.k) for name in queries]
+        brute_time = time.perf_counter() - start
+        start = time.perf_counter()
+        results = [index.comparables(name, args.k, cheaper=True) for name in queries]
+        index_time = time.perf_counter() - start
+        for (expected_names, expected_distances), result in zip(expected, results):
+            np.testing.assert_allclose(result['distance'].to_numpy(), expected_distances, atol=1e-9)
+            # Players with identical stat lines tie, in either order
+            assert (sorted(zip(result['distance'].round(9), result['fullName']))
+                    == sorted(zip(np.round(expected_distances, 9), expected_names)))
+
+        vectors = normalized.to_numpy()
+        tree = KDTree(vectors)
+        start = time.perf_counter()
+        for name in queries:
+            tree.query(vectors[names.index(name)][None, :], k=args.k + 1)
+        tree_time = time.perf_counter() - start
+
+        extra = make_table(base, 1, seed=scale).sample(max(1, len(df) // 100), random_state=0)
+        extra['fullName'] = extra['fullName'] + " (new)"
+        start = time.perf_counter()
+        index.add(extra)
+        insert_time = time.perf_counter() - start
+        start = time.perf_counter()
+        ComparablesIndex.build(pd.concat([df, extra], ignore_index=True), 'batters')
+        rebuild_time = time.perf_counter() - start
+
+        per_query = 1e3 / len(queries)
+        print(f"{scale:>5}x {len(df):>8} {build_time * 1e3:>9.1f} {brute_time * per_query:>11.2f} "
+              f"{index_time * per_query:>11.3f} {tree_time * per_query:>12.3f} {insert_time * 1e3:>13.2f} "
+              f"{rebuild_time * 1e3:>11.1f}")
@@ -0,0 +1,108 @@
+"""
+Benchmark for the SQLite storage layer.
+- Builds two copies of the batters table, replicated 1x, 10x and 100x with renamed players: one written the old
+  way (to_sql, no indexes) and one written the way the cleaner now writes it (bulk insert, WAL, indexes)
+- Times per-player lookups: a new connection and a full scan per call, against db.player_rows on the reused
+  connection with an index seek
+- Times the season filter (year = ? AND salary > 0) on both copies and checks both paths return the same rows;
+  batters only holds the 2024 season, so this mostly shows the index does not slow a filter that matches most rows
+
+Usage:
+    python benchmarks/bench_db.py [--scales 1 10 100] [--lookups 2000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.clean_data import DB_PATH, save_table
+from src.data.db import PLAYER_ROWS_SQL, finish_writes, player_rows, query_plan, read_connection, write_connection
+
+SEASON_SQL = 'SELECT * FROM "batters" WHERE year = ? AND salary > 0'
+
+
+def make_table(base, scale):
+    copies = []
+    for i in range(scale):
+        copy = base.copy()
+        copy['fullName'] = copy['fullName'] + f" #{i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def write_plain(df, path):
+    """
+    The previous storage: default to_sql, no indexes.
+    """
+    conn = sqlite3.connect(path)
+    df.to_sql('batters', conn, index=False)
+    conn.close()
+
+
+def write_tuned(df, path):
+    conn = write_connection(path)
+    save_table(conn, 'batters', df, set(), replace=True)
+    finish_writes(conn)
+
+
+def lookup_plain(path, name):
+    conn = sqlite3.connect(path)
+    rows = conn.execute(PLAYER_ROWS_SQL.format(table='batters'), (name,)).fetchall()
+    conn.close()
+    return rows
+
+
+def time_calls(fn, args_list):
+    start = time.perf_counter()
+    results = [fn(*args) for args in args_list]
+    return time.perf_counter() - start, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark indexed, reused-connection SQLite lookups.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--lookups', type=int, default=2000, help='Player lookups per scale')
+    args = parser.parse_args()
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database '{DB_PATH}' does not exist. Please run clean_data.py first.")
+        sys.exit(1)
+    base = pd.read_sql_query('SELECT * FROM "batters"', sqlite3.connect(DB_PATH))
+    rng = random.Random(0)
+
+    print(f"{'scale':>6} {'rows':>8} {'plain us/lookup':>16} {'tuned us/lookup':>16} "
+          f"{'plain ms/season':>16} {'tuned ms/season':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            df = make_table(base, scale)
+            plain_path = os.path.join(tmp, f"plain_{scale}.db")
+            tuned_path = os.path.join(tmp, f"tuned_{scale}.db")
+            write_plain(df, plain_path)
+            write_tuned(df, tuned_path)
+
+            names = [(rng.choice(df['fullName'].tolist()),) for _ in range(args.lookups)]
+            plain_time, plain_rows = time_calls(lambda name: lookup_plain(plain_path, name), names)
+            tuned_time, tuned_rows = time_calls(lambda name: player_rows('batters', name, tuned_path).fetchall(),
+                                                names)
+            assert plain_rows == tuned_rows
+
+            years = [(2024,)] * 20
+            plain_conn = sqlite3.connect(plain_path)
+            plain_season, plain_result = time_calls(lambda y: plain_conn.execute(SEASON_SQL, (y,)).fetchall(), years)
+            plain_conn.close()
+            tuned_conn = read_connection(tuned_path)
+            tuned_season, tuned_result = time_calls(lambda y: tuned_conn.execute(SEASON_SQL, (y,)).fetchall(), years)
+            assert sorted(plain_result[0]) == sorted(tuned_result[0])
+
+            print(f"{scale:>5}x {len(df):>8} {plain_time / len(names) * 1e6:>16.1f} "
+                  f"{tuned_time / len(names) * 1e6:>16.1f} {plain_season / len(years) * 1e3:>16.2f} "
+                  f"{tuned_season / len(years) * 1e3:>16.2f}")
+        print("Lookup plan:", '; '.join(query_plan(PLAYER_ROWS_SQL.format(table='batters'), ('x',), tuned_path)))
+        print("Season plan:", '; '.join(query_plan(SEASON_SQL, (2024,), tuned_path)))
@@ -0,0 +1,56 @@
+"""
+Parse-time benchmark for the targeted fragment extractor.
+- Parses every page in data/raw with the frozen baseline full-page parse (tests/baseline_extract.py) and the
+  fragment extractor
+- Fails if any page's salary or 2024 pitching/batting row differs from the baseline (tests/test_extract.py checks
+  the same on a sample of pages, including every season row)
+- Reports per-file parse times and the overall speedup
+
+Usage:
+    python benchmarks/bench_extract.py [--limit N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.extract import STATS_SEASON, extract_player_stats
+from tests.baseline_extract import baseline_extract
+
+
+def time_call(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare fragment extraction with the baseline full-page parse.")
+    parser.add_argument('--raw-dir', default='data/raw')
+    parser.add_argument('--limit', type=int, default=None, help='Only check the first N files')
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(args.raw_dir) if f.endswith('.html'))[:args.limit]
+    full_times, fragment_times, mismatches = [], [], []
+    for filename in files:
+        with open(os.path.join(args.raw_dir, filename), 'r', encoding='utf-8') as f:
+            html = f.read()
+        player_name = filename[:-len('.html')]
+        (salary, rows), full_time = time_call(baseline_extract, html, player_name)
+        actual, fragment_time = time_call(extract_player_stats, html, player_name)
+        full_times.append(full_time)
+        fragment_times.append(fragment_time)
+        if (actual['salary'], actual['pitching'], actual['batting']) != (
+                salary, rows['pitching'].get(STATS_SEASON), rows['batting'].get(STATS_SEASON)):
+            mismatches.append(filename)
+
+    print(f"Files checked: {len(files)}")
+    print(f"Baseline parse: median {statistics.median(full_times) * 1000:.1f} ms/file, total {sum(full_times):.1f}s")
+    print(f"Fragment parse: median {statistics.median(fragment_times) * 1000:.1f} ms/file, total {sum(fragment_times):.1f}s")
+    print(f"Speedup: {sum(full_times) / sum(fragment_times):.1f}x")
+    if mismatches:
+        sys.exit(f"Parity failed for {len(mismatches)} files: {mismatches[:10]}")
+    print("Parity: all files match the baseline parse")
@@ -0,0 +1,111 @@
+"""
+Benchmarks the concurrent fetcher against a local stand-in for Baseball-Reference.
+- Serves synthetic player pages from a localhost HTTP server with artificial latency
+- Compares one-at-a-time fetching with the pooled, rate-limited ConcurrentFetcher
+- Checks that the per-host request rate never exceeds the configured limit
+
+Usage:
+    python benchmarks/bench_fetch.py [--pages 40] [--latency 0.2] [--rate 10] [--workers 8]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.fetcher import ConcurrentFetcher
+
+PAGE = ("<html><body><div id=\"meta\"><p>Contract Status: 1 yr/$1M</p></div>"
+        + "x" * 50_000 + "</body></html>").encode("utf-8")
+
+
+def start_server(latency):
+    """
+    Starts a threaded localhost server that answers every GET after `latency` seconds
+    and records the time each request arrived.
+
+    Returns:
+        tuple: (server, arrivals) where arrivals is the list of request arrival times.
+    """
+    arrivals = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            arrivals.append(time.monotonic())
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, arrivals
+
+
+def bench_sequential(base_url, pages, rate):
+    start = time.monotonic()
+    for i in range(pages):
+        requests.get(f"{base_url}/players/{i}.shtml")
+        time.sleep(1 / rate)
+    return pages / (time.monotonic() - start)
+
+
+def bench_concurrent(base_url, pages, rate, workers):
+    fetcher = ConcurrentFetcher(max_workers=workers, rate=rate)
+    items = [(i, f"{base_url}/players/{i}.shtml") for i in range(pages)]
+    for _ in fetcher.fetch_many(items):
+        pass
+    fetcher.close()
+    return fetcher.stats
+
+
+def max_observed_rate(arrivals):
+    """
+    Largest number of requests seen in any one-second window, less the allowed burst of one.
+    """
+    arrivals = sorted(arrivals)
+    worst = 0
+    j = 0
+    for i, t in enumerate(arrivals):
+        while arrivals[j] < t - 1.0:
+            j += 1
+        worst = max(worst, i - j)
+    return worst
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the concurrent fetcher on localhost.")
+    parser.add_argument('--pages', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.2, help='Simulated server latency in seconds')
+    parser.add_argument('--rate', type=float, default=10.0, help='Requests per second per host')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server, arrivals = start_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    seq_rate = bench_sequential(base_url, args.pages, args.rate)
+    print(f"Sequential: {seq_rate:.2f} pages/sec")
+
+    arrivals.clear()
+    stats = bench_concurrent(base_url, args.pages, args.rate, args.workers)
+    print(f"Concurrent ({args.workers} workers): {stats.summary()}")
+    print(f"Speedup: {stats.pages_per_sec / seq_rate:.1f}x")
+
+    observed = max_observed_rate(arrivals)
+    print(f"Max requests in any 1s window: {observed} (limit {args.rate:g}/s)")
+    server.shutdown()
+    if observed > args.rate:
+        sys.exit("Rate limit exceeded")
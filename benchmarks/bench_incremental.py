@@ -0,0 +1,88 @@
+"""
+Benchmark of incremental WAR model updates against full refits.
+- Builds a batters table replicated 1x, 10x and 100x with small noise, then changes --changed rows (new stat lines
+  for existing players), adds and removes a few players
+- Full refit: fit the FeatureTransformer, scale every row and fit LinearRegression (what train_model does)
+- Update: diff against the saved state, fold the changes into the sufficient statistics and solve
+- Reports both times and the largest coefficient difference between the two models
+
+Usage:
+    python benchmarks/bench_incremental.py [--scales 1 10 100] [--changed 20] [--repeat 5]
+"""
+
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.data_access import get_player_data
+from src.models.features import FeatureTransformer
+from src.models.incremental import build_state, state_model, update_state
+
+TARGET = 'b_war'
+
+
+def replicated_table(scale, seed=0):
+    df = get_player_data().raw('batters')
+    rng = np.random.default_rng(seed)
+    numeric = [col for col in FeatureTransformer(TARGET).fit(df).columns] + [TARGET]
+    copies = []
+    for i in range(scale):
+        copy_df = df.copy()
+        if i:
+            copy_df['fullName'] = copy_df['fullName'] + f' {i}'
+            copy_df[numeric] = copy_df[numeric].astype(float) + rng.normal(0, 0.01, (len(df), len(numeric)))
+        copies.append(copy_df)
+    return pd.concat(copies, ignore_index=True)
+
+def nightly_change(df, changed, seed=1):
+    """
+    `changed` players get new stat lines, two players drop out and two new ones appear.
+    """
+    rng = np.random.default_rng(seed)
+    new = df.copy()
+    rows = rng.choice(len(new) - 2, changed, replace=False) + 2
+    new.loc[rows, 'b_games'] = new.loc[rows, 'b_games'] + 1
+    new.loc[rows, TARGET] = new.loc[rows, TARGET] + rng.normal(0, 0.1, changed)
+    arrivals = new.iloc[:2].copy()
+    arrivals['fullName'] = arrivals['fullName'] + ' (call-up)'
+    return pd.concat([new.iloc[2:], arrivals], ignore_index=True)
+
+def full_refit(df):
+    transformer = FeatureTransformer(TARGET).fit(df)
+    return LinearRegression().fit(transformer.transform(df), transformer.transform_target(df[TARGET]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare incremental model updates with full refits.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--changed', type=int, default=20, help='Players with new stat lines')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'full refit':>11} {'update':>9} {'speedup':>8} {'max |coef diff|':>16}")
+    for scale in args.scales:
+        before = replicated_table(scale)
+        after = nightly_change(before, args.changed)
+        saved = build_state(before, TARGET)
+        refit_times, update_times = [], []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            refit = full_refit(after)
+            refit_times.append(time.perf_counter() - start)
+            state = copy.deepcopy(saved)
+            start = time.perf_counter()
+            update_state(state, after)
+            model, _ = state_model(state)
+            update_times.append(time.perf_counter() - start)
+        refit_time, update_time = statistics.median(refit_times), statistics.median(update_times)
+        diff = np.abs(refit.coef_ - model.coef_).max()
+        print(f"{len(after):>8} {refit_time:>10.4f}s {update_time:>8.4f}s {refit_time / update_time:>7.1f}x "
+              f"{diff:>16.2e}")
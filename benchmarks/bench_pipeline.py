@@ -0,0 +1,228 @@
+"""
+Per-stage pipeline benchmark on synthetic player pages.
+- Generates a synthetic corpus (see synthetic.py) for each scale, in its own workspace under --workdir
+- Times each stage on it: clean (full rebuild), clean_noop (incremental run with nothing changed), train,
+  cluster and score (update_value_labels), repeated --repeat times
+- Each scale runs in a fresh interpreter, so cached tables, models and peak RSS do not carry over between scales
+- Writes median/min times, the median of every instrumentation span, counters and peak RSS to a JSON results file
+- --compare checks the results against a file from another commit and fails if a stage got slower than --tolerance
+
+Usage:
+    python benchmarks/bench_pipeline.py [--scales 1000 10000] [--seasons 5] [--repeat 3] [--stages clean train]
+                                        [--output benchmarks/results/pipeline.json] [--compare OLD.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+from benchmarks.synthetic import write_corpus
+
+STAGES = ['clean', 'clean_noop', 'train', 'cluster', 'score']
+DEFAULT_WORKDIR = os.path.join(tempfile.gettempdir(), 'moneyball_bench')
+DEFAULT_OUTPUT = 'benchmarks/results/pipeline.json'
+DB_PATH = 'data/processed/baseball_stats.db'
+MODEL_PATHS = ['data/models/batters_model.joblib', 'data/models/pitchers_model.joblib']
+LABEL_PATHS = ['data/processed/batters_value_labels.csv', 'data/processed/pitchers_value_labels.csv']
+
+
+# ----------------------
+# Stages (run inside the scale's workspace)
+# ----------------------
+def run_stage(stage, workers):
+    # Imported here so the parent process, which only orchestrates, never loads the pipeline
+    if stage in ('clean', 'clean_noop'):
+        from src.data.clean_data import get_dataframes
+        get_dataframes(workers=workers, full_rebuild=(stage == 'clean'))
+    elif stage == 'train':
+        from src.models.train_model import train_models
+        train_models()
+    elif stage == 'cluster':
+        from src.clustering.clustering import cluster_and_visualize_value_segments
+        cluster_and_visualize_value_segments('batters')
+        cluster_and_visualize_value_segments('pitchers')
+    elif stage == 'score':
+        from src.models.get_predicted_war import update_value_labels_csv
+        update_value_labels_csv(LABEL_PATHS[0], 'batter')
+        update_value_labels_csv(LABEL_PATHS[1], 'pitcher')
+    else:
+        raise ValueError(f"unknown stage {stage!r}")
+
+def prepare(stage, workers):
+    """
+    Runs (untimed) the earlier stages whose outputs `stage` reads, if they are missing.
+    """
+    if stage != 'clean' and not os.path.exists(DB_PATH):
+        run_stage('clean', workers)
+    if stage == 'score':
+        if not all(os.path.exists(path) for path in MODEL_PATHS):
+            run_stage('train', workers)
+        if not all(os.path.exists(path) for path in LABEL_PATHS):
+            run_stage('cluster', workers)
+
+def run_scale(args):
+    """
+    Benchmarks every requested stage on one corpus size. Runs in its own process (see main).
+
+    Returns:
+        dict: stage -> {'median_sec', 'min_sec', 'runs', 'spans', 'counters', 'peak_rss_mb', 'children_peak_rss_mb'}
+    """
+    workspace = os.path.join(args.workdir, f"players_{args.run_scale}_seasons_{args.seasons}")
+    for path in ('data/processed', 'data/models', 'reports/figures'):
+        os.makedirs(os.path.join(workspace, path), exist_ok=True)
+    write_corpus(os.path.join(workspace, 'data/raw'), args.run_scale, args.seed, args.seasons, args.page_kb)
+    os.chdir(workspace)
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    from src.data.data_access import get_player_data
+    from src.instrumentation import RECORDER, configure_logging
+    configure_logging(args.log_level)
+    # Import every stage's modules up front so the first repeat does not also time library imports
+    import src.clustering.clustering
+    import src.clustering.plots
+    import src.models.get_predicted_war
+    import src.models.scoring
+    import src.models.train_model
+
+    results = {}
+    for stage in args.stages:
+        prepare(stage, args.workers)
+        runs = []
+        span_runs = {}
+        for _ in range(args.repeat):
+            # Every repeat starts from the database, not from tables cached by the previous repeat
+            get_player_data().invalidate()
+            RECORDER.reset()
+            start = time.perf_counter()
+            run_stage(stage, args.workers)
+            runs.append(time.perf_counter() - start)
+            report = RECORDER.report()
+            totals = {}
+            for span in report['spans']:
+                totals[span['path']] = totals.get(span['path'], 0) + span['duration_sec']
+            for path, seconds in totals.items():
+                span_runs.setdefault(path, []).append(seconds)
+        results[stage] = {
+            'median_sec': round(statistics.median(runs), 4),
+            'min_sec': round(min(runs), 4),
+            'runs': [round(seconds, 4) for seconds in runs],
+            'spans': {path: round(statistics.median(values), 4) for path, values in sorted(span_runs.items())},
+            'counters': report['counters'],
+            # Peaks of the last repeat's spans, so an earlier, heavier stage does not show up here
+            'peak_rss_mb': max((span['peak_rss_mb'] or 0 for span in report['spans']), default=None),
+            'children_peak_rss_mb': max((span['children_peak_rss_mb'] or 0 for span in report['spans']),
+                                        default=None),
+        }
+        print(f"  {stage:<11} median {results[stage]['median_sec']:8.3f}s  min {results[stage]['min_sec']:8.3f}s",
+              flush=True)
+    return results
+
+
+# ----------------------
+# Results
+# ----------------------
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current, baseline, tolerance):
+    """
+    Prints the per-stage median ratio against a baseline results file.
+
+    Returns:
+        list: (scale, stage, ratio) of stages slower than 1 + tolerance.
+    """
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for scale, stages in current['results'].items():
+        for stage, result in stages.items():
+            old = baseline['results'].get(scale, {}).get(stage)
+            if old is None:
+                continue
+            ratio = result['median_sec'] / old['median_sec'] if old['median_sec'] else float('inf')
+            flag = ''
+            if ratio > 1 + tolerance:
+                regressions.append((scale, stage, ratio))
+                flag = '  REGRESSION'
+            print(f"  {scale:>7} players  {stage:<11} {old['median_sec']:8.3f}s -> {result['median_sec']:8.3f}s "
+                  f"({ratio:.2f}x){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic player pages.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000], help='Numbers of players')
+    parser.add_argument('--seasons', type=int, default=5, help='Maximum seasons per player')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--page-kb', type=int, default=40, help='Approximate size of each synthetic page')
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes for the clean stage')
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help='Where the synthetic workspaces are kept')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Results file (JSON)')
+    parser.add_argument('--compare', default=None, help='Results file of another commit to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown before failing (0.2 = 20%%)')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--run-scale', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.workdir = os.path.abspath(args.workdir)
+    # Stages are timed in pipeline order, so each one finds the outputs of the previous ones
+    args.stages = [stage for stage in STAGES if stage in args.stages]
+
+    if args.run_scale is not None:
+        results = run_scale(args)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+        return
+
+    current = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'params': {'seasons': args.seasons, 'seed': args.seed, 'page_kb': args.page_kb, 'repeat': args.repeat,
+                   'workers': args.workers},
+        'results': {},
+    }
+    for scale in args.scales:
+        print(f"{scale} players:", flush=True)
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            result_file = f.name
+        command = [sys.executable, os.path.abspath(__file__), '--run-scale', str(scale), '--result-file', result_file]
+        for option in ('seasons', 'seed', 'page_kb', 'repeat', 'workers', 'workdir', 'log_level'):
+            value = getattr(args, option)
+            if value is not None:
+                command += [f"--{option.replace('_', '-')}", str(value)]
+        subprocess.run(command + ['--stages'] + args.stages, check=True)
+        with open(result_file, 'r', encoding='utf-8') as f:
+            current['results'][str(scale)] = json.load(f)
+        os.remove(result_file)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"Results saved to {args.output}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            sys.exit(f"{len(regressions)} stage(s) slower than the baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
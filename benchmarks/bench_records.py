@@ -0,0 +1,76 @@
+"""
+Scaling benchmark for the cleaning stage's record accumulation.
+- Times the old per-row pd.concat pattern against RecordBuilder at 1x, 10x and 100x the current player count
+- Reports time per row, which should stay flat for RecordBuilder (linear scaling)
+- Checks both approaches build the same DataFrame
+
+Usage:
+    python benchmarks/bench_records.py [--players 400] [--scales 1 10 100] [--concat-max 10]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.extract import BATTING_COLUMNS
+from src.data.records import RecordBuilder
+
+
+def make_records(count, seed=42):
+    """
+    Batting-shaped stat dicts; about one in ten drops 'awards' to exercise missing columns.
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {name: str(rng.randint(0, 200)) for name in BATTING_COLUMNS}
+        record['fullName'] = f"Player {i}"
+        record['salary'] = float(rng.randint(740_000, 40_000_000))
+        if i % 10 == 0:
+            del record['awards']
+        records.append(record)
+    return records
+
+
+def build_with_concat(records):
+    df_all = pd.DataFrame()
+    for record in records:
+        df_all = pd.concat([df_all, pd.DataFrame([record])], ignore_index=True)
+    return df_all
+
+
+def build_with_builder(records):
+    builder = RecordBuilder(BATTING_COLUMNS)
+    builder.extend(records)
+    return builder.to_frame()
+
+
+def timed(fn, records):
+    start = time.perf_counter()
+    result = fn(records)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-row concat against RecordBuilder.")
+    parser.add_argument('--players', type=int, default=400, help='Rows at scale 1x (about one season of batters)')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--concat-max', type=int, default=10, help='Largest scale to run the quadratic concat at')
+    args = parser.parse_args()
+
+    print(f"{'scale':>6} {'rows':>8} {'concat s':>10} {'concat us/row':>14} {'builder s':>10} {'builder us/row':>15}")
+    for scale in args.scales:
+        records = make_records(args.players * scale)
+        built, builder_time = timed(build_with_builder, records)
+        concat_cols = ('-', '-')
+        if scale <= args.concat_max:
+            concatenated, concat_time = timed(build_with_concat, records)
+            pd.testing.assert_frame_equal(built, concatenated[built.columns])
+            concat_cols = (f"{concat_time:.2f}", f"{concat_time / len(records) * 1e6:.0f}")
+        print(f"{scale:>5}x {len(records):>8} {concat_cols[0]:>10} {concat_cols[1]:>14} "
+              f"{builder_time:>10.3f} {builder_time / len(records) * 1e6:>15.1f}")
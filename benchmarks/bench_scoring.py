@@ -0,0 +1,83 @@
+"""
+Scaling benchmark for value-label scoring.
+- Times the old per-name loop (boolean scan + one-row predict per player) against scoring.score_players
+- Runs on the batters table replicated 1x, 10x and 100x (tens of thousands of rows) with renamed players
+- Adds repeated and unknown names to the request, and checks both approaches give the same WAR values
+
+Usage:
+    python benchmarks/bench_scoring.py [--scales 1 10 100] [--loop-max 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.clean_data import DB_PATH, get_batters_df
+from src.models.features import FeatureTransformer
+from src.models.scoring import score_players
+
+
+def make_table(base, scale):
+    copies = []
+    for i in range(scale):
+        copy = base.copy()
+        copy['fullName'] = copy['fullName'] + f" #{i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def score_with_loop(names, df, model, transformer):
+    """
+    The previous update_value_labels_csv pattern: one table scan and one predict per name.
+    """
+    actual_wars = []
+    predicted_wars = []
+    for name in names:
+        player_row = df[df['fullName'] == name]
+        if player_row.empty:
+            actual_wars.append(np.nan)
+            predicted_wars.append(np.nan)
+            continue
+        prediction = model.predict(transformer.transform(player_row.iloc[:1]))[0]
+        actual_wars.append(player_row[transformer.target].iloc[0])
+        predicted_wars.append(transformer.inverse_target(prediction))
+    return np.array(actual_wars, dtype=float), np.array(predicted_wars, dtype=float)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-name scoring against batch scoring.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--loop-max', type=int, default=10, help='Largest scale to run the per-name loop at')
+    args = parser.parse_args()
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database '{DB_PATH}' does not exist. Please run clean_data.py first.")
+        sys.exit(1)
+    base = get_batters_df()
+    transformer = FeatureTransformer('b_war').fit(base)
+    model = LinearRegression().fit(transformer.transform(base), transformer.transform_target(base['b_war']))
+
+    print(f"{'scale':>6} {'names':>8} {'loop s':>9} {'loop us/name':>13} {'batch s':>9} {'batch us/name':>14}")
+    for scale in args.scales:
+        df = make_table(base, scale)
+        # Every player once, a tenth of them twice, plus some names that are not in the table
+        names = list(df['fullName']) + list(df['fullName'][::10]) + [f"Unknown Player {i}" for i in range(scale * 5)]
+        start = time.perf_counter()
+        scored = score_players(names, df, model, transformer)
+        batch_time = time.perf_counter() - start
+        loop_cols = ('-', '-')
+        if scale <= args.loop_max:
+            start = time.perf_counter()
+            actual, predicted = score_with_loop(names, df, model, transformer)
+            loop_time = time.perf_counter() - start
+            np.testing.assert_allclose(scored['actual_war'].to_numpy(dtype=float), actual)
+            np.testing.assert_allclose(scored['predicted_war'].to_numpy(dtype=float), predicted)
+            loop_cols = (f"{loop_time:.2f}", f"{loop_time / len(names) * 1e6:.0f}")
+        print(f"{scale:>5}x {len(names):>8} {loop_cols[0]:>9} {loop_cols[1]:>13} "
+              f"{batch_time:>9.3f} {batch_time / len(names) * 1e6:>14.1f}")
@@ -0,0 +1,85 @@
+"""
+Localhost benchmark for the resident scoring service.
+- Starts src/models/service.py on a free localhost port in this process
+- Times single-player requests over one keep-alive connection against spawning `get_predicted_war.py` per lookup
+- Exercises the batch and top-N undervalued endpoints and a model hot-reload, then prints the service's /stats
+
+Usage:
+    python benchmarks/bench_service.py [--requests 500] [--spawns 3] [--batch-size 1000]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.data_access import get_player_data
+from src.models.service import create_server
+from urllib.parse import quote
+
+
+def request(conn, method, path, payload=None):
+    body = json.dumps(payload) if payload is not None else None
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the local scoring service.")
+    parser.add_argument('--requests', type=int, default=500, help='Single-player requests sent to the service')
+    parser.add_argument('--spawns', type=int, default=3, help='CLI processes spawned for comparison')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Names per batch request')
+    args = parser.parse_args()
+
+    names = list(get_player_data().raw('batters')['fullName'])
+    server = create_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    conn = http.client.HTTPConnection(host, port)
+
+    start = time.perf_counter()
+    status, first = request(conn, 'GET', f"/player?name={quote(names[0])}&type=batter")
+    print(f"First request (loads model, builds index): {(time.perf_counter() - start) * 1000:.0f} ms -> {first}")
+
+    start = time.perf_counter()
+    for i in range(args.requests):
+        status, _ = request(conn, 'GET', f"/player?name={quote(names[i % len(names)])}&type=batter")
+        assert status == 200
+    served = time.perf_counter() - start
+    print(f"Service: {args.requests} single-player requests in {served:.2f} s "
+          f"({served / args.requests * 1000:.2f} ms/request, {args.requests / served:.0f} requests/sec)")
+
+    script = os.path.join(os.path.dirname(__file__), '..', 'src', 'models', 'get_predicted_war.py')
+    start = time.perf_counter()
+    for i in range(args.spawns):
+        subprocess.run([sys.executable, script, names[i % len(names)], 'batter'], capture_output=True, check=True)
+    spawned = time.perf_counter() - start
+    print(f"Spawned CLI: {args.spawns} lookups in {spawned:.2f} s ({spawned / args.spawns * 1000:.0f} ms/lookup)")
+
+    batch = [names[i % len(names)] for i in range(args.batch_size)] + ['Unknown Player']
+    start = time.perf_counter()
+    status, result = request(conn, 'POST', '/batch', {'type': 'batter', 'names': batch})
+    not_found = sum(r['status'] == 'not_found' for r in result['results'])
+    print(f"Batch of {len(batch)} names: {(time.perf_counter() - start) * 1000:.1f} ms ({not_found} not found)")
+
+    status, result = request(conn, 'GET', '/undervalued?type=pitcher&n=5')
+    print("Top 5 undervalued pitchers:", ', '.join(r['fullName'] for r in result['results']))
+
+    # Touching a model file triggers a reload on the next request
+    model_path = server.service.model_paths['batter']
+    os.utime(model_path)
+    request(conn, 'GET', f"/player?name={quote(names[0])}&type=batter")
+    status, stats = request(conn, 'GET', '/stats')
+    print(json.dumps(stats, indent=2))
+
+    conn.close()
+    server.shutdown()
+    server.server_close()
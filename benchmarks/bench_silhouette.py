@@ -0,0 +1,73 @@
+"""
+Benchmark of the silhouette k sweep used to pick the number of clusters.
+- Baseline: one KMeans per k in sequence, exact silhouette, then a final fit of the best k (the previous behavior)
+- Sweep: parallel fits, stratified-sample silhouette above --sample-size rows, best-k model reused from the sweep
+- Runs on the normalized batters table replicated 1x, 10x and 50x with small noise, and reports how far the sampled
+  scores are from the exact ones and whether both pick the same k
+
+Usage:
+    python benchmarks/bench_silhouette.py [--scales 1 10 50] [--jobs -1] [--sample-size 5000] [--minibatch]
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.clustering import clustering
+from src.data.data_access import get_player_data
+
+MIN_K, MAX_K = 2, 8
+
+
+def replicated_table(scale, seed=0):
+    X = get_player_data().normalized('batters').dropna(axis=1, how='all').dropna().values
+    rng = np.random.default_rng(seed)
+    copies = [X] + [X + rng.normal(0, 0.01, X.shape) for _ in range(scale - 1)]
+    return np.vstack(copies)
+
+def baseline(X, random_state=42):
+    scores = []
+    for k in range(MIN_K, MAX_K + 1):
+        labels = KMeans(n_clusters=k, random_state=random_state).fit_predict(X)
+        scores.append(silhouette_score(X, labels))
+    best_k = int(np.argmax(scores)) + MIN_K
+    KMeans(n_clusters=best_k, random_state=random_state).fit_predict(X)
+    return best_k, scores
+
+def sweep(X, jobs, sample_size, minibatch, random_state=42):
+    result = clustering.silhouette_sweep(X, MIN_K, MAX_K, random_state, jobs, sample_size, minibatch)
+    scores = [result['scores'][k] for k in range(MIN_K, MAX_K + 1)]
+    best_k = int(np.argmax(scores)) + MIN_K
+    clustering.fitted_model(X, best_k, random_state, minibatch)
+    return best_k, scores
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the sequential exact k sweep with the parallel sampled one.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--jobs', type=int, default=clustering.SWEEP_JOBS)
+    parser.add_argument('--sample-size', type=int, default=clustering.SILHOUETTE_SAMPLE_SIZE)
+    parser.add_argument('--minibatch', action='store_true')
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    print(f"{'rows':>8} {'baseline':>10} {'sweep':>10} {'speedup':>8} {'max |score diff|':>17} {'best k':>9}")
+    for scale in args.scales:
+        X = replicated_table(scale)
+        start = time.perf_counter()
+        base_k, base_scores = baseline(X)
+        base_time = time.perf_counter() - start
+        clustering._sweep_cache.clear()
+        start = time.perf_counter()
+        new_k, new_scores = sweep(X, args.jobs, args.sample_size, args.minibatch)
+        new_time = time.perf_counter() - start
+        diff = max(abs(a - b) for a, b in zip(base_scores, new_scores))
+        print(f"{len(X):>8} {base_time:>9.2f}s {new_time:>9.2f}s {base_time / new_time:>7.1f}x {diff:>17.4f} "
+              f"{base_k:>4} / {new_k}")
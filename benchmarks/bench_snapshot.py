@@ -0,0 +1,87 @@
+"""
+Load-time benchmark for the processed player tables.
+- Times the SQLite loader path against the memory-mapped columnar snapshot, full width and with column projection
+- Runs on copies of data/processed/baseball_stats.db with the batters/pitchers tables replicated 1x, 10x and 100x
+- Checks the snapshot returns the same DataFrame as SQLite
+
+Usage:
+    python benchmarks/bench_snapshot.py [--scales 1 10 100] [--repeat 5] [--columns fullName age b_war salary]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data.clean_data import DB_PATH, LOADER_TABLES, _read_table
+from src.data.snapshot import read_snapshot, write_snapshot
+
+
+def make_database(path, scale):
+    """
+    Copies the loader tables of the processed database into `path`, repeated `scale` times.
+    """
+    source = sqlite3.connect(DB_PATH)
+    target = sqlite3.connect(path)
+    for table, _, _ in LOADER_TABLES.values():
+        df = pd.read_sql_query(f"SELECT * FROM {table}", source)
+        copies = []
+        for i in range(scale):
+            copy = df.copy()
+            copy['fullName'] = copy['fullName'] + f" #{i}"
+            copies.append(copy)
+        pd.concat(copies, ignore_index=True).to_sql(table, target, if_exists='replace', index=False)
+    source.close()
+    target.close()
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SQLite loads against the columnar snapshot.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    parser.add_argument('--columns', nargs='+', default=['fullName', 'age', 'salary'],
+                        help='Projection used for the column-subset load')
+    args = parser.parse_args()
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database '{DB_PATH}' does not exist. Please run clean_data.py first.")
+        sys.exit(1)
+
+    print(f"{'table':>9} {'scale':>6} {'rows':>8} {'sqlite ms':>10} {'snapshot ms':>12} {'projected ms':>13} {'speedup':>8}")
+    for scale in args.scales:
+        workdir = tempfile.mkdtemp(prefix='bench_snapshot_')
+        try:
+            db_path = os.path.join(workdir, 'baseball_stats.db')
+            snapshot_dir = os.path.join(workdir, 'snapshot')
+            make_database(db_path, scale)
+            for name, (table, season_table, drop_na) in LOADER_TABLES.items():
+                write_snapshot(name, _read_table(table, season_table, None, drop_na, db_path), db_path, snapshot_dir)
+                from_sqlite, sqlite_time = best_of(
+                    lambda: _read_table(table, season_table, None, drop_na, db_path), args.repeat)
+                from_snapshot, snapshot_time = best_of(
+                    lambda: read_snapshot(name, db_path, snapshot_dir=snapshot_dir), args.repeat)
+                pd.testing.assert_frame_equal(from_sqlite, from_snapshot)
+                columns = [column for column in args.columns if column in from_sqlite.columns]
+                projected, projected_time = best_of(
+                    lambda: read_snapshot(name, db_path, columns, snapshot_dir=snapshot_dir), args.repeat)
+                pd.testing.assert_frame_equal(from_sqlite[columns], projected)
+                print(f"{name:>9} {scale:>5}x {len(from_sqlite):>8} {sqlite_time * 1000:>10.1f} "
+                      f"{snapshot_time * 1000:>12.1f} {projected_time * 1000:>13.1f} "
+                      f"{sqlite_time / snapshot_time:>7.1f}x")
+        finally:
+            shutil.rmtree(workdir)
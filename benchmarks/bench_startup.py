@@ -0,0 +1,64 @@
+"""
+Startup benchmark for single-player WAR lookups.
+- Times, in fresh interpreters, importing get_predicted_war and running the CLI lookup (`get_predicted_war.py NAME TYPE`)
+- Compares the lookup with scoring the same player through the table path (pandas, data layer, full table load)
+- Reports which heavy modules each path imported
+
+Usage:
+    python benchmarks/bench_startup.py [--player "Aaron Judge"] [--type batter] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_MODULES = ('pandas', 'sklearn', 'bs4', 'src.data.clean_data')
+
+# Each snippet prints the time spent in the measured code and the heavy modules it loaded
+PRELUDE = (
+    "import time, sys; start = time.perf_counter(); sys.path.insert(0, {root!r}); "
+)
+REPORT = (
+    "; print(time.perf_counter() - start, ','.join(m for m in {heavy!r} if m in sys.modules), sep='|')"
+)
+SCENARIOS = {
+    'import': "import src.models.get_predicted_war",
+    'cli lookup': ("sys.argv = ['get_predicted_war.py', {player!r}, {ptype!r}]; import runpy; "
+                   "runpy.run_path({script!r}, run_name='__main__')"),
+    'table path': ("from src.models.get_predicted_war import get_predicted_wars; "
+                   "get_predicted_wars([{player!r}], {ptype!r})"),
+}
+
+
+def run(code):
+    """
+    Runs `code` in a fresh interpreter and returns (process wall time, in-process time, heavy modules loaded).
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    elapsed, modules = result.stdout.strip().splitlines()[-1].split('|')
+    return wall, float(elapsed), modules
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark startup time of single-player WAR lookups.")
+    parser.add_argument('--player', default='Aaron Judge')
+    parser.add_argument('--type', default='batter', choices=['batter', 'pitcher'])
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per scenario (median is reported)')
+    args = parser.parse_args()
+
+    script = os.path.join(ROOT, 'src', 'models', 'get_predicted_war.py')
+    print(f"{'scenario':>12} {'wall ms':>9} {'in-process ms':>14}  heavy modules imported")
+    for name, snippet in SCENARIOS.items():
+        code = (PRELUDE.format(root=ROOT)
+                + snippet.format(player=args.player, ptype=args.type, script=script)
+                + REPORT.format(heavy=HEAVY_MODULES))
+        runs = [run(code) for _ in range(args.repeat)]
+        wall = statistics.median(r[0] for r in runs)
+        elapsed = statistics.median(r[1] for r in runs)
+        print(f"{name:>12} {wall * 1000:>9.0f} {elapsed * 1000:>14.0f}  {runs[-1][2] or '-'}")
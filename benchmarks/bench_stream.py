@@ -0,0 +1,107 @@
+"""
+Benchmark for the streaming gather -> clean pass.
+- Writes a synthetic corpus (see synthetic.py) and replays it as a rate-limited crawl (no network), one page every
+  1/--rate seconds
+- Times the sequential run (crawl to data/raw, then get_dataframes) against stream.gather_and_clean with and
+  without writing data/raw, each in a fresh workspace, next to the crawl alone
+- Reports the queue's peak depth and checks every run produces the same database tables
+
+Usage:
+    python benchmarks/bench_stream.py [--players 300] [--rate 20] [--workers N] [--queue-size 32]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+from benchmarks.synthetic import write_corpus
+
+TABLES = ['batters', 'pitchers', 'batting_seasons', 'pitching_seasons']
+
+
+def replay_crawl(corpus_dir, rate, stats):
+    """
+    Crawl stand-in: hands every corpus page to the page destination, spaced 1/rate seconds apart like the
+    rate-limited fetcher.
+    """
+    def crawl(pages=None):
+        from src.data.load_data import RawPages
+        pages = pages or RawPages()
+        start = time.perf_counter()
+        for i, filename in enumerate(sorted(os.listdir(corpus_dir))):
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with open(os.path.join(corpus_dir, filename), 'r', encoding='utf-8') as f:
+                pages.save(os.path.splitext(filename)[0], f.read())
+        stats['crawl_sec'] = time.perf_counter() - start
+        stats['peak'] = getattr(pages, 'peak', None)
+        return []
+    return crawl
+
+
+def read_tables(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = {table: pd.read_sql_query(f'SELECT * FROM "{table}" ORDER BY rowid', conn) for table in TABLES}
+    conn.close()
+    return tables
+
+
+def run_mode(mode, corpus_dir, workspace, args):
+    from src.data.clean_data import DB_PATH, get_dataframes
+    from src.data.stream import gather_and_clean
+    os.makedirs(os.path.join(workspace, 'data'))
+    os.chdir(workspace)
+    stats = {}
+    crawl = replay_crawl(corpus_dir, args.rate, stats)
+    start = time.perf_counter()
+    if mode == 'sequential':
+        os.makedirs('data/raw')
+        crawl()
+        get_dataframes(workers=args.workers)
+    else:
+        gather_and_clean(args.workers, write_raw=(mode == 'stream'), queue_size=args.queue_size, crawl=crawl)
+    stats['total_sec'] = time.perf_counter() - start
+    stats['raw_files'] = len(os.listdir('data/raw')) if os.path.exists('data/raw') else 0
+    return stats, read_tables(DB_PATH)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming gather -> clean against crawl-then-clean.")
+    parser.add_argument('--players', type=int, default=300)
+    parser.add_argument('--rate', type=float, default=20.0, help='Simulated crawl rate in pages/sec')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--queue-size', type=int, default=32)
+    parser.add_argument('--page-kb', type=int, default=40)
+    args = parser.parse_args()
+
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='moneyball_stream_')
+    try:
+        corpus_dir = os.path.join(workdir, 'corpus')
+        write_corpus(corpus_dir, args.players, page_kb=args.page_kb)
+        print(f"{args.players} pages at {args.rate:g} pages/sec (crawl alone ~{args.players / args.rate:.1f}s)")
+        print(f"{'mode':<12} {'crawl s':>8} {'total s':>8} {'after crawl s':>14} {'queue peak':>11} {'raw files':>10}")
+        baseline = None
+        for mode in ('sequential', 'stream', 'stream_noraw'):
+            stats, tables = run_mode(mode, corpus_dir, os.path.join(workdir, mode), args)
+            if baseline is None:
+                baseline = tables
+            else:
+                for table in TABLES:
+                    pd.testing.assert_frame_equal(tables[table], baseline[table])
+            peak = '-' if stats['peak'] is None else f"{stats['peak']}/{args.queue_size}"
+            print(f"{mode:<12} {stats['crawl_sec']:>8.2f} {stats['total_sec']:>8.2f} "
+                  f"{stats['total_sec'] - stats['crawl_sec']:>14.2f} {peak:>11} {stats['raw_files']:>10}")
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir)
@@ -0,0 +1,315 @@
+"""
+Synthetic Baseball-Reference player pages for benchmarking the pipeline at scale.
+- Writes one page per player with the same structure the extractor reads: a #meta block with a 'Contract Status'
+  line, and div_players_standard_batting / div_players_standard_pitching tables whose season rows carry
+  data-stat cells formatted like the real site ('.322', '10.8', bold league leaders, awards links)
+- Stats are drawn from a per-player talent level, so WAR, rates and counting stats are correlated as in real data
+- Includes the awkward cases of real pages: traded players' partial_table rows, players without a current-season
+  row, two-way players, missing contracts, commented-out markup and page padding
+- Deterministic: player i's page only depends on (seed, i, seasons, page size), so a larger corpus extends a
+  smaller one
+
+Usage:
+    python benchmarks/synthetic.py --out data/raw_synthetic --players 10000 [--seasons 5] [--seed 0] [--page-kb 40]
+"""
+
+import argparse
+import json
+import os
+import random
+
+SEASON = 2024
+FIRST_NAMES = [
+    'Aaron', 'Alex', 'Andres', 'Austin', 'Brandon', 'Bryce', 'Carlos', 'Chris', 'Cody', 'Corey', 'Dylan', 'Eli',
+    'Eugenio', 'Francisco', 'Gavin', 'Hunter', 'Isaac', 'Jake', 'Jose', 'Juan', 'Julio', 'Kyle', 'Logan', 'Luis',
+    'Marcus', 'Matt', 'Miguel', 'Nolan', 'Oscar', 'Pablo', 'Rafael', 'Ryan', 'Shane', 'Spencer', 'Tanner', 'Tarik',
+    'Trevor', 'Tyler', 'Victor', 'Will', 'Xavier', 'Yordan', 'Zack',
+]
+LAST_NAMES = [
+    'Abbott', 'Alvarez', 'Baker', 'Bell', 'Burnes', 'Castillo', 'Cole', 'Cruz', 'Diaz', 'Duran', 'Ellis', 'Flores',
+    'Garcia', 'Gray', 'Greene', 'Harper', 'Hernandez', 'Hill', 'Jimenez', 'Judge', 'Kelly', 'Lopez', 'Martinez',
+    'Miller', 'Montgomery', 'Nunez', 'Ortiz', 'Perez', 'Ramirez', 'Reyes', 'Rodriguez', 'Santana', 'Seager',
+    'Skubal', 'Smith', 'Soto', 'Suarez', 'Taylor', 'Torres', 'Turner', 'Valdez', 'Walker', 'Webb', 'Wheeler',
+    'Young',
+]
+TEAMS = {
+    'AL': ['BAL', 'BOS', 'CHW', 'CLE', 'DET', 'HOU', 'KCR', 'LAA', 'MIN', 'NYY', 'OAK', 'SEA', 'TBR', 'TEX', 'TOR'],
+    'NL': ['ARI', 'ATL', 'CHC', 'CIN', 'COL', 'LAD', 'MIA', 'MIL', 'NYM', 'PHI', 'PIT', 'SDP', 'SFG', 'STL', 'WSN'],
+}
+POSITIONS = ['2', '3', '4', '5', '6', '7', '8', '9', 'D']
+AWARDS = ['AS', 'MVP-{}', 'SS', 'GG']
+PITCHER_SHARE = 0.5
+TWO_WAY_SHARE = 0.01
+TRADED_SHARE = 0.08
+NO_CONTRACT_SHARE = 0.15
+FILLER = ('<p class="filler">Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor '
+          'incididunt ut labore et dolore magna aliqua.</p>\n')
+
+
+def player_name(i):
+    """
+    Unique, realistic-looking name of synthetic player i.
+    """
+    pairs = len(FIRST_NAMES) * len(LAST_NAMES)
+    first = FIRST_NAMES[i % len(FIRST_NAMES)]
+    last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    return f"{first} {last}" if i < pairs else f"{first} {last} {i // pairs + 1}"
+
+
+# ----------------------
+# Cell Formatting
+# ----------------------
+def _rate(value):
+    # Batting rates drop the leading zero on the site: .322
+    text = f"{value:.3f}"
+    return text[1:] if text.startswith('0') else text
+
+def _cell(stat, text, leader=False, csk=None, left=False):
+    align = 'left' if left else 'right'
+    sort_key = f' csk="{csk}"' if csk is not None else ''
+    if leader:
+        text = f"<strong><em>{text}</em></strong>"
+    return f'<td class="{align} " data-stat="{stat}"{sort_key} >{text}</td>'
+
+def _awards(rng, season):
+    if rng.random() > 0.08:
+        return ''
+    chosen = rng.sample(AWARDS, rng.randint(1, 2))
+    links = [f'<a href="/awards/awards_{season}.shtml">{award.format(rng.randint(1, 20))}</a>' for award in chosen]
+    return ','.join(links)
+
+def _row(table, season, cells, partial=False):
+    row_class = ' class="partial_table"' if partial else ''
+    year = (f'<th scope="row" class="left " data-stat="year_id" >'
+            f'<a href="/players/gl.fcgi?t={table[0]}&year={season}">{season}</a></th>')
+    return f'<tr id="players_standard_{table}.{season}"{row_class} > {year} {" ".join(cells)} </tr>'
+
+def _team_cells(rng, season, team=None):
+    league = rng.choice(list(TEAMS))
+    team = team or rng.choice(TEAMS[league])
+    return [
+        f'<td class="left " data-stat="team_name_abbr" ><a href="/teams/{team}/{season}.shtml">{team}</a></td>',
+        f'<td class="left " data-stat="comp_name_abbr" ><a href="/leagues/{league}/{season}.shtml">{league}</a></td>',
+    ]
+
+
+# ----------------------
+# Season Rows
+# ----------------------
+def batting_cells(rng, talent, age, season, scale=1.0):
+    """
+    data-stat cells of one batting season (everything after the season header), scaled for partial seasons.
+    """
+    pa = max(1, int(rng.uniform(40, 720) * scale))
+    bb = int(pa * max(0.02, rng.gauss(0.085 + 0.015 * talent, 0.02)))
+    hbp = int(pa * rng.uniform(0, 0.02))
+    sf = int(pa * rng.uniform(0, 0.01))
+    sh = int(pa * rng.uniform(0, 0.005))
+    ab = max(1, pa - bb - hbp - sf - sh)
+    avg = min(0.4, max(0.12, rng.gauss(0.245 + 0.02 * talent, 0.025)))
+    h = int(ab * avg)
+    hr = int(h * min(0.35, max(0.0, rng.gauss(0.12 + 0.04 * talent, 0.04))))
+    triples = int(h * rng.uniform(0, 0.03))
+    doubles = int(h * rng.uniform(0.12, 0.25))
+    singles = max(0, h - hr - triples - doubles)
+    tb = singles + 2 * doubles + 3 * triples + 4 * hr
+    obp = (h + bb + hbp) / max(1, ab + bb + hbp + sf)
+    slg = tb / ab
+    ops_plus = 100 * (obp / 0.312 + slg / 0.399 - 1)
+    war = (ops_plus - 80) / 100 * pa / 110 + rng.gauss(0, 0.6)
+    leader = talent > 2.2 and rng.random() < 0.3
+    cells = [f'<td class="right " data-stat="age" >{age}</td>'] + _team_cells(rng, season) + [
+        _cell('b_war', f"{war:.1f}", leader, csk=f"{war:.2f}"),
+        _cell('b_games', min(162, int(pa / 4.1) + 1)),
+        _cell('b_pa', pa), _cell('b_ab', ab),
+        _cell('b_r', int(h * 0.45 + hr * 0.6)), _cell('b_h', h),
+        _cell('b_doubles', doubles), _cell('b_triples', triples), _cell('b_hr', hr, leader),
+        _cell('b_rbi', int(hr * 2.2 + h * 0.25)),
+        _cell('b_sb', int(rng.expovariate(0.15) * scale)), _cell('b_cs', int(rng.expovariate(0.6) * scale)),
+        _cell('b_bb', bb), _cell('b_so', int(pa * rng.uniform(0.12, 0.32))),
+        _cell('b_batting_avg', _rate(h / ab), csk=f"{h / ab:.10f}"),
+        _cell('b_onbase_perc', _rate(obp), leader, csk=f"{obp:.10f}"),
+        _cell('b_slugging_perc', _rate(slg), csk=f"{slg:.10f}"),
+        _cell('b_onbase_plus_slugging', _rate(obp + slg), csk=f"{obp + slg:.10f}"),
+        _cell('b_onbase_plus_slugging_plus', int(round(ops_plus)), csk=f"{ops_plus:.10f}"),
+        _cell('b_roba', _rate(obp * 0.6 + slg * 0.25), csk=f"{obp * 0.6 + slg * 0.25:.15f}"),
+        _cell('b_rbat_plus', int(round(ops_plus + rng.gauss(0, 3)))),
+        _cell('b_tb', tb), _cell('b_gidp', int(pa * rng.uniform(0, 0.03))),
+        _cell('b_hbp', hbp), _cell('b_sh', sh), _cell('b_sf', sf), _cell('b_ibb', int(bb * rng.uniform(0, 0.15))),
+        _cell('pos', '*' + ''.join(rng.sample(POSITIONS, rng.randint(1, 3))), left=True),
+        _cell('awards', _awards(rng, season), left=True),
+    ]
+    return cells
+
+def pitching_cells(rng, talent, age, season, scale=1.0):
+    """
+    data-stat cells of one pitching season (everything after the season header), scaled for partial seasons.
+    """
+    starter = rng.random() < 0.4
+    games = max(1, int((rng.uniform(20, 33) if starter else rng.uniform(10, 75)) * scale))
+    starts = games if starter else 0
+    outs = max(1, int(games * (rng.uniform(14, 18) if starter else rng.uniform(2.5, 4))))
+    ip = outs / 3
+    era = max(0.5, rng.gauss(4.2 - 0.6 * talent, 0.8))
+    er = int(era * ip / 9)
+    runs = er + int(er * rng.uniform(0, 0.12))
+    hits = int(ip * max(4.0, rng.gauss(8.5 - 0.8 * talent, 1.0)) / 9)
+    bb = int(ip * max(1.0, rng.gauss(3.2 - 0.3 * talent, 0.7)) / 9)
+    so = int(ip * max(4.0, rng.gauss(8.8 + 1.2 * talent, 1.5)) / 9)
+    hr = int(ip * max(0.3, rng.gauss(1.2 - 0.15 * talent, 0.3)) / 9)
+    hbp = int(ip * rng.uniform(0, 0.06))
+    wins = int(starts * rng.uniform(0.2, 0.55)) + int((games - starts) * rng.uniform(0, 0.08))
+    losses = int(games * rng.uniform(0.05, 0.3))
+    war = (4.4 - era) * ip / 90 + rng.gauss(0, 0.4)
+    whip = (hits + bb) / ip
+    fip = (13 * hr + 3 * (bb + hbp) - 2 * so) / ip + 3.1
+    leader = talent > 2.2 and rng.random() < 0.3
+    cells = [f'<td class="right " data-stat="age" >{age}</td>'] + _team_cells(rng, season) + [
+        _cell('p_war', f"{war:.1f}", leader, csk=f"{war:.2f}"),
+        _cell('p_w', wins, leader), _cell('p_l', losses),
+        _cell('p_win_loss_perc', _rate(wins / (wins + losses)) if wins + losses else '',
+              csk=f"{wins / (wins + losses):.10f}" if wins + losses else None),
+        _cell('p_earned_run_avg', f"{9 * er / ip:.2f}", csk=f"{9 * er / ip:.6f}"),
+        _cell('p_g', games), _cell('p_gs', starts), _cell('p_gf', 0 if starter else int(games * rng.uniform(0, 0.6))),
+        _cell('p_cg', int(rng.random() < 0.05) if starter else 0), _cell('p_sho', 0),
+        _cell('p_sv', 0 if starter else int(rng.expovariate(0.3))),
+        _cell('p_ip', f"{outs // 3}.{outs % 3}", csk=outs),
+        _cell('p_h', hits), _cell('p_r', runs), _cell('p_er', er), _cell('p_hr', hr),
+        _cell('p_bb', bb), _cell('p_ibb', int(bb * rng.uniform(0, 0.1))), _cell('p_so', so, leader),
+        _cell('p_hbp', hbp), _cell('p_bk', int(rng.random() < 0.1)), _cell('p_wp', int(rng.expovariate(0.4))),
+        _cell('p_bfp', outs + hits + bb + hbp),
+        _cell('p_earned_run_avg_plus', int(round(100 * 4.2 / max(0.5, 9 * er / ip)))),
+        _cell('p_fip', f"{fip:.2f}", csk=f"{fip:.20f}"),
+        _cell('p_whip', f"{whip:.3f}", csk=f"{whip:.10f}"),
+        _cell('p_hits_per_nine', f"{9 * hits / ip:.1f}"), _cell('p_hr_per_nine', f"{9 * hr / ip:.1f}"),
+        _cell('p_bb_per_nine', f"{9 * bb / ip:.1f}"), _cell('p_so_per_nine', f"{9 * so / ip:.1f}"),
+        _cell('p_strikeouts_per_base_on_balls', f"{so / bb:.2f}" if bb else ''),
+        _cell('awards', _awards(rng, season), left=True),
+    ]
+    return cells
+
+def stats_table(rng, table, talent, first_age, seasons, cells_fn):
+    """
+    A div_players_standard_* block with one row per season; traded seasons get a total row plus partial rows.
+    """
+    rows = []
+    for offset, season in enumerate(seasons):
+        age = first_age + offset
+        if rng.random() < TRADED_SHARE:
+            rows.append(_row(table, season, cells_fn(rng, talent, age, season)))
+            for share in (0.6, 0.4):
+                rows.append(_row(table, season, cells_fn(rng, talent, age, season, share), partial=True))
+        else:
+            rows.append(_row(table, season, cells_fn(rng, talent, age, season)))
+    caption = f"Standard {table.title()} Table"
+    return (f'<div class="table_container tabbed current" id="div_players_standard_{table}">\n'
+            f'<table class="stats_table sortable" id="players_standard_{table}"> <caption>{caption}</caption>\n'
+            f'<thead><tr><th data-stat="year_id">Season</th></tr></thead>\n<tbody>\n'
+            + '\n'.join(rows) +
+            '\n</tbody></table>\n</div>\n')
+
+
+# ----------------------
+# Pages
+# ----------------------
+def contract_status(rng, talent):
+    if rng.random() < NO_CONTRACT_SHARE:
+        return 'Pre-arb eligible'
+    if rng.random() < 0.4:
+        years = rng.randint(2, 10)
+        total = max(1.0, rng.lognormvariate(3.0 + 0.5 * talent, 0.8))
+        return f"Signed thru {SEASON + years - 1}, {years} yrs/${total:.1f}M ({rng.randint(25, 30)}-{rng.randint(31, 38)})"
+    salary = max(0.74, rng.lognormvariate(0.8 + 0.6 * talent, 0.9))
+    if salary < 1:
+        return f"Signed thru {SEASON + 1}, 1 yr/${int(salary * 1000)}k"
+    return f"Signed thru {SEASON + 1}, 1 yr/${salary:.2f}M"
+
+def player_page(i, seed=0, seasons=5, page_kb=40):
+    """
+    HTML of synthetic player i.
+
+    Args:
+        i (int): Player number.
+        seed (int): Corpus seed.
+        seasons (int): Maximum number of seasons in each stats table (a career can be shorter).
+        page_kb (int): Approximate page size; real pages are mostly scripts and secondary tables, which the
+            extractor has to skip over.
+    Returns:
+        tuple: (player name, page HTML)
+    """
+    rng = random.Random(seed * 1_000_003 + i)
+    name = player_name(i)
+    talent = rng.gauss(0, 1)
+    career = rng.randint(1, seasons)
+    # Some players did not play in the modeling season (injured, minors, retired)
+    last_season = SEASON if rng.random() < 0.9 else SEASON - rng.randint(1, 2)
+    years = list(range(last_season - career + 1, last_season + 1))
+    first_age = rng.randint(21, 34)
+    is_pitcher = rng.random() < PITCHER_SHARE
+    two_way = rng.random() < TWO_WAY_SHARE
+
+    tables = []
+    if is_pitcher or two_way:
+        tables.append(stats_table(rng, 'pitching', talent, first_age, years, pitching_cells))
+    if not is_pitcher or two_way:
+        tables.append(stats_table(rng, 'batting', talent, first_age, years, batting_cells))
+    meta = (f'<div id="meta">\n<div class="media-item"><img src="/headshots/{i}.jpg" alt="Photo of {name}"></div>\n'
+            f'<div>\n<h1>\n<span>{name}</span>\n</h1>\n'
+            f'<p>\n<strong>Position:</strong>\n{"Pitcher" if is_pitcher else "Outfielder"}\n</p>\n'
+            f'<p>\n<strong>{SEASON + 1} Contract Status</strong>:\n{contract_status(rng, talent)}\n</p>\n'
+            f'<p>\n<strong>Service Time (01/{SEASON + 1})</strong>: {rng.uniform(0, 12):.3f}\n</p>\n</div>\n</div>\n')
+    # Secondary tables are shipped inside comments on the real site; the extractor must not match ids in them
+    commented = '<!--\n<div id="div_players_value_batting"><table id="players_value_batting"></table></div>\n-->\n'
+    padding = FILLER * max(0, page_kb * 1024 // len(FILLER))
+    page = ('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{name} Stats | Baseball-Reference.com</title>\n</head>\n<body>\n'
+            f'{padding[:len(padding) // 2]}{meta}{commented}{"".join(tables)}{padding[len(padding) // 2:]}'
+            '</body>\n</html>\n')
+    return name, page
+
+def write_corpus(out_dir, players, seed=0, seasons=5, page_kb=40):
+    """
+    Writes `players` synthetic pages to out_dir (as '<name>.html', like data/raw). The parameters are recorded
+    next to the directory (out_dir + '.json', since every file inside it is parsed as a page), so pages already
+    written with the same parameters are kept.
+
+    Returns:
+        int: Number of pages written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    params = {'seed': seed, 'seasons': seasons, 'page_kb': page_kb}
+    params_path = os.path.normpath(out_dir) + '.json'
+    existing = 0
+    if os.path.exists(params_path):
+        with open(params_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        if {key: previous.get(key) for key in params} == params:
+            existing = previous.get('players', 0)
+    written = 0
+    for i in range(players):
+        if i < existing:
+            continue
+        name, page = player_page(i, seed, seasons, page_kb)
+        with open(os.path.join(out_dir, f'{name}.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+        written += 1
+    # Shrinking the corpus removes the extra pages so the directory always holds exactly `players` pages
+    for i in range(players, existing):
+        path = os.path.join(out_dir, f'{player_name(i)}.html')
+        if os.path.exists(path):
+            os.remove(path)
+    with open(params_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(params, players=players), f, indent=2)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic player pages.")
+    parser.add_argument('--out', required=True, help='Directory for the pages')
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--seasons', type=int, default=5, help='Maximum seasons per player')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--page-kb', type=int, default=40, help='Approximate size of each page')
+    args = parser.parse_args()
+    written = write_corpus(args.out, args.players, args.seed, args.seasons, args.page_kb)
+    print(f"Wrote {written} pages to {args.out} ({args.players} players)")
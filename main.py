@@ -1,39 +1,146 @@
 """
 Main entry point for the Moneyball 2.0 pipeline.
 
+Stages run in this process as a dependency graph (see src/pipeline.py). Each stage declares the artifacts it
+reads and writes; a stage whose inputs and outputs are unchanged since its last run is skipped, and batter and
+pitcher stages run in parallel. Every run writes a timing/memory report (see src/instrumentation.py).
+
 Usage:
-    python main.py [--all] [--gather] [--clean] [--model] [--cluster]
+    python main.py [--all] [--gather] [--clean] [--model] [--cluster] [--workers N] [--full-rebuild] [--jobs N] [--force]
+                   [--no-plots] [--select-models | --incremental] [--stream [--no-raw]] [--log-level LEVEL]
+                   [--report PATH] [--profile-dir DIR]
 
 Options:
     --all      Run the full pipeline (default if no flags given)
     --gather   Run data gathering (scraping)
     --clean    Run data cleaning and database creation
-    --model    Run model training
-    --cluster  Run clustering and value segmentation
+    --model    Run model training (and add predicted WAR to the value-label CSVs)
+    --cluster  Run clustering and value segmentation (figures are rendered by separate plot stages), and build the
+               comparable-player search indexes
+    --workers  Number of parser processes for the clean step (default: all cores)
+    --full-rebuild  Rebuild the database from every raw file instead of only changed ones
+    --jobs     Number of stages run in parallel (default: 2)
+    --force    Run the selected stages even if their inputs are unchanged
+    --no-plots Skip rendering the clustering figures (matplotlib is not imported)
+    --select-models Pick each WAR model by cross-validating several regressors instead of fitting linear regression
+    --incremental   Update the linear WAR models from saved sufficient statistics (only changed rows are folded in)
+    --stream        Gather and clean in one streaming stage: pages are parsed while the crawl runs (implies --gather --clean)
+    --no-raw        With --stream, do not write new pages to data/raw (their parsed records are kept in the database)
+    --log-level     Console verbosity: DEBUG, INFO (default), WARNING or ERROR
+    --report        Run report path (default: reports/run_report.json, spans also written as .csv)
+    --profile-dir   Write a cProfile dump per stage to this directory (stages then run one at a time)
 
 Examples:
     python main.py --all
     python main.py --gather --clean
+    python main.py --stream --no-raw
 """
 import argparse
-import subprocess
+import logging
 import sys
 
-STEPS = [
-    ("gather", "python src/data/load_data.py"),
-    ("clean", "python src/data/clean_data.py"),
-    ("model", "python src/models/train_model.py"),
-    ("update_value_labels", "python src/models/get_predicted_war.py"),
-    ("cluster", "python src/clustering/clustering.py"),
-]
-
-def run_step(name, cmd):
-    print(f"\n=== Running step: {name} ===")
-    result = subprocess.run(cmd, shell=True)
-    if result.returncode != 0:
-        print(f"Step '{name}' failed. Exiting.")
-        sys.exit(result.returncode)
-    print(f"=== Step '{name}' completed ===\n")
+from src.instrumentation import RECORDER, configure_logging
+from src.pipeline import Stage, run_pipeline, DEFAULT_JOBS
+
+RAW_DIR = 'data/raw'
+DB_PATH = 'data/processed/baseball_stats.db'
+REPORT_PATH = 'reports/run_report.json'
+PLAYER_TYPES = {
+    # Stage suffix -> (clustering/training name, get_predicted_war name)
+    'batters': ('batters', 'batter'),
+    'pitchers': ('pitchers', 'pitcher'),
+}
+
+logger = logging.getLogger(__name__)
+
+# ----------------------
+# Stage Functions
+# ----------------------
+# Imports are deferred so that running only some stages does not load every library
+
+def gather():
+    from src.data.load_data import load_data
+    load_data()
+
+def clean(workers=None, full_rebuild=False):
+    from src.data.clean_data import get_dataframes
+    get_dataframes(workers=workers, full_rebuild=full_rebuild)
+
+def gather_and_clean(workers=None, full_rebuild=False, write_raw=True):
+    from src.data.stream import gather_and_clean as stream
+    stream(workers=workers, full_rebuild=full_rebuild, write_raw=write_raw)
+
+def train(player_type, select=False, incremental=False):
+    from src.models.train_model import train_model
+    train_model(player_type, select, incremental)
+
+def cluster(player_type):
+    from src.clustering.clustering import cluster_value_segments
+    cluster_value_segments(player_type)
+
+def comparables(player_type):
+    from src.similarity.comparables import build_index
+    build_index(player_type)
+
+def plot(player_type):
+    from src.clustering.plots import render_file
+    render_file(f'data/processed/{player_type}_segments.npz')
+
+def update_value_labels(player_type):
+    from src.models.get_predicted_war import update_value_labels_csv
+    update_value_labels_csv(f'data/processed/{PLAYER_TYPES[player_type][0]}_value_labels.csv', PLAYER_TYPES[player_type][1])
+
+def build_stages(workers=None, full_rebuild=False, select_models=False, incremental=False, stream=False,
+                 write_raw=True):
+    """
+    The pipeline's stages, grouped by the command-line flag that selects them.
+    update_value_labels reads the CSVs written by clustering, so it is ordered after it. Figures are drawn by their
+    own stages from the saved clustering results, so rendering runs alongside update_value_labels.
+    With `stream`, gathering and cleaning are one stage (listed under 'gather') that parses pages as they arrive.
+
+    Returns:
+        dict: flag -> list of Stage
+    """
+    stages = {
+        'gather': [Stage('gather', gather, outputs=[RAW_DIR], always_run=True)],
+        'clean': [Stage('clean', lambda: clean(workers, full_rebuild), inputs=[RAW_DIR],
+                        outputs=[DB_PATH, 'data/processed/batters.csv', 'data/processed/pitchers.csv'],
+                        always_run=full_rebuild)],
+        'model': [],
+        'cluster': [],
+        'plot': [],
+        'update_value_labels': [],
+    }
+    if stream:
+        stages['gather'] = [Stage('gather_clean', lambda: gather_and_clean(workers, full_rebuild, write_raw),
+                                  outputs=[RAW_DIR, DB_PATH, 'data/processed/batters.csv',
+                                           'data/processed/pitchers.csv'],
+                                  always_run=True)]
+        stages['clean'] = []
+    for player_type in PLAYER_TYPES:
+        model_path = f'data/models/{player_type}_model.joblib'
+        labels_path = f'data/processed/{player_type}_value_labels.csv'
+        segments_path = f'data/processed/{player_type}_segments.npz'
+        model_outputs = [model_path]
+        if select_models:
+            # The selection report is an extra output, so switching to --select-models reruns the stage
+            model_outputs.append(f'reports/model_selection_{player_type}.json')
+        if incremental:
+            model_outputs.append(f'data/models/{player_type}_stats.npz')
+        stages['model'].append(Stage(f'model_{player_type}',
+                                     lambda p=player_type: train(p, select_models, incremental),
+                                     inputs=[DB_PATH], outputs=model_outputs))
+        stages['cluster'].append(Stage(f'cluster_{player_type}', lambda p=player_type: cluster(p),
+                                       inputs=[DB_PATH], outputs=[labels_path, segments_path]))
+        stages['cluster'].append(Stage(f'comparables_{player_type}', lambda p=player_type: comparables(p),
+                                       inputs=[DB_PATH], outputs=[f'data/processed/{player_type}_comparables.npz']))
+        stages['plot'].append(Stage(f'plot_{player_type}', lambda p=player_type: plot(p), inputs=[segments_path],
+                                    outputs=[f'reports/figures/{player_type}_silhouette_scores.png',
+                                             f'reports/figures/{player_type}_value_segments.png']))
+        stages['update_value_labels'].append(Stage(f'update_value_labels_{player_type}',
+                                                   lambda p=player_type: update_value_labels(p),
+                                                   inputs=[DB_PATH, model_path, labels_path], outputs=[labels_path]))
+    return stages
 
 def main():
     parser = argparse.ArgumentParser(description="Run the Moneyball 2.0 pipeline.")
@@ -42,25 +149,57 @@ def main():
     parser.add_argument('--clean', action='store_true', help='Run data cleaning')
     parser.add_argument('--model', action='store_true', help='Run model training')
     parser.add_argument('--cluster', action='store_true', help='Run clustering')
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes for the clean step')
+    parser.add_argument('--full-rebuild', action='store_true', help='Reparse every raw file in the clean step')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Stages run in parallel')
+    parser.add_argument('--force', action='store_true', help='Run selected stages even if their inputs are unchanged')
+    parser.add_argument('--no-plots', action='store_true', help='Skip rendering the clustering figures')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--select-models', action='store_true', help='Pick the WAR models by cross-validation')
+    mode.add_argument('--incremental', action='store_true', help='Update the WAR models from saved statistics')
+    parser.add_argument('--stream', action='store_true', help='Parse pages while they are gathered (gather + clean)')
+    parser.add_argument('--no-raw', action='store_true', help='With --stream, do not write pages to data/raw')
+    parser.add_argument('--log-level', default=None, help='DEBUG, INFO (default), WARNING or ERROR')
+    parser.add_argument('--report', default=REPORT_PATH, help='Run report path (JSON, spans also as CSV)')
+    parser.add_argument('--profile-dir', default=None, help='Write a cProfile dump per stage to this directory')
     args = parser.parse_args()
+    configure_logging(args.log_level)
+    if args.no_raw and not args.stream:
+        parser.error("--no-raw requires --stream")
+    if args.stream:
+        args.gather = args.clean = True
 
     # If no flags, run all
     if not any([args.all, args.gather, args.clean, args.model, args.cluster]):
         args.all = True
 
-    steps_to_run = []
+    stages = build_stages(args.workers, args.full_rebuild, args.select_models, args.incremental, args.stream,
+                          not args.no_raw)
+    selected = []
     if args.all or args.gather:
-        steps_to_run.append(STEPS[0])
+        selected += stages['gather']
     if args.all or args.clean:
-        steps_to_run.append(STEPS[1])
+        selected += stages['clean']
     if args.all or args.model:
-        steps_to_run.append(STEPS[2])
-        steps_to_run.append(STEPS[3])  # update_value_labels after model
+        selected += stages['model']
     if args.all or args.cluster:
-        steps_to_run.append(STEPS[4])
+        selected += stages['cluster']
+        if not args.no_plots:
+            selected += stages['plot']
+    if args.all or args.model:
+        selected += stages['update_value_labels']  # update_value_labels after model (and clustering)
 
-    for name, cmd in steps_to_run:
-        run_step(name, cmd)
+    force = [stage.name for stage in selected] if args.force else []
+    # A profiler only sees its own thread, and parallel stages would skew each other's timings
+    jobs = 1 if args.profile_dir else args.jobs
+    RECORDER.reset()
+    outcome = run_pipeline(selected, jobs=jobs, force=force, profile_dir=args.profile_dir)
+    logger.info("Pipeline summary: " + ", ".join(f"{name} {result}" for name, result in outcome.items()))
+    json_path, csv_path = RECORDER.write_report(args.report)
+    logger.info(f"Run report saved to {json_path} and {csv_path}")
+    if any(result in ('failed', 'not run') for result in outcome.values()):
+        logger.error("Pipeline failed. Exiting.")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
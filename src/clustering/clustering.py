@@ -1,93 +1,236 @@
 """
 Performs clustering and value segmentation for baseball batters and pitchers.
 - Uses KMeans and PCA for clustering and visualization
-- Computes silhouette scores to select optimal cluster count
+- Computation and rendering are separate: results are saved first, figures are rendered afterwards (see plots.py),
+  optionally in the background, and matplotlib is not imported at all when plots are skipped
+- Computes silhouette scores to select optimal cluster count, fitting the candidate k values in parallel and scoring
+  large tables on a stratified sample
+- Caches the sweep's fitted models, so the final clustering reuses the best-k model instead of fitting it again
 - Saves cluster results and visualizations for dashboard use
 """
 
+import argparse
+import hashlib
+import logging
 import sys
 import os
+import threading
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.cluster import KMeans
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_score
 
 
 # Ensure project root is in sys.path for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from src.data.clean_data import get_batters_df_normalized, get_pitchers_df_normalized, get_batters_df, get_pitchers_df
+from src.data.data_access import get_player_data
+from src.instrumentation import configure_logging, count, span
+
+logger = logging.getLogger(__name__)
+
+# Parallel jobs for the k sweep (-1 = one per core)
+SWEEP_JOBS = -1
+# Tables with more rows than this are scored on a stratified sample (the exact silhouette is O(n^2))
+SILHOUETTE_SAMPLE_SIZE = 5000
+# Number of swept datasets whose fitted models are kept
+SWEEP_CACHE_SIZE = 4
+SEGMENTS_PATH = 'data/processed/{player_type}_segments.npz'
+LABELS_PATH = 'data/processed/{player_type}_value_labels.csv'
+
+# (data digest, random_state, minibatch) -> {'scores': {k: score}, 'models': {k: fitted model}}
+_sweep_cache = OrderedDict()
+_sweep_lock = threading.Lock()
+
+# ----------------------
+# K Sweep
+# ----------------------
+def make_kmeans(k, random_state=42, minibatch=False):
+    """
+    KMeans, or MiniBatchKMeans for large tables, with k clusters.
+    """
+    if minibatch:
+        return MiniBatchKMeans(n_clusters=k, random_state=random_state)
+    return KMeans(n_clusters=k, random_state=random_state)
+
+def stratified_sample(labels, sample_size, random_state=42):
+    """
+    Row indices of a sample with each cluster represented in proportion to its size (at least two rows per
+    cluster, so every cluster still contributes to the silhouette).
+
+    Args:
+        labels (np.ndarray): Cluster label of each row.
+        sample_size (int): Approximate number of rows to draw.
+        random_state (int): Seed of the draw.
+    Returns:
+        np.ndarray: Sorted row indices.
+    """
+    rng = np.random.default_rng(random_state)
+    clusters, counts = np.unique(labels, return_counts=True)
+    picked = []
+    for cluster, size in zip(clusters, counts):
+        members = np.flatnonzero(labels == cluster)
+        take = min(size, max(2, int(round(sample_size * size / len(labels)))))
+        picked.append(rng.choice(members, size=take, replace=False))
+    return np.sort(np.concatenate(picked))
+
+def _fit_and_score(X, k, random_state, sample_size, minibatch):
+    model = make_kmeans(k, random_state, minibatch)
+    labels = model.fit_predict(X)
+    if sample_size is not None and len(X) > sample_size:
+        rows = stratified_sample(labels, sample_size, random_state)
+        return model, silhouette_score(X[rows], labels[rows])
+    return model, silhouette_score(X, labels)
+
+def _data_key(X):
+    X = np.ascontiguousarray(X)
+    return hashlib.sha256(X.tobytes()).hexdigest() + f"|{X.shape}|{X.dtype}"
+
+def silhouette_sweep(X, min_k=2, max_k=8, random_state=42, n_jobs=SWEEP_JOBS,
+                     sample_size=SILHOUETTE_SAMPLE_SIZE, minibatch=False):
+    """
+    Fits a clustering for every k in [min_k, max_k] (in parallel) and scores each with the silhouette.
+    Results are cached per dataset, so repeated sweeps and the final clustering reuse the fitted models.
+
+    Args:
+        X (np.ndarray): Data to cluster.
+        min_k (int), max_k (int): Range of cluster counts to try.
+        random_state (int): Seed of the clusterings and of the silhouette sample.
+        n_jobs (int): Parallel fits (-1 = one per core).
+        sample_size (int or None): Score tables larger than this on a stratified sample; None is always exact.
+        minibatch (bool): Use MiniBatchKMeans instead of KMeans.
+    Returns:
+        dict: {'scores': {k: score}, 'models': {k: fitted model}}
+    """
+    X = np.asarray(X)
+    key = (_data_key(X), random_state, minibatch)
+    with _sweep_lock:
+        sweep = _sweep_cache.setdefault(key, {'scores': {}, 'models': {}})
+        _sweep_cache.move_to_end(key)
+        while len(_sweep_cache) > SWEEP_CACHE_SIZE:
+            _sweep_cache.popitem(last=False)
+        missing = [k for k in range(min_k, max_k + 1) if k not in sweep['scores']]
+    if missing:
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_and_score)(X, k, random_state, sample_size, minibatch) for k in missing
+        )
+        count('kmeans_fits', len(missing))
+        with _sweep_lock:
+            for k, (model, score) in zip(missing, results):
+                sweep['models'][k] = model
+                sweep['scores'][k] = score
+    return sweep
+
+def fitted_model(X, k, random_state=42, minibatch=False):
+    """
+    The k-cluster model from an earlier sweep of the same data, or a newly fitted one.
+    """
+    X = np.asarray(X)
+    with _sweep_lock:
+        sweep = _sweep_cache.get((_data_key(X), random_state, minibatch))
+        model = sweep['models'].get(k) if sweep is not None else None
+    if model is not None:
+        count('kmeans_reused')
+        return model
+    model = make_kmeans(k, random_state, minibatch)
+    model.fit(X)
+    count('kmeans_fits')
+    return model
 
 # ----------------------
 # Silhouette Score Helper
 # ----------------------
-def compute_silhouette_scores(X, min_k=2, max_k=8, random_state=42):
+def compute_silhouette_scores(X, min_k=2, max_k=8, random_state=42, n_jobs=SWEEP_JOBS,
+                              sample_size=SILHOUETTE_SAMPLE_SIZE, minibatch=False):
     """
-    Computes silhouette scores for KMeans clustering with k in [min_k, max_k].
-    Plots silhouette scores and returns best k.
+    Computes silhouette scores for KMeans clustering with k in [min_k, max_k] and returns best k.
+    The scores are plotted by plots.silhouette_figure.
 
     Args:
         X (np.ndarray or pd.DataFrame): Data to cluster.
         min_k (int): Minimum number of clusters to try.
         max_k (int): Maximum number of clusters to try.
         random_state (int): Random seed for reproducibility.
+        n_jobs (int): Parallel fits (-1 = one per core).
+        sample_size (int or None): Score tables larger than this on a stratified sample; None is always exact.
+        minibatch (bool): Use MiniBatchKMeans instead of KMeans.
     Returns:
         tuple: (best_k, scores) where best_k is the optimal number of clusters, scores is a list of silhouette scores.
     """
-    scores = []
-    for k in range(min_k, max_k + 1):
-        kmeans = KMeans(n_clusters=k, random_state=random_state)
-        labels = kmeans.fit_predict(X)
-        score = silhouette_score(X, labels)
-        scores.append(score)
-    plt.figure(figsize=(8, 4))
-    plt.plot(range(min_k, max_k + 1), scores, marker='o')
-    plt.xlabel('Number of clusters (k)')
-    plt.ylabel('Silhouette Score')
-    plt.title('Silhouette Score vs. Number of Clusters')
-    plt.tight_layout()
-    plt.show()
+    with span('silhouette_sweep', k_range=f'{min_k}-{max_k}'):
+        sweep = silhouette_sweep(X, min_k, max_k, random_state, n_jobs, sample_size, minibatch)
+    scores = [sweep['scores'][k] for k in range(min_k, max_k + 1)]
     best_k = int(np.argmax(scores)) + min_k
-    print(f'Best number of clusters by silhouette score: {best_k}')
+    logger.info(f'Best number of clusters by silhouette score: {best_k}')
     return best_k, scores
 
 # ----------------------
-# Clustering and Visualization
+# Segments File
+# ----------------------
+def save_segments(segments, path):
+    """
+    Saves what the figures are drawn from (PCA coordinates, value labels, silhouette scores) as a .npz file.
+    """
+    np.savez(path, player_type=segments['player_type'], n_clusters=segments['n_clusters'],
+             k_values=np.asarray(segments['k_values'], dtype=int), scores=np.asarray(segments['scores'], dtype=float),
+             pca=segments['pca'], value_labels=np.asarray(segments['value_labels'], dtype=str))
+
+def load_segments(path):
+    with np.load(path, allow_pickle=False) as data:
+        return {
+            'player_type': str(data['player_type']),
+            'n_clusters': int(data['n_clusters']),
+            'k_values': data['k_values'].tolist(),
+            'scores': data['scores'].tolist(),
+            'pca': data['pca'],
+            'value_labels': data['value_labels'],
+        }
+
+# ----------------------
+# Clustering
 # ----------------------
-def cluster_and_visualize_value_segments(player_type='batters', n_clusters=None, random_state=42):
+def cluster_value_segments(player_type='batters', n_clusters=None, random_state=42, n_jobs=SWEEP_JOBS,
+                           sample_size=SILHOUETTE_SAMPLE_SIZE, minibatch=False):
     """
-    Performs KMeans clustering on normalized player data, labels clusters by value, and visualizes with PCA.
-    Saves cluster assignments and visualizations to disk.
+    Performs KMeans clustering on normalized player data, labels clusters by value and projects the players with PCA.
+    Saves the value labels (CSV) and the plotting data (segments .npz) without drawing anything.
 
     Args:
         player_type (str): 'batters' or 'pitchers'.
         n_clusters (int or None): Number of clusters. If None, silhouette score is used to select.
         random_state (int): Random seed for reproducibility.
+        n_jobs (int), sample_size (int or None), minibatch (bool): Silhouette sweep options, see silhouette_sweep.
     Returns:
-        pd.DataFrame: DataFrame with cluster assignments and value labels.
+        tuple: (DataFrame with cluster assignments and value labels, segments dict for plots.render_segments)
     """
     if player_type == 'batters':
-        df_norm = get_batters_df_normalized()
-        df_raw = get_batters_df()
         war_col = 'b_war'
     elif player_type == 'pitchers':
-        df_norm = get_pitchers_df_normalized()
-        df_raw = get_pitchers_df()
         war_col = 'p_war'
     else:
         raise ValueError("player_type must be 'batters' or 'pitchers'")
+    # Shared, memoized views: the table is only queried and normalized once per process
+    player_data = get_player_data()
+    with span('load', player_type=player_type):
+        df_norm = player_data.normalized(player_type)
+        df_raw = player_data.raw(player_type)
     # Use only numeric columns for clustering
     X = df_norm.dropna(axis=1, how='all').dropna()
     # Align with raw for value calculation
     df_raw = df_raw.loc[X.index]
     # If n_clusters not specified, use silhouette score to find best
+    k_values, scores = [], []
     if n_clusters is None:
-        best_k, _ = compute_silhouette_scores(X.values)
+        best_k, scores = compute_silhouette_scores(X.values, random_state=random_state, n_jobs=n_jobs,
+                                                   sample_size=sample_size, minibatch=minibatch)
         n_clusters = int(best_k)
-    # KMeans clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state)
-    clusters = kmeans.fit_predict(X.values)
+        k_values = list(range(2, 2 + len(scores)))
+    # KMeans clustering (the sweep already fitted this k on the same data)
+    with span('kmeans', k=n_clusters):
+        kmeans = fitted_model(X.values, n_clusters, random_state, minibatch)
+        clusters = kmeans.labels_
     X['cluster'] = clusters
     # Compute value metric for labeling
     if war_col in df_raw.columns and 'salary' in df_raw.columns:
@@ -112,51 +255,73 @@ def cluster_and_visualize_value_segments(player_type='batters', n_clusters=None,
     if 'fullName' in df_raw.columns:
         X['fullName'] = df_raw['fullName']
     # --- Cluster profiling ---
-    print(f"\nCluster Profiling for {player_type.title()} (mean/std/count):")
+    logger.info(f"\nCluster Profiling for {player_type.title()} (mean/std/count):")
     # Only use numeric columns for profiling
     profile_cols = [col for col in X.columns.drop(['cluster', 'value_label']) if pd.api.types.is_numeric_dtype(X[col])]
     profile = X.groupby('value_label')[profile_cols].agg(['mean', 'std', 'count'])
-    print(profile)
-    print("\n--- End of Cluster Profiling ---\n")
+    logger.info(profile)
+    logger.info("\n--- End of Cluster Profiling ---\n")
     # PCA for visualization
-    pca = PCA(n_components=2, random_state=random_state)
-    numeric_cols = [col for col in X.columns if pd.api.types.is_numeric_dtype(X[col]) and col != 'cluster']
-    X_pca = pca.fit_transform(X[numeric_cols])
-    # Visualization
-    plt.figure(figsize=(10, 6))
-    colors = {"Overvalued": "blue", "Fairly Valued": "gray", "Undervalued": "orange"}
-    for label, color in colors.items():
-        mask = X['value_label'] == label
-        plt.scatter(
-            X_pca[mask, 0],
-            X_pca[mask, 1],
-            label=label,
-            alpha=0.7,
-            c=color
-        )
-    plt.xlabel("PCA Component 1")
-    plt.ylabel("PCA Component 2")
-    plt.title(f"{player_type.title()} Value Segments (PCA, Normalized, k={n_clusters})")
-    plt.legend()
-    plt.tight_layout()
-    # Save the figure as PNG
-    fig_path = f"reports/figures/{player_type}_value_segments.png"
-    plt.savefig(fig_path)
-    print(f"Saved cluster visualization to {fig_path}")
-    plt.show()
+    with span('pca'):
+        pca = PCA(n_components=2, random_state=random_state)
+        numeric_cols = [col for col in X.columns if pd.api.types.is_numeric_dtype(X[col]) and col != 'cluster']
+        X_pca = pca.fit_transform(X[numeric_cols])
     # Save results to CSV for dashboard use
     output_cols = ['fullName', 'value_label', 'value', 'salary']
     output_cols = [col for col in output_cols if col in X.columns]
-    output_path = f"data/processed/{player_type}_value_labels.csv"
-    X[output_cols].to_csv(output_path, index=False)
-    print(f"Saved value labels to {output_path}")
+    output_path = LABELS_PATH.format(player_type=player_type)
+    segments = {'player_type': player_type, 'n_clusters': n_clusters, 'k_values': k_values, 'scores': scores,
+                'pca': X_pca, 'value_labels': X['value_label'].to_numpy()}
+    with span('write_csv'):
+        X[output_cols].to_csv(output_path, index=False)
+        save_segments(segments, SEGMENTS_PATH.format(player_type=player_type))
+    count('value_labels_written', len(X))
+    logger.info(f"Saved value labels to {output_path}")
+    return X, segments
+
+def cluster_and_visualize_value_segments(player_type='batters', n_clusters=None, random_state=42, n_jobs=SWEEP_JOBS,
+                                         sample_size=SILHOUETTE_SAMPLE_SIZE, minibatch=False, plots=True,
+                                         background=False, show=False):
+    """
+    Clusters one player type (see cluster_value_segments), then renders its figures to reports/figures.
+
+    Args:
+        plots (bool): Render the figures. False never imports matplotlib.
+        background (bool): Render on a background thread and return immediately (see plots.wait_for_renders).
+        show (bool): Also open the figures in a window.
+        Other arguments: see cluster_value_segments.
+    Returns:
+        pd.DataFrame: DataFrame with cluster assignments and value labels.
+    """
+    X, segments = cluster_value_segments(player_type, n_clusters, random_state, n_jobs, sample_size, minibatch)
+    if plots:
+        from src.clustering import plots as plotting
+        if background and not show:
+            plotting.render_in_background(segments)
+        else:
+            plotting.render_segments(segments, show=show)
     return X
 
 # ----------------------
 # Main Entrypoint
 # ----------------------
 if __name__ == "__main__":
-    print("Batters Clustering:")
-    cluster_and_visualize_value_segments('batters')
-    print("\nPitchers Clustering:")
-    cluster_and_visualize_value_segments('pitchers')
+    parser = argparse.ArgumentParser(description="Cluster players into value segments.")
+    parser.add_argument('--jobs', type=int, default=SWEEP_JOBS, help='Parallel fits in the k sweep (-1 = all cores)')
+    parser.add_argument('--sample-size', type=int, default=SILHOUETTE_SAMPLE_SIZE,
+                        help='Score the silhouette on a stratified sample above this many rows (0 = always exact)')
+    parser.add_argument('--minibatch', action='store_true', help='Use MiniBatchKMeans (for very large tables)')
+    parser.add_argument('--no-plots', action='store_true', help='Only compute and save the results (no matplotlib)')
+    parser.add_argument('--show', action='store_true', help='Open the figures in a window after saving them')
+    args = parser.parse_args()
+    configure_logging()
+    options = {'n_jobs': args.jobs, 'sample_size': args.sample_size or None, 'minibatch': args.minibatch,
+               'plots': not args.no_plots, 'show': args.show}
+    # Batter figures are rendered in the background while the pitchers are clustered
+    logger.info("Batters Clustering:")
+    cluster_and_visualize_value_segments('batters', background=True, **options)
+    logger.info("\nPitchers Clustering:")
+    cluster_and_visualize_value_segments('pitchers', **options)
+    if not args.no_plots:
+        from src.clustering.plots import wait_for_renders
+        wait_for_renders()
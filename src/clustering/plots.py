@@ -0,0 +1,143 @@
+"""
+Figure rendering for the clustering results, kept apart from the computation in clustering.py.
+- Draws with matplotlib's object-oriented API on the non-GUI Agg canvas, so no display is needed and figures can be
+  rendered from any thread, e.g. in the background while the next player type is clustered
+- Renders from the persisted segments file (see clustering.save_segments), so figures can be redrawn without
+  clustering again
+- pyplot (and with it a GUI backend) is only imported when figures are shown interactively
+"""
+
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.instrumentation import count, span
+
+FIGURE_DIR = 'reports/figures'
+COLORS = {"Overvalued": "blue", "Fairly Valued": "gray", "Undervalued": "orange"}
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_pending = []
+_executor_lock = threading.Lock()
+
+
+def _new_figure(figsize, show):
+    if show:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+    return Figure(figsize=figsize)
+
+# ----------------------
+# Figures
+# ----------------------
+def silhouette_figure(k_values, scores, show=False):
+    """
+    Silhouette score per number of clusters.
+    """
+    fig = _new_figure((8, 4), show)
+    ax = fig.subplots()
+    ax.plot(k_values, scores, marker='o')
+    ax.set_xlabel('Number of clusters (k)')
+    ax.set_ylabel('Silhouette Score')
+    ax.set_title('Silhouette Score vs. Number of Clusters')
+    fig.tight_layout()
+    return fig
+
+def segments_figure(pca, value_labels, player_type, n_clusters, show=False):
+    """
+    PCA scatter plot of the players colored by value label.
+    """
+    fig = _new_figure((10, 6), show)
+    ax = fig.subplots()
+    for label, color in COLORS.items():
+        mask = value_labels == label
+        ax.scatter(
+            pca[mask, 0],
+            pca[mask, 1],
+            label=label,
+            alpha=0.7,
+            c=color
+        )
+    ax.set_xlabel("PCA Component 1")
+    ax.set_ylabel("PCA Component 2")
+    ax.set_title(f"{player_type.title()} Value Segments (PCA, Normalized, k={n_clusters})")
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+def render_segments(segments, figure_dir=FIGURE_DIR, show=False):
+    """
+    Saves the figures of one clustering result (the silhouette sweep, if one ran, and the value segments).
+
+    Args:
+        segments (dict): Result of clustering.cluster_value_segments or clustering.load_segments.
+        figure_dir (str): Directory for the PNG files.
+        show (bool): Also open the figures in a window (blocks until closed).
+    Returns:
+        list: Paths of the saved figures.
+    """
+    player_type = segments['player_type']
+    os.makedirs(figure_dir, exist_ok=True)
+    paths = []
+    figures = []
+    with span('plotting', player_type=player_type):
+        if len(segments['k_values']):
+            figures.append((silhouette_figure(segments['k_values'], segments['scores'], show),
+                            os.path.join(figure_dir, f"{player_type}_silhouette_scores.png")))
+        figures.append((segments_figure(segments['pca'], np.asarray(segments['value_labels']), player_type,
+                                        segments['n_clusters'], show),
+                        os.path.join(figure_dir, f"{player_type}_value_segments.png")))
+        for fig, path in figures:
+            fig.savefig(path)
+            paths.append(path)
+            logger.info(f"Saved cluster visualization to {path}")
+    count('figures_rendered', len(paths))
+    if show:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return paths
+
+def render_file(path, figure_dir=FIGURE_DIR):
+    """
+    Renders the figures of a saved segments file (see clustering.save_segments).
+    """
+    from src.clustering.clustering import load_segments
+    return render_segments(load_segments(path), figure_dir)
+
+# ----------------------
+# Background Rendering
+# ----------------------
+def render_in_background(segments, figure_dir=FIGURE_DIR):
+    """
+    Queues render_segments on a background thread and returns its Future. Call wait_for_renders before exiting.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='render')
+        future = _executor.submit(render_segments, segments, figure_dir)
+        _pending.append(future)
+    return future
+
+def wait_for_renders():
+    """
+    Blocks until every queued figure is saved, and re-raises the first rendering error.
+
+    Returns:
+        list: Paths of the figures saved in the background.
+    """
+    with _executor_lock:
+        pending = list(_pending)
+        _pending.clear()
+    paths = []
+    for future in pending:
+        paths += future.result()
+    return paths
@@ -1,259 +1,536 @@
 """
 Data cleaning and database creation for baseball player stats.
-- Parses raw HTML player files
+- Parses raw HTML player files (only the fragments holding salary and stats, see extract.py)
 - Extracts salary, batting, and pitching stats
+- Skips pages whose header names a different player than the file (a wrong ID picked during discovery)
 - Saves processed data to SQLite database and CSV
+- Keeps the incremental parse cache in its own database, so cache bookkeeping never changes baseball_stats.db
+- Writes a columnar memory-mapped snapshot of the loader output (see snapshot.py)
 - Provides functions to load and normalize dataframes
 """
 
+import logging
 import os
 import pandas as pd
-import sqlite3
-import re
-from bs4 import BeautifulSoup
+import sys
+import time
+import argparse
+import hashlib
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.extract import extract_player_stats, BATTING_COLUMNS, PITCHING_COLUMNS, EXTRACT_VERSION
+from src.data.records import RecordBuilder
+from src.data.resolver import HEADER_NAME_RE, repair_mojibake, verify_page
+from src.data.schema import apply_schema, memory_report, sql_types
+from src.data.db import create_indexes, finish_writes, read_connection, remove_database, write_connection
+from src.data.snapshot import read_snapshot, write_snapshot, snapshot_is_current
+from src.instrumentation import configure_logging, count, span
+
+DB_PATH = 'data/processed/baseball_stats.db'
+# Kept out of DB_PATH: restamping touched files must not change the database every later stage fingerprints
+PARSE_CACHE_PATH = 'data/processed/parse_cache.db'
+PROGRESS_EVERY = 100
+PARSE_CACHE_TABLE = 'parse_cache'
+PLAYER_SEASON_KEY = ('fullName', 'year')
+
+logger = logging.getLogger(__name__)
+
+# ----------------------
+# Per-File Parsing
+# ----------------------
+def parse_player_file(file):
+    """
+    Reads one raw player page and extracts salary plus pitching and batting rows.
+    Runs inside worker processes, so it only returns plain Python data.
+
+    Args:
+        file (str): Path to the player's HTML file.
+    Returns:
+        dict: {'file', 'salary', 'pitching', 'batting', 'messages'} (see extract.extract_player_stats), plus
+        'page_player' when the page belongs to another player (see parse_player_page).
+    """
+    with open(file, "r", encoding="utf-8") as f:
+        html_content = f.read()
+    return parse_player_page(html_content, file)
+
+def parse_player_page(html_content, file):
+    """
+    Extracts salary plus pitching and batting rows from a page's HTML (see parse_player_file).
+    `file` is the page's path in data/raw, which names the player and keys the parse cache.
+    A page whose header names someone else is not extracted: its record has no salary or rows, and 'page_player'
+    holds the header name, so another player's career never lands under this player's name.
+    """
+    player_name = os.path.splitext(os.path.basename(file))[0]
+    if verify_page(player_name, html_content) is False:
+        page_player = repair_mojibake(HEADER_NAME_RE.search(html_content).group(1).strip())
+        record = {'salary': 0, 'pitching': None, 'batting': None, 'pitching_seasons': [], 'batting_seasons': [],
+                  'messages': [], 'page_player': page_player}
+    else:
+        # Only the #meta block and the two standard stats tables are parsed, not the whole page
+        record = extract_player_stats(html_content, player_name)
+    record['file'] = file
+    return record
+
+def parse_player_files(files, workers=None):
+    """
+    Parses player files, spreading them across a process pool when more than one worker is requested.
+    Records are yielded in the order of `files` regardless of which worker finishes first.
+
+    Args:
+        files (list): Paths to parse.
+        workers (int or None): Number of worker processes. None uses every core, 1 parses in this process.
+    Yields:
+        dict: One record per file, as returned by parse_player_file.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < 2:
+        for file in files:
+            yield parse_player_file(file)
+        return
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_player_file, files, chunksize=chunksize)
+
+# ----------------------
+# Parse Cache
+# ----------------------
+def file_hash(file):
+    """
+    SHA-256 hex digest of a file's bytes.
+    """
+    with open(file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_parse_cache(conn):
+    """
+    Loads the per-file parse cache (a connection to PARSE_CACHE_PATH), creating its table if needed.
+    Entries written by a different EXTRACT_VERSION are ignored, so those files are parsed again.
+
+    Returns:
+        dict: file path -> {'mtime', 'size', 'content_hash', 'record'}. mtime is None for pages streamed into the
+        cache without being written to data/raw (see stream.py).
+    """
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({PARSE_CACHE_TABLE})")]
+    if columns and 'version' not in columns:
+        conn.execute(f"DROP TABLE {PARSE_CACHE_TABLE}")
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PARSE_CACHE_TABLE} (
+            file TEXT PRIMARY KEY,
+            mtime REAL,
+            size INTEGER,
+            content_hash TEXT,
+            record TEXT,
+            version INTEGER
+        )
+    """)
+    cache = {}
+    rows = conn.execute(f"SELECT file, mtime, size, content_hash, record FROM {PARSE_CACHE_TABLE} WHERE version = ?",
+                        (EXTRACT_VERSION,))
+    for file, mtime, size, digest, record in rows:
+        cache[file] = {'mtime': mtime, 'size': size, 'content_hash': digest, 'record': record}
+    return cache
+
+def write_parse_cache(conn, rows):
+    """
+    Stores parsed records in the parse cache.
+
+    Args:
+        rows (list): (file, mtime, size, content_hash, record) tuples; record is the parse_player_file dict.
+    """
+    conn.executemany(f"INSERT OR REPLACE INTO {PARSE_CACHE_TABLE} VALUES (?, ?, ?, ?, ?, ?)", [
+        (file, mtime, size, digest, json.dumps({key: value for key, value in record.items() if key != 'file'}),
+         EXTRACT_VERSION)
+        for file, mtime, size, digest, record in rows
+    ])
+
+def scan_changes(files, cache):
+    """
+    Compares files on disk with the parse cache. A file whose mtime and size match is unchanged without
+    reading it; otherwise its content hash decides whether it needs to be parsed again.
+
+    Returns:
+        tuple: (to_parse, restamped, removed) where to_parse lists new/changed files, restamped maps
+        touched-but-identical files to their new (mtime, size, hash) and removed lists cached files no longer on disk.
+        Streamed pages that never had a file (mtime None) are not counted as removed.
+    """
+    to_parse = []
+    restamped = {}
+    for file in files:
+        stat = os.stat(file)
+        cached = cache.get(file)
+        if cached and cached['mtime'] == stat.st_mtime and cached['size'] == stat.st_size:
+            continue
+        digest = file_hash(file)
+        if cached and cached['content_hash'] == digest:
+            restamped[file] = (stat.st_mtime, stat.st_size, digest)
+        else:
+            to_parse.append(file)
+    on_disk = set(files)
+    removed = [file for file, cached in cache.items() if file not in on_disk and cached['mtime'] is not None]
+    return to_parse, restamped, removed
+
+# ----------------------
+# SQLite Writes
+# ----------------------
+def _insert_rows(conn, table, df, upsert=False):
+    """
+    Inserts the rows of `df` with one executemany in the connection's open transaction. With `upsert`, rows whose
+    (fullName, year) key already exists are updated in place.
+    """
+    columns = ', '.join(f'"{col}"' for col in df.columns)
+    sql = f'INSERT INTO "{table}" ({columns}) VALUES ({", ".join("?" * len(df.columns))})'
+    if upsert:
+        updates = ', '.join(f'"{col}" = excluded."{col}"' for col in df.columns if col not in PLAYER_SEASON_KEY)
+        sql += f' ON CONFLICT({", ".join(PLAYER_SEASON_KEY)}) DO UPDATE SET {updates}'
+    # Plain Python values (None for missing) in one conversion, instead of per-cell adaptation
+    values = df.astype(object).where(df.notna(), None)
+    conn.executemany(sql, values.itertuples(index=False, name=None))
+
+def save_table(conn, table, df, changed_players, replace=False):
+    """
+    Writes a stats table. When the table already exists with the same schema, only rows of `changed_players`
+    are touched: their new rows are upserted on (fullName, year) and rows they no longer have are deleted.
+    Otherwise (or when `replace` is set) the table is recreated, bulk-inserted and then indexed.
+    Nothing is committed here; the caller commits every table and the parse cache together.
+
+    Returns:
+        int: Number of rows written.
+    """
+    existing = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    if df.empty:
+        if existing is not None and changed_players:
+            conn.executemany(f'DELETE FROM "{table}" WHERE fullName = ?', [(name,) for name in changed_players])
+        return 0
+    schema = pd.io.sql.get_schema(df, table, con=conn, dtype=sql_types(df.columns))
+    if replace or existing is None or existing[0] != schema:
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        conn.execute(schema)
+        _insert_rows(conn, table, df)
+        create_indexes(conn, table)
+        return len(df)
+    create_indexes(conn, table)
+    rows = df[df['fullName'].isin(changed_players)]
+    keep = set(zip(rows['fullName'], rows['year'].astype(object)))
+    stale = [
+        (name, year) for name, year in conn.execute(
+            f'SELECT fullName, year FROM "{table}" WHERE fullName IN ({", ".join("?" * len(changed_players))})',
+            list(changed_players))
+        if (name, year) not in keep
+    ]
+    conn.executemany(f'DELETE FROM "{table}" WHERE fullName = ? AND year IS ?', stale)
+    _insert_rows(conn, table, rows, upsert=True)
+    return len(rows)
 
 # ----------------------
 # Main Data Extraction
 # ----------------------
-def get_dataframes():
+def get_dataframes(workers=None, full_rebuild=False, parsed_files=()):
     """
-    Parses all HTML files in data/raw, extracts player stats and salary, and saves to SQLite DB and CSV files.
-    
+    Parses HTML files in data/raw, extracts player stats and salary, and saves to SQLite DB and CSV files.
+
+    By default the build is incremental: a parse cache keyed by file path plus mtime/size/content hash is kept in
+    its own database (PARSE_CACHE_PATH), only new or changed files are parsed, and only those players' rows are
+    upserted into the batters/pitchers tables. A run with no changes (touched files included) returns without
+    touching the stats database.
+    Pages the streaming gather (stream.py) parsed into the cache without writing them to data/raw are included.
+
+    Args:
+        workers (int or None): Number of parser processes. None uses every core, 1 parses serially.
+        full_rebuild (bool): Delete the database and reparse every file.
+        parsed_files (iterable): Pages already parsed into the cache by the streaming gather; their players' rows
+            are upserted although the cache is current.
     Returns:
         None. Saves processed data to 'data/processed/baseball_stats.db', 'batters.csv', and 'pitchers.csv'.
     """
     files = []
     path = 'data/raw'
     
-    if not os.path.exists(path):
-        print(f"Directory '{path}' does not exist. Please run load_data.py first to download the files.")
+    parsed_files = list(parsed_files)
+    # Without data/raw the tables can still come from pages streamed into the parse cache
+    if not os.path.exists(path) and not parsed_files and not os.path.exists(DB_PATH):
+        logger.error(f"Directory '{path}' does not exist. Please run load_data.py first to download the files.")
         return
     
     # Gather all HTML files in the raw data directory
-    for filename in os.listdir(path):
+    for filename in sorted(os.listdir(path)) if os.path.exists(path) else []:
         full_path = os.path.join(path, filename)
         if os.path.isfile(full_path):
             files.append(full_path)
     
-    print(f"Found {len(files)} files in {path}")
-    for file in files:
-        print(f"  - {file}")
+    logger.info(f"Found {len(files)} files in {path}")
 
-    batters_df = pd.DataFrame()
-    pitchers_df = pd.DataFrame()
-    num_files = len(files)
-    current_file = 0
-    for file in files:
-        current_file += 1
-        print(f"Processing file {current_file} of {num_files}: {file}")
-        with open(file, "r", encoding="utf-8") as f:
-            html_content = f.read()
-
-        player_name = file.split(".html")[0].split("\\")[-1]
-        
-        # Parse the HTML
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # -----------
-        # Salary Extraction
-        # -----------
-        salary = 0
-        meta = soup.find(id="meta")
-        if meta:
-            for p in meta.find_all("p"):
-                if "Contract Status" in p.text:
-                    contract_text = p.text
-                    # Look for contract pattern like '5 yr/$300M', '5 yrs/$300M', or just '$20.5M'
-                    contract_match = re.search(r'(\d+) yr[s]?/\$(\d+\.?\d*[MBk]?)', contract_text)
-                    if contract_match:
-                        years = int(contract_match.group(1))
-                        total_salary = contract_match.group(2)
-                        # Convert total_salary to float
-                        if total_salary.endswith('M'):
-                            total_salary_val = float(total_salary[:-1]) * 1_000_000
-                        elif total_salary.endswith('k'):
-                            total_salary_val = float(total_salary[:-1]) * 1_000
-                        elif total_salary.endswith('B'):
-                            total_salary_val = float(total_salary[:-1]) * 1_000_000_000
-                        else:
-                            total_salary_val = float(total_salary)
-                        salary = total_salary_val / years
-                        print(f"Contract: {years} yr, Total: ${total_salary}, Annual Salary: ${salary:,.0f}")
-                    else:
-                        # Fallback: Look for salary pattern like $20.5M or $15.2M
-                        salary_match = re.search(r'\$(\d+\.?\d*[MBk]?)', contract_text)
-                        if salary_match:
-                            salary = salary_match.group(1)
-                            if salary.endswith('M'):
-                                salary = float(salary[:-1]) * 1_000_000
-                            elif salary.endswith('k'):
-                                salary = float(salary[:-1]) * 1_000
-                            elif salary.endswith('B'):
-                                salary = float(salary[:-1]) * 1_000_000_000
-                            else:
-                                salary = float(salary)
-                            print(f"Salary: ${salary:,.0f}")
-                        else:
-                            print("No salary found in contract status")
-                            salary = 0
-        # -----------
-        # Pitching Stats Extraction
-        # -----------
-        div = soup.find(id="div_players_standard_pitching")
-        if div:
-            row = div.find(id="players_standard_pitching.2024")
-            if row:
-                stats_dict = {}
-                stats_dict['fullName'] = player_name
-                year_th = row.find("th", {"data-stat": "year_id"})
-                if year_th:
-                    year = year_th.text.strip()
-                else:
-                    year = None
-                stats_dict["year"] = year
-                for cell in row.find_all("td"):
-                    stat_name = cell.get("data-stat")
-                    stat_value = cell.text.strip()
-                    stats_dict[stat_name] = stat_value
-                stats_dict['salary'] = salary
-                df = pd.DataFrame([stats_dict])
-                pitchers_df = pd.concat([pitchers_df, df], ignore_index=True)
-            else:
-                print("2025 pitching row not found.")
-        else:
-            print("Pitching table not found.")
-        
-        # -----------
-        # Batting Stats Extraction
-        # -----------
-        div = soup.find(id="div_players_standard_batting")
-        if div:
-            row = div.find(id="players_standard_batting.2024")
-            if row:
-                stats_dict = {}
-                stats_dict['fullName'] = player_name
-                year_th = row.find("th", {"data-stat": "year_id"})
-                if year_th:
-                    year = year_th.text.strip()
-                else:
-                    year = None
-                stats_dict["year"] = year
-                for cell in row.find_all("td"):
-                    stat_name = cell.get("data-stat")
-                    stat_value = cell.text.strip()
-                    stats_dict[stat_name] = stat_value
-                stats_dict['salary'] = salary
-                df = pd.DataFrame([stats_dict])
-                batters_df = pd.concat([batters_df, df], ignore_index=True)
-            else:
-                print("2025 batting row not found.")
-        else:
-            print("Batting table not found.")
+    db_dir = 'data/processed'
+    os.makedirs(db_dir, exist_ok=True)
+    db_path = os.path.join(db_dir, 'baseball_stats.db')
+
+    # Delete existing database and parse cache on a full rebuild
+    if full_rebuild and os.path.exists(db_path):
+        remove_database(db_path)
+        logger.info(f"Deleted existing database: {db_path}")
+    if full_rebuild:
+        remove_database(PARSE_CACHE_PATH)
+
+    cache_conn = write_connection(PARSE_CACHE_PATH)
+    with span('scan', files=len(files)):
+        cache = load_parse_cache(cache_conn)
+        to_parse, restamped, removed = scan_changes(files, cache)
+    # Streamed pages without a file are part of the tables too, in the order their files would have
+    on_disk = set(files)
+    files = sorted(files + [file for file, cached in cache.items() if cached['mtime'] is None and file not in on_disk])
+    streamed = [file for file in parsed_files if file in cache and file not in to_parse]
+    if not to_parse and not removed and not streamed and os.path.exists(db_path):
+        cache_conn.executemany(f"UPDATE {PARSE_CACHE_TABLE} SET mtime = ?, size = ? WHERE file = ?",
+                               [(mtime, size, file) for file, (mtime, size, _) in restamped.items()])
+        finish_writes(cache_conn, analyze=False)
+        logger.info(f"No changes since last clean ({len(files)} files up to date).")
+        with span('snapshot'):
+            save_snapshots(db_path)
+        return
+    logger.info(f"Parsing {len(to_parse)} new or changed files, {len(files) - len(to_parse)} cached "
+                f"({len(streamed)} streamed), {len(removed)} removed")
+
+    # ----------------------
+    # Parse Changed Files
+    # ----------------------
+    records = {file: json.loads(cache[file]['record']) for file in files if file not in to_parse}
+    num_files = len(to_parse)
+    message_counts = Counter()
+    with_salary = 0
+    start = time.perf_counter()
+    with span('parse', files=num_files):
+        for current_file, stats in enumerate(parse_player_files(to_parse, workers), start=1):
+            if stats['salary']:
+                with_salary += 1
+            message_counts.update(stats['messages'])
+            records[stats['file']] = stats
+
+            if current_file % PROGRESS_EVERY == 0 or current_file == num_files:
+                elapsed = time.perf_counter() - start
+                logger.info(f"Processed {current_file} of {num_files} files ({current_file / elapsed:.1f} files/sec)")
+    count('files_parsed', num_files)
+    count('files_cached', len(files) - num_files)
+
+    logger.info(f"Salary found for {with_salary} of {num_files} parsed players")
+    for message, files_with_message in sorted(message_counts.items()):
+        logger.info(f"{message} ({files_with_message} files)")
+
+    # Rows are collected column by column and each DataFrame is built once after parsing
+    builders = {
+        'batters': RecordBuilder(BATTING_COLUMNS),
+        'pitchers': RecordBuilder(PITCHING_COLUMNS),
+        'batting_seasons': RecordBuilder(BATTING_COLUMNS),
+        'pitching_seasons': RecordBuilder(PITCHING_COLUMNS),
+    }
+    wrong_player = [file for file in files if records[file].get('page_player')]
+    if wrong_player:
+        logger.warning(f"Skipped {len(wrong_player)} pages that belong to another player "
+                       f"(rerun load_data.py to resolve them)")
+        for file in wrong_player:
+            logger.debug(f"{file}: page is for {records[file]['page_player']}")
+    count('pages_wrong_player', len(wrong_player))
+    with span('build_rows'):
+        for file in files:
+            record = records[file]
+            if record['pitching'] is not None:
+                builders['pitchers'].append(record['pitching'])
+            if record['batting'] is not None:
+                builders['batters'].append(record['batting'])
+            builders['pitching_seasons'].extend(record['pitching_seasons'])
+            builders['batting_seasons'].extend(record['batting_seasons'])
 
     # ----------------------
     # Save to SQLite Database
     # ----------------------
-    db_dir = 'data/processed'
-    os.makedirs(db_dir, exist_ok=True)
-    db_path = os.path.join(db_dir, 'baseball_stats.db')
-    
-    # Delete existing database if it exists
-    if os.path.exists(db_path):
-        os.remove(db_path)
-        print(f"Deleted existing database: {db_path}")
-    
-    conn = sqlite3.connect(db_path)
-
-    # Save pitchers dataframe to database
-    if not pitchers_df.empty:
-        pitchers_df = load_and_fix_dtypes(pitchers_df)
-        if 'awards' in pitchers_df.columns:
-            pitchers_df = pitchers_df.drop(columns=['awards'])
-        pitchers_df.to_sql('pitchers', conn, if_exists='replace', index=False)
-        print(f"Saved {len(pitchers_df)} pitcher records to database")
-
-    # Save batters dataframe to database 
-    if not batters_df.empty:
-        batters_df = load_and_fix_dtypes(batters_df)
-        if 'awards' in batters_df.columns:
-            batters_df = batters_df.drop(columns=['awards'])
-        batters_df.to_sql('batters', conn, if_exists='replace', index=False)
-        print(f"Saved {len(batters_df)} batter records to database")
-
-    # Close the connection
-    conn.close()
-    print(f"Database saved to: {db_path}")
+    changed_players = [os.path.splitext(os.path.basename(file))[0] for file in to_parse + removed + streamed]
+    # Without a parse cache there is no record of what the tables hold, so they are rewritten in full
+    replace_tables = full_rebuild or not cache
+    conn = write_connection(db_path)
+    # Older databases kept the parse cache next to the stats tables
+    conn.execute(f"DROP TABLE IF EXISTS {PARSE_CACHE_TABLE}")
+
+    # batters/pitchers hold the STATS_SEASON snapshot used for modeling; *_seasons hold every season (long format)
+    frames = {}
+    for table, builder in builders.items():
+        with span('dtype_fix', table=table):
+            df = builder.to_frame()
+            if not df.empty:
+                typed = load_and_fix_dtypes(df)
+                report = memory_report(table, df, typed)
+                logger.info(f"{table}: {report['before_mb']:.3f} MB parsed -> {report['after_mb']:.3f} MB typed "
+                            f"({report['saved_pct']:.0f}% smaller)")
+                df = typed.drop(columns=['awards']) if 'awards' in typed.columns else typed
+        with span('sql_write', table=table):
+            written = save_table(conn, table, df, changed_players, replace_tables)
+        count('rows_written', written)
+        logger.info(f"Saved {written} {table} records to database ({len(df)} total)")
+        frames[table] = df
+    batters_df = frames['batters']
+    pitchers_df = frames['pitchers']
+
+    # One commit for every table, then checkpoint the WAL into the database file
+    finish_writes(conn)
+    logger.info(f"Database saved to: {db_path}")
+
+    # The parse cache is committed after the stats rows: if this is interrupted, the next run parses these files
+    # again and upserts the same rows, whereas the opposite order could record files the tables never got
+    cache_rows = []
+    for file in to_parse:
+        stat = os.stat(file)
+        cache_rows.append((file, stat.st_mtime, stat.st_size, file_hash(file), records[file]))
+    with span('sql_write', table=PARSE_CACHE_TABLE):
+        write_parse_cache(cache_conn, cache_rows)
+        cache_conn.executemany(f"UPDATE {PARSE_CACHE_TABLE} SET mtime = ?, size = ? WHERE file = ?",
+                               [(mtime, size, file) for file, (mtime, size, _) in restamped.items()])
+        cache_conn.executemany(f"DELETE FROM {PARSE_CACHE_TABLE} WHERE file = ?", [(file,) for file in removed])
+        finish_writes(cache_conn, analyze=False)
+    with span('snapshot'):
+        save_snapshots(db_path, force=True)
 
     # Save DataFrames to CSV
     batters_csv_path = os.path.join(db_dir, 'batters.csv')
     pitchers_csv_path = os.path.join(db_dir, 'pitchers.csv')
-    batters_df.to_csv(batters_csv_path, index=False)
-    print(f"Batters DataFrame saved to: {batters_csv_path}")
-    pitchers_df.to_csv(pitchers_csv_path, index=False)
-    print(f"Pitchers DataFrame saved to: {pitchers_csv_path}")
+    with span('csv_write'):
+        batters_df.to_csv(batters_csv_path, index=False)
+        logger.info(f"Batters DataFrame saved to: {batters_csv_path}")
+        pitchers_df.to_csv(pitchers_csv_path, index=False)
+        logger.info(f"Pitchers DataFrame saved to: {pitchers_csv_path}")
 
 # ----------------------
 # DataFrame Loaders
 # ----------------------
-def get_batters_df():
+def _loader_query(table, season_table, season):
+    """
+    Builds a loader query: the modeling snapshot table when no season is given, otherwise an indexed
+    season (or inclusive season range) lookup on the long-format table. Rows are returned in table order
+    (by season first for a range), whichever index the planner picks, so model splits stay reproducible.
+    """
+    if season is None:
+        return f"SELECT * FROM {table} WHERE salary > 0 ORDER BY rowid", ()
+    if isinstance(season, (tuple, list)):
+        start, end = season
+        return (f"SELECT * FROM {season_table} WHERE year BETWEEN ? AND ? AND salary > 0 ORDER BY year, rowid",
+                (int(start), int(end)))
+    return f"SELECT * FROM {season_table} WHERE year = ? AND salary > 0 ORDER BY rowid", (int(season),)
+
+def _read_table(table, season_table, season, drop_na, db_path=DB_PATH):
+    """
+    Runs a loader query against SQLite. Drops 'year' unless a season range was requested.
+    """
+    # Reused connection: the loader queries are prepared once per connection and seek on the indexes
+    query, params = _loader_query(table, season_table, season)
+    df = pd.read_sql_query(query, read_connection(db_path), params=params)
+    if 'year' in df.columns and not isinstance(season, (tuple, list)):
+        df = df.drop(columns=['year'])
+    if drop_na:
+        df = df.dropna()
+    return apply_schema(df)
+
+# Snapshot name -> (table, season table, drop NA rows); the snapshot stores the loader output for season=None
+LOADER_TABLES = {
+    'batters': ('batters', 'batting_seasons', False),
+    'pitchers': ('pitchers', 'pitching_seasons', True),
+}
+
+def save_snapshots(db_path=DB_PATH, force=False):
+    """
+    Writes the columnar snapshot of each default loader's output, with the dtypes the loaders return.
+    Without `force`, snapshots that still match the database are left alone.
+    """
+    conn = read_connection(db_path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for name, (table, season_table, drop_na) in LOADER_TABLES.items():
+        if table not in tables or (not force and snapshot_is_current(name, db_path)):
+            continue
+        df = _read_table(table, season_table, None, drop_na, db_path)
+        write_snapshot(name, df, db_path)
+        logger.info(f"Snapshot of {name} saved ({len(df)} rows)")
+
+def _load(name, season, columns):
+    table, season_table, drop_na = LOADER_TABLES[name]
+    if season is None:
+        # The snapshot is only used while it matches the database; otherwise fall back to SQLite
+        df = read_snapshot(name, DB_PATH, columns)
+        if df is not None:
+            return df
+    df = _read_table(table, season_table, season, drop_na)
+    return df[list(columns)] if columns is not None else df
+
+def get_batters_df(season=None, columns=None):
     """
     Loads batters table from SQLite database, drops 'year' column, and returns DataFrame.
+    The default (season=None) load reads the memory-mapped snapshot when it is up to date with the database.
 
+    Args:
+        season (int, tuple or None): None loads the modeling snapshot ('batters' table). An int loads that season
+            and a (start, end) tuple an inclusive range from 'batting_seasons'; ranges keep the 'year' column.
+        columns (list or None): Only return these columns (only these are read from the snapshot).
     Returns:
         pd.DataFrame: Batters data with salary > 0, without the 'year' column.
     """
-    conn = sqlite3.connect('data/processed/baseball_stats.db')
-    batters_df = pd.read_sql_query("SELECT * FROM batters WHERE salary > 0", conn)
-    if 'year' in batters_df.columns:
-        batters_df = batters_df.drop(columns=['year'])
-    conn.close()
-    return batters_df
+    return _load('batters', season, columns)
 
-def get_pitchers_df():
+def get_pitchers_df(season=None, columns=None):
     """
     Loads pitchers table from SQLite database, drops 'year' column, drops NA, and returns DataFrame.
+    The default (season=None) load reads the memory-mapped snapshot when it is up to date with the database.
 
+    Args:
+        season (int, tuple or None): None loads the modeling snapshot ('pitchers' table). An int loads that season
+            and a (start, end) tuple an inclusive range from 'pitching_seasons'; ranges keep the 'year' column.
+        columns (list or None): Only return these columns (only these are read from the snapshot).
     Returns:
         pd.DataFrame: Pitchers data with salary > 0, without the 'year' column, NA rows dropped.
     """
-    conn = sqlite3.connect('data/processed/baseball_stats.db')
-    pitchers_df = pd.read_sql_query("SELECT * FROM pitchers WHERE salary > 0", conn)
-    if 'year' in pitchers_df.columns:
-        pitchers_df = pitchers_df.drop(columns=['year'])
-    pitchers_df = pitchers_df.dropna()
-    conn.close()
-    return pitchers_df
+    return _load('pitchers', season, columns)
 
 # ----------------------
 # Normalization Helpers
 # ----------------------
-def get_batters_df_normalized():
+def numeric_columns(df):
+    """
+    Numeric (integer/float) columns of a loader DataFrame.
+    """
+    return df.select_dtypes(include='number')
+
+def normalize_numeric(numeric_df):
+    """
+    Min-max scales every column of a numeric DataFrame to [0, 1], as float64 (missing values become NaN).
+    """
+    numeric_df = numeric_df.astype('float64')
+    return (numeric_df - numeric_df.min()) / (numeric_df.max() - numeric_df.min())
+
+def get_batters_df_normalized(season=None):
     """
     Returns normalized numeric columns of batters DataFrame (min-max scaling).
 
+    Args:
+        season (int, tuple or None): Season filter passed to get_batters_df.
     Returns:
         pd.DataFrame: Normalized numeric columns of batters data.
     """
-    batters_df = get_batters_df()
-    batters_numeric = batters_df.select_dtypes(include=['Int64', 'float'])
-    batters_non_numeric = batters_df.select_dtypes(exclude=['Int64', 'float'])
-    batters_normalized_numeric = (batters_numeric - batters_numeric.min()) / (batters_numeric.max() - batters_numeric.min())
+    batters_df = get_batters_df(season)
+    batters_normalized_numeric = normalize_numeric(numeric_columns(batters_df))
     # Optionally, you can return the full DataFrame with non-numeric columns
+    # batters_non_numeric = batters_df.select_dtypes(exclude=['Int64', 'float'])
     # batters_normalized = pd.concat([batters_normalized_numeric, batters_non_numeric.reset_index(drop=True)], axis=1)
     return batters_normalized_numeric
 
-def get_pitchers_df_normalized():
+def get_pitchers_df_normalized(season=None):
     """
     Returns normalized numeric columns of pitchers DataFrame (min-max scaling).
 
+    Args:
+        season (int, tuple or None): Season filter passed to get_pitchers_df.
     Returns:
         pd.DataFrame: Normalized numeric columns of pitchers data.
     """
-    pitchers_df = get_pitchers_df()
-    pitchers_numeric = pitchers_df.select_dtypes(include=['Int64', 'float'])
-    pitchers_non_numeric = pitchers_df.select_dtypes(exclude=['Int64', 'float'])
-    pitchers_normalized_numeric = (pitchers_numeric - pitchers_numeric.min()) / (pitchers_numeric.max() - pitchers_numeric.min())
+    pitchers_df = get_pitchers_df(season)
+    pitchers_normalized_numeric = normalize_numeric(numeric_columns(pitchers_df))
     # Optionally, you can return the full DataFrame with non-numeric columns
+    # pitchers_non_numeric = pitchers_df.select_dtypes(exclude=['Int64', 'float'])
     # pitchers_normalized = pd.concat([pitchers_normalized_numeric, pitchers_non_numeric.reset_index(drop=True)], axis=1)
     return pitchers_normalized_numeric
 
@@ -262,69 +539,21 @@ def get_pitchers_df_normalized():
 # ----------------------
 def load_and_fix_dtypes(df):
     """
-    Converts columns of a DataFrame to the correct pandas dtypes.
-    Uses pandas' convert_dtypes, but can be extended for manual overrides if needed.
+    Converts the parsed text columns of a DataFrame to the dtypes of the schema registry (see schema.py), in one
+    vectorized pass. Rate columns stay float64 here, since this frame is what gets written to SQLite and CSV.
 
     Args:
         df (pd.DataFrame): DataFrame to convert.
     Returns:
         pd.DataFrame: DataFrame with corrected dtypes.
     """
-    # Use pandas' convert_dtypes for best-guess
-    df = df.convert_dtypes()
-    # Manual overrides for known columns (example: year, salary)
-    if 'year' in df.columns:
-        df['year'] = pd.to_numeric(df['year'], errors='coerce').astype('Int64')
-    if 'age' in df.columns:
-        df['age'] = pd.to_numeric(df['age'], errors='coerce').astype('Int64')
-    if 'salary' in df.columns:
-        def parse_salary(val):
-            if pd.isna(val):
-                return None
-            val = str(val).replace('$', '').replace(',', '').strip()
-            if val.endswith('M'):
-                return float(val[:-1]) * 1000000
-            elif val.endswith('k'):
-                return float(val[:-1]) * 1000
-            elif val.endswith('B'):
-                return float(val[:-1]) * 1000000000
-            else:
-                try:
-                    return float(val)
-                except Exception:
-                    return None
-        df['salary'] = df['salary'].map(parse_salary).astype('float')
-    # Batting float columns
-    float_cols = [
-        'b_war', 'b_batting_avg', 'b_onbase_perc', 'b_slugging_perc', 'b_onbase_plus_slugging',
-        'b_roba'
-    ]
-    # Pitching float columns (updated to match corrected pitcher columns)
-    float_cols += [
-        'p_war', 'p_ip', 'p_earned_run_avg', 'p_win_loss_perc', 'p_fip', 'p_whip',
-        'p_hits_per_nine', 'p_hr_per_nine', 'p_bb_per_nine', 'p_so_per_nine', 'p_strikeouts_per_base_on_balls'
-    ]
-    for col in float_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col].astype(str).str.replace('^\\.', '0.', regex=True), errors='coerce').astype('float')
-    # Batting integer columns
-    int_cols = [
-        'b_games', 'b_pa', 'b_ab', 'b_r', 'b_h', 'b_doubles', 'b_triples', 'b_hr', 'b_rbi',
-        'b_sb', 'b_cs', 'b_bb', 'b_so', 'b_onbase_plus_slugging_plus', 'b_rbat_plus', 'b_tb',
-        'b_gidp', 'b_hbp', 'b_sh', 'b_sf', 'b_ibb', 'awards', 'b_rbat_plus'
-    ]
-    # Pitching integer columns (updated to match corrected pitcher columns)
-    int_cols += [
-        'p_g', 'p_gs', 'p_r', 'p_bfp', 'p_earned_run_avg_plus'
-    ]
-    for col in int_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
-    # Categorical/text columns: fullName, team_name_abbr, comp_name_abbr, pos, awards
-    for col in ['fullName', 'team_name_abbr', 'comp_name_abbr', 'pos', 'awards']:
-        if col in df.columns:
-            df[col] = df[col].astype('string')
-    return df
+    return apply_schema(df, storage=True)
 
 if __name__ == "__main__":
-    get_dataframes()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Parse raw player pages into the processed database.")
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: all cores, 1 = serial)')
+    parser.add_argument('--full-rebuild', action='store_true', help='Delete the database and reparse every file')
+    parser.add_argument('--log-level', default=None, help='DEBUG, INFO (default), WARNING or ERROR')
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+    get_dataframes(workers=args.workers, full_rebuild=args.full_rebuild)
\ No newline at end of file
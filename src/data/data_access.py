@@ -0,0 +1,140 @@
+"""
+Memoized access to the processed player tables.
+- Loads each table once per process and keeps its raw, numeric and normalized views
+- Invalidates the cached views when the database changes (mtime/size first, then content hash)
+- Counts cache hits, misses and invalidations
+- Safe to share between threads (pipeline stages running in parallel)
+"""
+
+import hashlib
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.clean_data import DB_PATH, get_batters_df, get_pitchers_df, numeric_columns, normalize_numeric
+
+LOADERS = {
+    'batters': get_batters_df,
+    'pitchers': get_pitchers_df,
+}
+
+
+def _season_key(season):
+    return tuple(season) if isinstance(season, (tuple, list)) else season
+
+
+class PlayerData:
+    """
+    Process-wide cache in front of the clean_data loaders.
+
+    Views are shared between callers, so they should be treated as read-only (copy before adding columns).
+
+    Args:
+        db_path (str): Database whose changes invalidate the cache.
+    """
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._views = {}
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._digest = None
+
+    # ----------------------
+    # Invalidation
+    # ----------------------
+    def _file_digest(self):
+        digest = hashlib.sha256()
+        with open(self.db_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _check_source(self):
+        """
+        Drops every cached view if the database changed. A touched file with identical content keeps the cache.
+        """
+        if not os.path.exists(self.db_path):
+            stamp = None
+        else:
+            stat = os.stat(self.db_path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        digest = self._file_digest() if stamp is not None else None
+        if digest != self._digest and self._views:
+            self._views.clear()
+            self.invalidations += 1
+        self._stamp = stamp
+        self._digest = digest
+
+    def invalidate(self):
+        """
+        Drops every cached view.
+        """
+        with self._lock:
+            self._views.clear()
+            self._stamp = None
+            self._digest = None
+            self.invalidations += 1
+
+    # ----------------------
+    # Views
+    # ----------------------
+    def _view(self, key, build):
+        # Reentrant: building a derived view loads the view it is derived from
+        with self._lock:
+            self._check_source()
+            if key in self._views:
+                self.hits += 1
+                return self._views[key]
+            self.misses += 1
+            value = self._views[key] = build()
+            return value
+
+    def raw(self, player_type, season=None):
+        """
+        Loader output for 'batters' or 'pitchers' (see clean_data.get_batters_df / get_pitchers_df).
+        """
+        if player_type not in LOADERS:
+            raise ValueError("player_type must be 'batters' or 'pitchers'")
+        season = _season_key(season)
+        return self._view(('raw', player_type, season), lambda: LOADERS[player_type](season))
+
+    def numeric(self, player_type, season=None):
+        """
+        Numeric (integer/float) columns of the raw view.
+        """
+        season = _season_key(season)
+        return self._view(('numeric', player_type, season),
+                          lambda: numeric_columns(self.raw(player_type, season)))
+
+    def normalized(self, player_type, season=None):
+        """
+        Min-max normalized numeric columns, the same frame as clean_data.get_*_df_normalized.
+        """
+        season = _season_key(season)
+        return self._view(('normalized', player_type, season),
+                          lambda: normalize_numeric(self.numeric(player_type, season)))
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations,
+                'cached_views': len(self._views)}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_player_data():
+    """
+    Shared PlayerData instance for this process.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = PlayerData()
+        return _default
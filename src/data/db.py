@@ -0,0 +1,133 @@
+"""
+SQLite access shared by the cleaner, the loaders and the single-player lookup.
+- Reuses one read connection per thread and database file instead of opening one per query. sqlite3 caches each
+  connection's prepared statements, so repeated parameterized lookups are not parsed again
+- Write connections run in WAL mode with bulk-load pragmas, so readers are not blocked while the cleaner writes;
+  finish_writes checkpoints the log back into the database file, which stays complete on its own
+- Indexes the lookup keys: (fullName, year) for per-player lookups and upserts, (year, salary) for season filters.
+  The modeling tables' salary > 0 filter keeps about half the rows, so it stays a table scan
+- Does not import pandas
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+
+# Same path as clean_data.DB_PATH (importing clean_data would pull in pandas)
+DB_PATH = 'data/processed/baseball_stats.db'
+READ_PRAGMAS = (
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA cache_size = -16384',
+)
+WRITE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -65536',
+)
+PLAYER_ROWS_SQL = 'SELECT * FROM "{table}" WHERE fullName = ? AND salary > 0 ORDER BY rowid'
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+# ----------------------
+# Connections
+# ----------------------
+def _file_id(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+def read_connection(db_path=DB_PATH):
+    """
+    This thread's connection to `db_path`, opened on first use. It is reopened if the file was replaced
+    (e.g. by a full rebuild), so it never reads a deleted database.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    key = os.path.abspath(db_path)
+    file_id = _file_id(db_path)
+    cached = connections.get(key)
+    if cached is not None and cached[1] == file_id and file_id is not None:
+        return cached[0]
+    if cached is not None:
+        cached[0].close()
+    conn = sqlite3.connect(db_path)
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+    connections[key] = (conn, _file_id(db_path))
+    return conn
+
+def close_connections(db_path=None):
+    """
+    Closes this thread's read connections (to `db_path` only, if given).
+    """
+    connections = getattr(_local, 'connections', {})
+    for key in list(connections):
+        if db_path is None or key == os.path.abspath(db_path):
+            connections.pop(key)[0].close()
+
+def write_connection(db_path=DB_PATH):
+    """
+    New connection for bulk writes: WAL journal, NORMAL sync (safe in WAL mode), temp tables in memory and a
+    64 MB page cache. Python's sqlite3 opens one transaction at the first write, which lasts until commit.
+    """
+    conn = sqlite3.connect(db_path)
+    for pragma in WRITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def finish_writes(conn, analyze=True):
+    """
+    Commits, refreshes the query planner statistics (unless `analyze` is False) and checkpoints the WAL into the
+    database file, then closes the connection. The file's mtime and content then reflect the new data (the data
+    layer and the pipeline fingerprint the file itself).
+    """
+    conn.commit()
+    if analyze:
+        conn.execute('ANALYZE')
+        conn.commit()
+    busy, _, _ = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+    if busy:
+        logger.warning("WAL checkpoint incomplete: another connection is reading the database")
+    conn.close()
+
+def remove_database(db_path=DB_PATH):
+    """
+    Deletes the database file and its WAL/shared-memory files, closing this thread's reads of it first.
+    """
+    close_connections(db_path)
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# ----------------------
+# Schema and Queries
+# ----------------------
+def create_indexes(conn, table):
+    """
+    Unique (fullName, year) key for upserts and per-player lookups, plus a (year, salary) index for season
+    filters (it replaces the older year-only index).
+    """
+    conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "idx_{table}_player_season" ON "{table}" (fullName, year)')
+    conn.execute(f'DROP INDEX IF EXISTS "idx_{table}_season"')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_season_salary" ON "{table}" (year, salary)')
+
+def player_rows(table, player_name, db_path=DB_PATH):
+    """
+    Cursor over a player's rows with salary > 0, in table order (an index seek on fullName).
+    """
+    return read_connection(db_path).execute(PLAYER_ROWS_SQL.format(table=table), (player_name,))
+
+def query_plan(sql, params=(), db_path=DB_PATH):
+    """
+    SQLite's plan for a query, one detail string per step (e.g. 'SEARCH batters USING INDEX ...').
+    """
+    return [row[-1] for row in read_connection(db_path).execute(f'EXPLAIN QUERY PLAN {sql}', params)]
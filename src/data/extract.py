@@ -0,0 +1,212 @@
+"""
+Targeted extraction of player stats from Baseball-Reference pages.
+- Locates the #meta, #div_players_standard_pitching and #div_players_standard_batting fragments by string search
+- Skips occurrences inside HTML comments, the same way a full parse would
+- Only runs BeautifulSoup on the small fragments (the meta block and the season rows) instead of the whole page
+- Extracts every season row of both tables in the same pass
+- Output matches the baseline full-page BeautifulSoup parse (checked by tests/test_extract.py)
+"""
+
+import re
+from bs4 import BeautifulSoup
+
+STATS_SEASON = '2024'
+# Bump when the extracted fields change so cached parse results are discarded
+EXTRACT_VERSION = 3
+
+# Record keys in page order: name and season, then each data-stat cell of the row, then salary
+BATTING_COLUMNS = [
+    'fullName', 'year', 'age', 'team_name_abbr', 'comp_name_abbr', 'b_war', 'b_games', 'b_pa', 'b_ab', 'b_r',
+    'b_h', 'b_doubles', 'b_triples', 'b_hr', 'b_rbi', 'b_sb', 'b_cs', 'b_bb', 'b_so', 'b_batting_avg',
+    'b_onbase_perc', 'b_slugging_perc', 'b_onbase_plus_slugging', 'b_onbase_plus_slugging_plus', 'b_roba',
+    'b_rbat_plus', 'b_tb', 'b_gidp', 'b_hbp', 'b_sh', 'b_sf', 'b_ibb', 'pos', 'awards', 'salary'
+]
+PITCHING_COLUMNS = [
+    'fullName', 'year', 'age', 'team_name_abbr', 'comp_name_abbr', 'p_war', 'p_w', 'p_l', 'p_win_loss_perc',
+    'p_earned_run_avg', 'p_g', 'p_gs', 'p_gf', 'p_cg', 'p_sho', 'p_sv', 'p_ip', 'p_h', 'p_r', 'p_er', 'p_hr',
+    'p_bb', 'p_ibb', 'p_so', 'p_hbp', 'p_bk', 'p_wp', 'p_bfp', 'p_earned_run_avg_plus', 'p_fip', 'p_whip',
+    'p_hits_per_nine', 'p_hr_per_nine', 'p_bb_per_nine', 'p_so_per_nine', 'p_strikeouts_per_base_on_balls',
+    'awards', 'salary'
+]
+
+_TAG_RES = {}
+
+# ----------------------
+# Fragment Location
+# ----------------------
+def _in_comment(html, pos, start=0):
+    open_pos = html.rfind('<!--', start, pos)
+    return open_pos != -1 and html.find('-->', open_pos + 4, pos) == -1
+
+def _find_attr(html, element_id, start=0, end=None):
+    """
+    Position of the first `id="element_id"` attribute that is not inside an HTML comment, or -1.
+    """
+    needle = f'id="{element_id}"'
+    end = len(html) if end is None else end
+    pos = html.find(needle, start, end)
+    while pos != -1 and _in_comment(html, pos, start):
+        close = html.find('-->', pos, end)
+        if close == -1:
+            return -1
+        pos = html.find(needle, close + 3, end)
+    return pos
+
+def find_element(html, element_id, tag='div', start=0, end=None):
+    """
+    Returns the outer HTML of the first `tag` element with the given id, found without building a tree.
+    Nested elements of the same tag are balanced, and commented-out markup is skipped.
+
+    Args:
+        html (str): Page (or fragment) to search.
+        element_id (str): Value of the element's id attribute.
+        tag (str): Tag name of the element.
+        start (int), end (int or None): Slice of `html` to search in.
+    Returns:
+        str or None: The element's markup, or None if it is not present.
+    """
+    attr_pos = _find_attr(html, element_id, start, end)
+    if attr_pos == -1:
+        return None
+    open_pos = html.rfind('<', start, attr_pos)
+    if open_pos == -1 or not html.startswith(tag, open_pos + 1):
+        return None
+    tag_re = _TAG_RES.get(tag)
+    if tag_re is None:
+        tag_re = _TAG_RES[tag] = re.compile(rf'<!--|<{tag}\b|</{tag}\s*>', re.I)
+    depth = 0
+    pos = open_pos
+    end = len(html) if end is None else end
+    while True:
+        match = tag_re.search(html, pos, end)
+        if match is None:
+            return html[open_pos:end]
+        token = match.group(0)
+        if token == '<!--':
+            close = html.find('-->', match.end(), end)
+            if close == -1:
+                return html[open_pos:end]
+            pos = close + 3
+            continue
+        depth += -1 if token.startswith('</') else 1
+        pos = match.end()
+        if depth == 0:
+            return html[open_pos:pos]
+
+# ----------------------
+# Fragment Parsing
+# ----------------------
+def _parse_amount(amount):
+    if amount.endswith('M'):
+        return float(amount[:-1]) * 1_000_000
+    elif amount.endswith('k'):
+        return float(amount[:-1]) * 1_000
+    elif amount.endswith('B'):
+        return float(amount[:-1]) * 1_000_000_000
+    return float(amount)
+
+def parse_salary(meta):
+    """
+    Annual salary from the 'Contract Status' line of the #meta block.
+    A contract like '5 yrs/$300M' is averaged per year; otherwise the first '$20.5M'-style amount is used.
+
+    Args:
+        meta (bs4.element.Tag or None): The parsed #meta element.
+    Returns:
+        float: Annual salary, or 0 if none was found.
+    """
+    salary = 0
+    if meta:
+        for p in meta.find_all("p"):
+            if "Contract Status" in p.text:
+                contract_text = p.text
+                # Look for contract pattern like '5 yr/$300M', '5 yrs/$300M', or just '$20.5M'
+                contract_match = re.search(r'(\d+) yr[s]?/\$(\d+\.?\d*[MBk]?)', contract_text)
+                if contract_match:
+                    years = int(contract_match.group(1))
+                    salary = _parse_amount(contract_match.group(2)) / years
+                else:
+                    # Fallback: Look for salary pattern like $20.5M or $15.2M
+                    salary_match = re.search(r'\$(\d+\.?\d*[MBk]?)', contract_text)
+                    salary = _parse_amount(salary_match.group(1)) if salary_match else 0
+    return salary
+
+def parse_stats_row(row, player_name, salary):
+    """
+    Converts a season <tr> into a stats dict keyed by each cell's data-stat.
+    """
+    stats_dict = {}
+    stats_dict['fullName'] = player_name
+    year_th = row.find("th", {"data-stat": "year_id"})
+    if year_th:
+        year = year_th.text.strip()
+    else:
+        year = None
+    stats_dict["year"] = year
+    for cell in row.find_all("td"):
+        stat_name = cell.get("data-stat")
+        stat_value = cell.text.strip()
+        stats_dict[stat_name] = stat_value
+    stats_dict['salary'] = salary
+    return stats_dict
+
+# ----------------------
+# Page Extraction
+# ----------------------
+def _season_rows(html, table):
+    """
+    Finds every season row of a standard stats table in one pass over the table's fragment.
+    Traded players have a season total row followed by per-team 'partial_table' rows sharing its id;
+    only the first (total) row of each season is kept.
+
+    Returns:
+        tuple: (dict of season -> row Tag in page order, table_found bool)
+    """
+    div_html = find_element(html, f"div_players_standard_{table}")
+    if div_html is None:
+        return {}, False
+    fragments = {}
+    for match in re.finditer(rf'id="players_standard_{table}\.(\d{{4}})"', div_html):
+        season = match.group(1)
+        if season in fragments or _in_comment(div_html, match.start()):
+            continue
+        open_pos = div_html.rfind('<tr', 0, match.start())
+        close_pos = div_html.find('</tr>', match.end())
+        fragments[season] = div_html[open_pos:] if close_pos == -1 else div_html[open_pos:close_pos + len('</tr>')]
+    # One BeautifulSoup call for all of the table's season rows
+    parsed = BeautifulSoup(''.join(fragments.values()), "html.parser").find_all("tr", recursive=False)
+    return dict(zip(fragments, parsed)), True
+
+def extract_player_stats(html, player_name, season=STATS_SEASON):
+    """
+    Extracts salary plus every season row of the pitching and batting tables from a player page.
+
+    Args:
+        html (str): Page HTML.
+        player_name (str): Name stored in the 'fullName' field.
+        season (str): Season whose rows are also returned as 'pitching'/'batting' (the modeling snapshot).
+    Returns:
+        dict: {'salary': float, 'pitching': dict or None, 'batting': dict or None,
+               'pitching_seasons': list of dict, 'batting_seasons': list of dict, 'messages': list of str}
+    """
+    meta_html = find_element(html, "meta")
+    meta = BeautifulSoup(meta_html, "html.parser").div if meta_html else None
+    salary = parse_salary(meta)
+
+    result = {'salary': salary, 'pitching': None, 'batting': None,
+              'pitching_seasons': [], 'batting_seasons': [], 'messages': []}
+    for table in ('pitching', 'batting'):
+        rows, table_found = _season_rows(html, table)
+        for year, row in rows.items():
+            if not row:
+                continue
+            stats_dict = parse_stats_row(row, player_name, salary)
+            result[f'{table}_seasons'].append(stats_dict)
+            if year == season:
+                result[table] = stats_dict
+        if result[table] is None:
+            if table_found:
+                result['messages'].append(f"{season} {table} row not found.")
+            else:
+                result['messages'].append(f"{table.title()} table not found.")
+    return result
@@ -1,42 +1,228 @@
+import argparse
+import logging
+import os
+import sys
+
 import requests
-import time
 
-def load_data():
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.fetcher import ConcurrentFetcher, DEFAULT_RATE, DEFAULT_WORKERS
+from src.data.manifest import (FetchManifest, content_hash, STATUS_ERROR, STATUS_NOT_FOUND)
+from src.data.resolver import PlayerResolver, player_url
+from src.instrumentation import configure_logging, count, span
+
+RAW_DIR = 'data/raw'
+
+logger = logging.getLogger(__name__)
+
+def raw_path(player):
+    return f'{RAW_DIR}/{player}.html'
+
+class RawPages:
+    """
+    Where fetched pages go: one HTML file per player in data/raw. The streaming gather (see stream.py) substitutes
+    a destination that also queues each page for parsing.
+    """
+    def has_page(self, player):
+        """
+        True if a copy of the player's page is kept, so conditional requests and unchanged pages can rely on it.
+        """
+        return os.path.exists(raw_path(player))
+
+    def save(self, player, text):
+        with open(raw_path(player), 'w+', encoding='utf-8') as f:
+            f.write(text)
+
+def get_active_people():
     #MLB.com offers the easiest method for obtaining all the active players in the 2025 season.
     url = "https://statsapi.mlb.com/api/v1/sports/1/players?fields=people,fullName,lastName,nameSlug&season=2025"
 
     response = requests.get(url)
     response_json = response.json()
-    
+    return response_json['people']
+
+def get_active_players():
     #From this json, we need to extract the players' names and add it to a list of active players
     active_players = []
-    for player in response_json['people']:
+    for player in get_active_people():
         active_players.append(player['fullName'])
-    
+    return active_players
+
+def is_not_found(response):
+    return response.status_code == 404 or "Page Not Found (404 error)" in response.text
+
+def save_response(manifest, player, url, response, error, incremental=True, pages=None):
+    """
+    Writes a fetched page to data/raw (unless unchanged) and records the outcome in the fetch manifest.
+    `pages` replaces the data/raw destination (see RawPages).
+
+    Returns:
+        str: 'downloaded', 'unchanged' or 'failed'.
+    """
+    if error is not None:
+        manifest.record_failure(player, url, STATUS_ERROR, error)
+        return 'failed'
+    if response.status_code == 304:
+        manifest.record_not_modified(player)
+        return 'unchanged'
+    if is_not_found(response):
+        manifest.record_failure(player, url, STATUS_NOT_FOUND, "Page Not Found (404 error)")
+        return 'failed'
+    if response.status_code != 200:
+        manifest.record_failure(player, url, STATUS_ERROR, f"HTTP {response.status_code}")
+        return 'failed'
+
+    pages = pages or RawPages()
+    page_hash = content_hash(response.text)
+    entry = manifest.get(player)
+    # Servers that ignore the validators still get caught by comparing content hashes
+    if incremental and entry is not None and entry['content_hash'] == page_hash and pages.has_page(player):
+        manifest.record_success(player, url, response, page_hash)
+        return 'unchanged'
+    pages.save(player, response.text)
+    manifest.record_success(player, url, response, page_hash)
+    return 'downloaded'
+
+def discover_players(fetcher, resolver, manifest, players, pages=None):
+    """
+    Finds the Baseball-Reference page of players without a confirmed ID by trying their candidate IDs in order.
+    Each round requests the best remaining candidate for every pending player. Pages that 404 or belong to a
+    different player reject that ID, and the player moves on to the next candidate in the following round.
+
+    Returns:
+        tuple: (downloaded, error_players)
+    """
+    downloaded = []
+    error_players = []
+    pending = list(players)
+    while pending:
+        items = []
+        for player in pending:
+            candidates = resolver.candidates(player)
+            if candidates:
+                items.append((player, player_url(candidates[0])))
+            else:
+                manifest.record_failure(player, None, STATUS_NOT_FOUND, "No Baseball-Reference ID candidates left")
+                error_players.append(player)
+        if not items:
+            break
+        urls = dict(items)
+        pending = []
+        for player, response, error in fetcher.fetch_many(items):
+            player_id = urls[player].rsplit('/', 1)[-1][:-len('.shtml')]
+            verdict = None
+            if error is None and response.status_code == 200 and not is_not_found(response):
+                verdict = resolver.verify_page(player, response.text)
+            if verdict:
+                resolver.confirm(player, player_id)
+                save_response(manifest, player, urls[player], response, error, incremental=False, pages=pages)
+                downloaded.append(player)
+                count('pages_downloaded')
+                logger.debug(f"{player} resolved to {player_id}, html file downloaded.")
+            elif verdict is False or (error is None and is_not_found(response)):
+                resolver.reject(player, player_id)
+                pending.append(player)
+            else:
+                # Transient failure (network error, challenge page): keep the candidate for the next run
+                if error is None:
+                    error = f"HTTP {response.status_code}" if response.status_code != 200 else "Page has no player header"
+                manifest.record_failure(player, urls[player], STATUS_ERROR, error)
+                error_players.append(player)
+        logger.info(fetcher.stats.summary())
+    return downloaded, error_players
+
+def load_data(max_workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, incremental=True, retry_failed=False, pages=None):
+    """
+    Downloads every active player's Baseball-Reference page to data/raw.
+
+    Pages are fetched concurrently over pooled keep-alive connections. A shared per-host token bucket
+    keeps the request rate at or below `rate`, so more workers only overlap network latency.
+    Every fetch is recorded in the fetch manifest (data/fetch_manifest.db). In incremental mode pages already
+    on disk are requested conditionally (If-None-Match/If-Modified-Since) and are left untouched when unchanged.
+    Player URLs come from the resolver index (data/player_index.json): players with a confirmed ID are fetched
+    directly, and only unresolved players spend requests on candidate IDs.
+
+    Args:
+        max_workers (int): Number of requests allowed in flight at once.
+        rate (float): Requests per second allowed against Baseball-Reference.
+        incremental (bool): Send conditional requests and skip unchanged pages. False re-downloads everything.
+        retry_failed (bool): Only retry players whose last fetch failed and whose backoff has expired.
+        pages (RawPages or None): Destination of downloaded pages; None writes them to data/raw.
+    Returns:
+        list: Names of players whose page could not be downloaded.
+    """
+    manifest = FetchManifest()
+    resolver = PlayerResolver()
+    pages = pages or RawPages()
+    if retry_failed:
+        active_players = manifest.failed_players()
+        logger.info(f"Retrying {len(active_players)} previously failed players.")
+    else:
+        with span('fetch_player_list'):
+            people = get_active_people()
+            resolver.build(people)
+        active_players = [person['fullName'] for person in people]
+    seeded = resolver.seed_from_raw()
+    if seeded:
+        logger.info(f"Confirmed {seeded} player IDs from pages already in data/raw.")
+
     #Baseball-Reference contains a wealth of stats on each player's home page. For now, we will request the entire HTML of each player's page.
-    #Baseball-Reference urls follow a particular pattern. In general for each player, I need to parse the first two letters of their first name and first five of their last name.
-    #We will loop over the active_players list with that in mind, add error players to a list for additional processing.
+    #Players with a confirmed ID are fetched directly; the rest go through candidate discovery.
+    items = []
+    unresolved = []
     for player in active_players:
-        first_name = player.split(" ")[0]
-        last_name = player.split(" ")[1]
-        first_name_parsed = first_name[0:2].lower()
-        last_name_parsed = last_name[0:5].lower()
-    
-        time.sleep(2.1) #<---- Slows down the web call to prevent rate limiting. 
-        url = f"https://www.baseball-reference.com/players/{last_name_parsed[0]}/{last_name_parsed}{first_name_parsed}01.shtml"
-        response = requests.get(url)
-        if "Page Not Found (404 error)" not in response.text:
-            with open(f'data/raw/{player}.html', 'w+', encoding='utf-8') as f:
-                f.write(response.text)
-                f.close()
-    
-            print(f"{player} html file downloaded.")
-        else:
-            print(f"{player} html file failed to download. Added to error players.")
-            
+        url = resolver.resolve(player)
+        if url is None:
+            unresolved.append(player)
+            continue
+        headers = None
+        if incremental and pages.has_page(player):
+            headers = manifest.conditional_headers(player)
+        items.append((player, url, headers))
+    urls = {player: url for player, url, _ in items}
+
+    error_players = []
+    unchanged = 0
+    fetcher = ConcurrentFetcher(max_workers=max_workers, rate=rate)
+    with span('fetch', pages=len(items)):
+        for done, (player, response, error) in enumerate(fetcher.fetch_many(items), start=1):
+            outcome = save_response(manifest, player, urls[player], response, error, incremental, pages)
+            count(f'pages_{outcome}')
+            if outcome == 'unchanged':
+                unchanged += 1
+            elif outcome == 'downloaded':
+                logger.debug(f"{player} html file downloaded.")
+            else:
+                error_players.append(player)
+                logger.warning(f"{player} html file failed to download. Added to error players.")
+            if done % 50 == 0:
+                manifest.commit()
+    logger.info(fetcher.stats.summary())
+
+    if unresolved:
+        logger.info(f"Resolving Baseball-Reference IDs for {len(unresolved)} players.")
+        with span('discover', players=len(unresolved)):
+            _, discovery_errors = discover_players(fetcher, resolver, manifest, unresolved, pages)
+        for player in discovery_errors:
+            logger.warning(f"{player} html file failed to download. Added to error players.")
+        count('pages_failed', len(discovery_errors))
+        error_players += discovery_errors
+    resolver.save()
+    manifest.close()
+    fetcher.close()
+    logger.info(f"{unchanged} pages unchanged since last fetch, {len(error_players)} failed (recorded in {manifest.path}).")
+    return error_players
 
 if __name__ == "__main__":
-    load_data()
-    print("All active players' html files downloaded.")
-    print("Please check the data/raw folder for the files.")
-    print("If any files failed to download, please check the console output for the list of error players.")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Download active players' Baseball-Reference pages.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Number of concurrent requests')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Max requests per second per host')
+    parser.add_argument('--full', action='store_true', help='Re-download every page instead of skipping unchanged ones')
+    parser.add_argument('--retry-failed', action='store_true', help='Only retry players whose last fetch failed')
+    parser.add_argument('--log-level', default=None, help='DEBUG, INFO (default), WARNING or ERROR')
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+    load_data(max_workers=args.workers, rate=args.rate, incremental=not args.full, retry_failed=args.retry_failed)
+    logger.info("All active players' html files downloaded.")
+    logger.info("Please check the data/raw folder for the files.")
+    logger.info("If any files failed to download, please check the console output for the list of error players.")
@@ -0,0 +1,132 @@
+"""
+Persistent fetch manifest for incremental scraping.
+- Stores URL, ETag/Last-Modified, content hash, fetch time and status for each player page
+- Builds conditional request headers so unchanged pages come back as 304 Not Modified
+- Records failed fetches with exponential backoff so they can be retried on their own
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+MANIFEST_PATH = 'data/fetch_manifest.db'
+
+STATUS_OK = 'ok'
+STATUS_NOT_MODIFIED = 'not_modified'
+STATUS_NOT_FOUND = 'not_found'
+STATUS_ERROR = 'error'
+FAILED_STATUSES = (STATUS_NOT_FOUND, STATUS_ERROR)
+
+BACKOFF_BASE = 60 * 60          # First retry allowed after an hour
+BACKOFF_MAX = 7 * 24 * 60 * 60  # Never wait more than a week between retries
+
+
+def content_hash(text):
+    """
+    Returns the SHA-256 hex digest of a page's text.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FetchManifest:
+    """
+    SQLite-backed record of the last fetch of every player page.
+
+    Args:
+        path (str): Location of the manifest database (created if missing).
+    """
+    def __init__(self, path=MANIFEST_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS fetches (
+                player TEXT PRIMARY KEY,
+                url TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                fetched_at REAL,
+                status TEXT,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                next_retry_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, player):
+        return self.conn.execute("SELECT * FROM fetches WHERE player = ?", (player,)).fetchone()
+
+    def conditional_headers(self, player):
+        """
+        Returns If-None-Match / If-Modified-Since headers for a previously fetched page, or None.
+        """
+        entry = self.get(player)
+        if entry is None or entry['content_hash'] is None:
+            return None
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers or None
+
+    def record_success(self, player, url, response, page_hash):
+        """
+        Records a 200 response along with its validators and the hash of the saved page.
+        """
+        self.conn.execute("""
+            INSERT INTO fetches (player, url, etag, last_modified, content_hash, fetched_at, status, attempts, last_error, next_retry_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0, NULL, NULL)
+            ON CONFLICT(player) DO UPDATE SET
+                url = excluded.url, etag = excluded.etag, last_modified = excluded.last_modified,
+                content_hash = excluded.content_hash, fetched_at = excluded.fetched_at, status = excluded.status,
+                attempts = 0, last_error = NULL, next_retry_at = NULL
+        """, (player, url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+              page_hash, time.time(), STATUS_OK))
+
+    def record_not_modified(self, player):
+        """
+        Records that a conditional request (or a hash comparison) found the page unchanged.
+        """
+        self.conn.execute("""
+            UPDATE fetches SET fetched_at = ?, status = ?, attempts = 0, last_error = NULL, next_retry_at = NULL
+            WHERE player = ?
+        """, (time.time(), STATUS_NOT_MODIFIED, player))
+
+    def record_failure(self, player, url, status, error):
+        """
+        Records a failed fetch and schedules the next retry with exponential backoff.
+        """
+        entry = self.get(player)
+        attempts = (entry['attempts'] or 0) + 1 if entry is not None else 1
+        now = time.time()
+        next_retry_at = now + min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+        self.conn.execute("""
+            INSERT INTO fetches (player, url, fetched_at, status, attempts, last_error, next_retry_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(player) DO UPDATE SET
+                url = excluded.url, fetched_at = excluded.fetched_at, status = excluded.status,
+                attempts = excluded.attempts, last_error = excluded.last_error, next_retry_at = excluded.next_retry_at
+        """, (player, url, now, status, attempts, str(error), next_retry_at))
+
+    def failed_players(self, due_only=True):
+        """
+        Returns players whose last fetch failed, optionally only those whose backoff has expired.
+        """
+        query = f"SELECT player FROM fetches WHERE status IN ({','.join('?' * len(FAILED_STATUSES))})"
+        params = list(FAILED_STATUSES)
+        if due_only:
+            query += " AND next_retry_at <= ?"
+            params.append(time.time())
+        return [row['player'] for row in self.conn.execute(query, params)]
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,55 @@
+"""
+Columnar record builder for the cleaning stage.
+- Collects parsed stat dicts column by column instead of concatenating one-row DataFrames
+- Keeps columns in first-appearance order and fills missing values with NaN, the same result pd.concat gives
+- Builds each DataFrame once at the end, so cost grows linearly with the number of players
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class RecordBuilder:
+    """
+    Accumulates dict records into per-column lists.
+
+    Args:
+        columns (list or None): Known column order (e.g. the data-stat schema). Known columns that never
+            receive a value are left out of the built DataFrame, and unknown columns are appended as they appear.
+    """
+    def __init__(self, columns=None):
+        self._columns = {}
+        self._seen = set()
+        self._rows = 0
+        for name in columns or []:
+            self._columns[name] = []
+
+    def __len__(self):
+        return self._rows
+
+    def append(self, record):
+        """
+        Adds one record. Columns missing from the record get NaN; new columns are back-filled with NaN.
+        """
+        for name in record:
+            if name not in self._columns:
+                self._columns[name] = [np.nan] * self._rows
+            self._seen.add(name)
+        for name, values in self._columns.items():
+            values.append(record.get(name, np.nan))
+        self._rows += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def to_frame(self):
+        """
+        Builds the DataFrame in one step.
+
+        Returns:
+            pd.DataFrame: One row per appended record (empty DataFrame if nothing was appended).
+        """
+        if self._rows == 0:
+            return pd.DataFrame()
+        return pd.DataFrame({name: values for name, values in self._columns.items() if name in self._seen})
@@ -0,0 +1,193 @@
+"""
+Resolves active players' names to Baseball-Reference player IDs.
+- Derives candidate IDs from the MLB stats API `nameSlug` (accents stripped, suffixes and multi-part surnames handled)
+- Orders candidates by disambiguation rules (suffixed players try 02 first, IDs claimed by another player are skipped)
+- Verifies fetched pages against the player's name and caches confirmed/rejected IDs in data/player_index.json
+- Can be seeded offline from pages already in data/raw
+"""
+
+import json
+import os
+import re
+import unicodedata
+
+INDEX_PATH = 'data/player_index.json'
+BASE_URL = "https://www.baseball-reference.com/players"
+SUFFIXES = ('jr', 'sr', 'ii', 'iii', 'iv', 'v')
+MAX_CANDIDATES = 3
+
+CANONICAL_RE = re.compile(r'<link rel="canonical" href="[^"]*/players/\w/(\w+)\.shtml"')
+HEADER_NAME_RE = re.compile(r'<h1>\s*<span>(.*?)</span>', re.S)
+
+# ----------------------
+# Name Normalization
+# ----------------------
+def repair_mojibake(text):
+    """
+    Undoes UTF-8 text that was decoded as Latin-1 (e.g. 'JosÃ©' -> 'José'). Returns text unchanged otherwise.
+    """
+    try:
+        return text.encode('latin-1').decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return text
+
+def name_tokens(name):
+    """
+    Lowercase ASCII tokens of a name with accents and punctuation removed.
+    'José Ramírez' -> ['jose', 'ramirez'], 'J.D. Martinez' -> ['jd', 'martinez'], 'Smith-Shawver' -> ['smith', 'shawver']
+    """
+    name = unicodedata.normalize('NFKD', repair_mojibake(name)).encode('ascii', 'ignore').decode('ascii')
+    name = re.sub(r"[.']", '', name.lower())
+    return [token for token in re.split(r'[^a-z0-9]+', name) if token]
+
+def split_suffix(tokens):
+    """
+    Splits a trailing generational suffix ('jr', 'iii', ...) off a token list.
+
+    Returns:
+        tuple: (tokens without suffix, suffix or None)
+    """
+    if len(tokens) > 1 and tokens[-1] in SUFFIXES:
+        return tokens[:-1], tokens[-1]
+    return tokens, None
+
+def id_stem(first_tokens, last_tokens):
+    """
+    Baseball-Reference IDs are the first five letters of the last name plus the first two of the first name.
+    """
+    return ''.join(last_tokens)[:5] + ''.join(first_tokens)[:2]
+
+def player_url(player_id):
+    return f"{BASE_URL}/{player_id[0]}/{player_id}.shtml"
+
+def verify_page(name, html):
+    """
+    Checks that a player page belongs to `name` by comparing the normalized header name with it.
+
+    Returns:
+        bool or None: True/False, or None if the page has no player header (e.g. a challenge page).
+    """
+    match = HEADER_NAME_RE.search(html)
+    if match is None:
+        return None
+    return name_tokens(match.group(1)) == name_tokens(name)
+
+# ----------------------
+# Resolver
+# ----------------------
+class PlayerResolver:
+    """
+    Cached name -> Baseball-Reference ID index.
+
+    Each entry holds the MLB slug/ID, the candidate IDs still worth trying, any confirmed ID and the IDs that
+    were rejected (404 or a different player's page). Crawls should use resolved URLs when available and only
+    spend requests on candidates for players that are not resolved yet.
+
+    Args:
+        path (str): Location of the JSON index (loaded if it exists).
+    """
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def build(self, people):
+        """
+        Adds/refreshes entries from the MLB stats API `people` payload, keeping confirmed and rejected IDs.
+
+        Args:
+            people (list): Dicts with 'fullName', 'lastName' and 'nameSlug' keys.
+        """
+        for person in people:
+            entry = self.entries.setdefault(person['fullName'], {'player_id': None, 'rejected': []})
+            slug_tokens = name_tokens(person.get('nameSlug') or person['fullName'])
+            mlb_id = slug_tokens.pop() if slug_tokens and slug_tokens[-1].isdigit() else None
+            slug_tokens, suffix = split_suffix(slug_tokens)
+            last_tokens, _ = split_suffix(name_tokens(person.get('lastName') or slug_tokens[-1]))
+            if slug_tokens[-len(last_tokens):] == last_tokens and len(slug_tokens) > len(last_tokens):
+                first_tokens = slug_tokens[:-len(last_tokens)]
+            else:
+                first_tokens, last_tokens = slug_tokens[:1], slug_tokens[1:] or slug_tokens[:1]
+            entry['mlb_id'] = mlb_id
+            entry['stem'] = id_stem(first_tokens, last_tokens)
+            entry['suffix'] = suffix
+
+    def seed_from_raw(self, raw_dir='data/raw'):
+        """
+        Confirms or rejects IDs from pages already downloaded, using each page's canonical link and header name.
+
+        Returns:
+            int: Number of players newly confirmed.
+        """
+        confirmed = 0
+        if not os.path.exists(raw_dir):
+            return confirmed
+        for filename in os.listdir(raw_dir):
+            if not filename.endswith('.html'):
+                continue
+            name = filename[:-len('.html')]
+            entry = self.entries.setdefault(name, {'player_id': None, 'rejected': []})
+            if entry['player_id'] is not None:
+                continue
+            with open(os.path.join(raw_dir, filename), 'r', encoding='utf-8') as f:
+                html = f.read()
+            canonical = CANONICAL_RE.search(html)
+            verdict = self.verify_page(name, html)
+            if canonical is None or verdict is None:
+                continue
+            if verdict:
+                self.confirm(name, canonical.group(1))
+                confirmed += 1
+            else:
+                self.reject(name, canonical.group(1))
+        return confirmed
+
+    def resolve(self, name):
+        """
+        Returns the confirmed URL for a player, or None if the player has not been resolved yet.
+        """
+        entry = self.entries.get(name)
+        if entry is None or entry['player_id'] is None:
+            return None
+        return player_url(entry['player_id'])
+
+    def candidates(self, name):
+        """
+        Candidate IDs for an unresolved player, best first. Players with a generational suffix usually share
+        a stem with a parent who already owns 01, so 02 is tried first. IDs rejected for this player or
+        confirmed for another player are skipped.
+        """
+        entry = self.entries.get(name)
+        if entry is None or entry['player_id'] is not None or not entry.get('stem'):
+            return []
+        numbers = list(range(1, MAX_CANDIDATES + 1))
+        if entry.get('suffix'):
+            numbers.remove(2)
+            numbers.insert(0, 2)
+        claimed = {e['player_id'] for e in self.entries.values() if e['player_id']}
+        ids = [f"{entry['stem']}{n:02d}" for n in numbers]
+        return [i for i in ids if i not in claimed and i not in entry['rejected']]
+
+    def verify_page(self, name, html):
+        """
+        Checks that a fetched page belongs to `name` (see the module-level verify_page).
+        """
+        return verify_page(name, html)
+
+    def confirm(self, name, player_id):
+        self.entries.setdefault(name, {'player_id': None, 'rejected': []})['player_id'] = player_id
+
+    def reject(self, name, player_id):
+        entry = self.entries.setdefault(name, {'player_id': None, 'rejected': []})
+        if player_id not in entry['rejected']:
+            entry['rejected'].append(player_id)
+
+    def unresolved(self):
+        return [name for name, entry in self.entries.items() if entry['player_id'] is None]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True, ensure_ascii=False)
@@ -0,0 +1,155 @@
+"""
+Declarative dtype schema of the player tables.
+- One registry entry per column the parser emits (player name, season, the batting and pitching data-stat cells and
+  salary), giving the compact pandas dtype it is held in
+- Counting stats are small nullable integers, rate stats float32, team/league/position codes categoricals;
+  WAR and salary stay float64 because they are shown and divided as-is
+- apply_schema casts a whole table in one pass: parsed text in the cleaner, SQLite rows in the loaders. The SQLite
+  column types come from the same registry, and the snapshot stores the compact dtypes as they are
+- float32 is only used in memory; the database and CSV files keep the parsed float64 values
+- memory_report compares a table's memory before and after casting
+- The registry itself does not need pandas, so the single-player lookup can use it without importing pandas
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import numpy as np
+
+NAME = 'object'
+CODE = 'category'
+COUNT = 'Int16'
+RATE = 'float32'
+VALUE = 'float64'
+
+# Column -> in-memory dtype. Columns missing from the registry are left as they are.
+SCHEMA = {
+    'fullName': NAME,
+    'year': 'Int16',
+    'age': 'Int8',
+    'team_name_abbr': CODE,
+    'comp_name_abbr': CODE,
+    'pos': CODE,
+    'awards': NAME,
+    'salary': VALUE,
+    # Batting
+    'b_war': VALUE,
+    'b_games': COUNT, 'b_pa': COUNT, 'b_ab': COUNT, 'b_r': COUNT, 'b_h': COUNT, 'b_doubles': COUNT,
+    'b_triples': COUNT, 'b_hr': COUNT, 'b_rbi': COUNT, 'b_sb': COUNT, 'b_cs': COUNT, 'b_bb': COUNT, 'b_so': COUNT,
+    'b_tb': COUNT, 'b_gidp': COUNT, 'b_hbp': COUNT, 'b_sh': COUNT, 'b_sf': COUNT, 'b_ibb': COUNT,
+    'b_onbase_plus_slugging_plus': COUNT, 'b_rbat_plus': COUNT,
+    'b_batting_avg': RATE, 'b_onbase_perc': RATE, 'b_slugging_perc': RATE, 'b_onbase_plus_slugging': RATE,
+    'b_roba': RATE,
+    # Pitching
+    'p_war': VALUE,
+    'p_w': COUNT, 'p_l': COUNT, 'p_g': COUNT, 'p_gs': COUNT, 'p_gf': COUNT, 'p_cg': COUNT, 'p_sho': COUNT,
+    'p_sv': COUNT, 'p_h': COUNT, 'p_r': COUNT, 'p_er': COUNT, 'p_hr': COUNT, 'p_bb': COUNT, 'p_ibb': COUNT,
+    'p_so': COUNT, 'p_hbp': COUNT, 'p_bk': COUNT, 'p_wp': COUNT, 'p_bfp': COUNT, 'p_earned_run_avg_plus': COUNT,
+    'p_ip': RATE, 'p_win_loss_perc': RATE, 'p_earned_run_avg': RATE, 'p_fip': RATE, 'p_whip': RATE,
+    'p_hits_per_nine': RATE, 'p_hr_per_nine': RATE, 'p_bb_per_nine': RATE, 'p_so_per_nine': RATE,
+    'p_strikeouts_per_base_on_balls': RATE,
+}
+SQL_TYPES = {NAME: 'TEXT', CODE: 'TEXT', VALUE: 'REAL', RATE: 'REAL'}
+SALARY_UNITS = {'M': 1000000, 'k': 1000, 'B': 1000000000}
+
+logger = logging.getLogger(__name__)
+
+
+def sql_types(columns):
+    """
+    SQLite column type of each registered column (for DataFrame.to_sql / get_schema).
+    """
+    return {col: SQL_TYPES.get(SCHEMA[col], 'INTEGER') for col in columns if col in SCHEMA}
+
+def float32_columns(columns):
+    """
+    Positions of the columns held as float32, so rows read without pandas can be rounded the same way.
+    """
+    return [i for i, col in enumerate(columns) if SCHEMA.get(col) == RATE]
+
+
+# ----------------------
+# Casting
+# ----------------------
+def parse_salary(values):
+    """
+    Salary text such as '$1,250,000', '$35M' or '$750k' to dollars; anything else becomes NaN.
+    """
+    import pandas as pd
+    text = values.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip()
+    unit = text.str[-1]
+    scaled = unit.isin(list(SALARY_UNITS))
+    dollars = pd.to_numeric(text.where(~scaled, text.str[:-1]), errors='coerce')
+    return dollars * unit.map(SALARY_UNITS).where(scaled, 1)
+
+def _integer_dtype(values, dtype):
+    # Widen instead of wrapping around if a column ever exceeds its compact range
+    info = np.iinfo(dtype.lower())
+    present = values.dropna()
+    if len(present) and (present.min() < info.min or present.max() > info.max):
+        return 'Int32' if present.abs().max() < np.iinfo('int32').max else 'Int64'
+    return dtype
+
+def _cast(values, dtype, storage):
+    import pandas as pd
+    if dtype in (NAME, CODE):
+        values = values.astype(object).where(values.notna(), None)
+        return values.astype(dtype)
+    if values.dtype == object or pd.api.types.is_string_dtype(values):
+        if values.name == 'salary':
+            values = parse_salary(values)
+        else:
+            # Rates are written without a leading zero ('.312')
+            values = pd.to_numeric(values.astype(str).str.replace('^\\.', '0.', regex=True), errors='coerce')
+    if dtype.startswith('Int'):
+        values = pd.to_numeric(values, errors='coerce')
+        return values.astype(_integer_dtype(values, dtype))
+    return values.astype('float64' if storage else dtype)
+
+def apply_schema(df, storage=False):
+    """
+    Casts every registered column of a player table to its schema dtype.
+
+    Args:
+        df (pd.DataFrame): Parsed rows (text cells) or rows read back from SQLite.
+        storage (bool): Keep float32 columns as float64, for the frames written to SQLite and CSV.
+    Returns:
+        pd.DataFrame: New frame with the same columns and index.
+    """
+    import pandas as pd
+    return pd.DataFrame({col: _cast(df[col], SCHEMA[col], storage) if col in SCHEMA else df[col]
+                         for col in df.columns}, index=df.index)
+
+def memory_report(name, before, after):
+    """
+    Deep memory use of a table before and after casting.
+
+    Returns:
+        dict: {'table', 'rows', 'before_mb', 'after_mb', 'saved_pct'}
+    """
+    before_bytes = before.memory_usage(deep=True).sum()
+    after_bytes = after.memory_usage(deep=True).sum()
+    return {'table': name, 'rows': len(after), 'before_mb': round(before_bytes / 2 ** 20, 3),
+            'after_mb': round(after_bytes / 2 ** 20, 3),
+            'saved_pct': round(100 * (1 - after_bytes / before_bytes), 1) if before_bytes else 0.0}
+
+
+if __name__ == "__main__":
+    import sqlite3
+    import pandas as pd
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+    from src.data.clean_data import DB_PATH
+
+    parser = argparse.ArgumentParser(description="Memory of each player table read with and without the schema.")
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    conn = sqlite3.connect(args.db)
+    print(f"{'table':<18} {'rows':>8} {'untyped MB':>11} {'typed MB':>9} {'saved':>7}")
+    for table in ('batters', 'pitchers', 'batting_seasons', 'pitching_seasons'):
+        untyped = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+        report = memory_report(table, untyped, apply_schema(untyped))
+        print(f"{table:<18} {report['rows']:>8} {report['before_mb']:>11.3f} {report['after_mb']:>9.3f} "
+              f"{report['saved_pct']:>6.1f}%")
+    conn.close()
@@ -0,0 +1,149 @@
+"""
+Columnar binary snapshot of the processed player tables.
+- Stores each column of a loader's output as its own raw binary file, with dtypes exactly as the loader returns them
+  (categoricals as their codes, nullable integers as values plus a null mask)
+- Keeps dtypes and row count in a small JSON meta file, so columns are memory-mapped without parsing per-file headers
+- Reads only the columns of the requested projection
+- Records the SQLite database's fingerprint so a stale snapshot is detected and ignored
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = 'data/processed/snapshot'
+META_FILE = '_meta.json'
+INDEX_FILE = '_index.bin'
+
+
+def source_fingerprint(path):
+    """
+    Identifies a version of the source database by its modification time and size.
+    """
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+def _read_meta(name, source_path, snapshot_dir):
+    meta_path = os.path.join(snapshot_dir, name, META_FILE)
+    if not os.path.exists(meta_path) or not os.path.exists(source_path):
+        return None
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta['source'] != source_fingerprint(source_path):
+        return None
+    return meta
+
+def snapshot_is_current(name, source_path, snapshot_dir=SNAPSHOT_DIR):
+    """
+    True if the snapshot exists and was written from the current version of `source_path`.
+    """
+    return _read_meta(name, source_path, snapshot_dir) is not None
+
+
+def _column_file(directory, index, suffix=''):
+    return os.path.join(directory, f"{index:03d}{suffix}.bin")
+
+def _save(path, values):
+    np.ascontiguousarray(values).tofile(path)
+
+def _map(path, dtype, rows):
+    # np.memmap cannot map an empty file
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(rows,))
+
+
+def write_snapshot(name, df, source_path, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Writes `df` as one binary file per column. Numeric columns are stored as-is; text columns are stored as
+    fixed-width unicode plus a null mask so they can be memory-mapped too. Categorical columns store their codes
+    (categories go in the meta file) and nullable integer columns their values plus a null mask.
+
+    Args:
+        name (str): Snapshot name (e.g. 'batters').
+        df (pd.DataFrame): Frame to store, already in the dtypes consumers expect.
+        source_path (str): Database the frame was read from, fingerprinted for staleness checks.
+        snapshot_dir (str): Root directory for snapshots.
+    """
+    directory = os.path.join(snapshot_dir, name)
+    os.makedirs(directory, exist_ok=True)
+    meta_path = os.path.join(directory, META_FILE)
+    # The meta file is the commit marker: remove it first so a half-written snapshot is never read
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    for filename in os.listdir(directory):
+        os.remove(os.path.join(directory, filename))
+
+    columns = []
+    for index, column in enumerate(df.columns):
+        values = df[column]
+        spec = {'name': column}
+        if values.dtype == object:
+            mask = values.isna().to_numpy()
+            text = values.where(~mask, '').astype(str).to_numpy()
+            width = max((len(t) for t in text), default=1) or 1
+            data = text.astype(f"U{width}")
+            _save(_column_file(directory, index, '_mask'), mask)
+            spec['kind'] = 'text'
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            data = values.cat.codes.to_numpy()
+            spec['kind'] = 'category'
+            spec['categories'] = values.cat.categories.tolist()
+        elif isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+            mask = values.isna().to_numpy()
+            data = values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=0)
+            _save(_column_file(directory, index, '_mask'), mask)
+            spec['kind'] = 'nullable'
+        else:
+            data = values.to_numpy()
+            spec['kind'] = 'numeric'
+        _save(_column_file(directory, index), data)
+        spec['dtype'] = data.dtype.str
+        columns.append(spec)
+    index_values = df.index.to_numpy()
+    _save(os.path.join(directory, INDEX_FILE), index_values)
+
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'rows': len(df), 'columns': columns, 'index_dtype': index_values.dtype.str,
+                   'source': source_fingerprint(source_path)}, f)
+
+
+def read_snapshot(name, source_path, columns=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Reads a snapshot memory-mapped, loading only the requested columns.
+    Returns the frame with the index and dtypes it was written with.
+
+    Args:
+        name (str): Snapshot name.
+        source_path (str): Database the snapshot must match.
+        columns (list or None): Columns to load, in order. None loads every column.
+        snapshot_dir (str): Root directory for snapshots.
+    Returns:
+        pd.DataFrame or None: The frame, or None if the snapshot is missing or older than the database.
+    """
+    meta = _read_meta(name, source_path, snapshot_dir)
+    if meta is None:
+        return None
+
+    rows = meta['rows']
+    positions = {column['name']: (index, column) for index, column in enumerate(meta['columns'])}
+    wanted = [column['name'] for column in meta['columns']] if columns is None else list(columns)
+    directory = os.path.join(snapshot_dir, name)
+    data = {}
+    for column in wanted:
+        index, spec = positions[column]
+        values = _map(_column_file(directory, index), spec['dtype'], rows)
+        if spec['kind'] == 'text':
+            mask = _map(_column_file(directory, index, '_mask'), bool, rows)
+            values = values.astype(object)
+            values[mask] = None
+        elif spec['kind'] == 'category':
+            values = pd.Categorical.from_codes(np.array(values), spec['categories'])
+        elif spec['kind'] == 'nullable':
+            mask = _map(_column_file(directory, index, '_mask'), bool, rows)
+            values = pd.arrays.IntegerArray(np.array(values), np.array(mask))
+        data[column] = values
+    index = pd.Index(np.array(_map(os.path.join(directory, INDEX_FILE), meta['index_dtype'], rows)))
+    return pd.DataFrame(data, columns=wanted, index=index)
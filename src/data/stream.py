@@ -0,0 +1,246 @@
+"""
+Streaming gather -> clean: pages are parsed while the crawl is still running.
+- The crawl (load_data) runs on a producer thread and hands each downloaded page to a bounded queue; a full queue
+  blocks the crawl, so memory stays bounded by the queue size plus the pages being parsed
+- Parser processes consume the queue while the crawl waits on its rate limiter
+- Parsed records go to the parse cache in batches, one transaction per batch
+- When the crawl ends, get_dataframes assembles the tables from the cache with the streamed pages counted as
+  changed, so the database ends up as it would after load_data followed by get_dataframes
+- Writing the pages to data/raw is optional. Pages kept only in the parse cache are still part of the tables,
+  and a page that already has a file is always rewritten so data/raw never holds a stale copy
+
+Usage:
+    python src/data/stream.py [--no-raw] [--workers N] [--queue-size 32] [--batch-size 50] [--full-rebuild]
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.clean_data import (DB_PATH, PARSE_CACHE_PATH, PROGRESS_EVERY, file_hash, get_dataframes,
+                                 load_parse_cache, parse_player_page, write_parse_cache)
+from src.data.db import finish_writes, remove_database, write_connection
+from src.data.load_data import RAW_DIR, RawPages, load_data, raw_path
+from src.instrumentation import configure_logging, count, span
+
+QUEUE_SIZE = 32
+BATCH_SIZE = 50
+# How often blocked queue operations check whether the other side stopped
+POLL_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+class StreamAborted(Exception):
+    """
+    Raised in the crawl when the consumer stopped, so the producer does not block on a queue nobody reads.
+    """
+
+
+# ----------------------
+# Producer
+# ----------------------
+class StreamedPages(RawPages):
+    """
+    Destination of fetched pages that queues each page for parsing and optionally writes it to data/raw.
+
+    Args:
+        pages (queue.Queue): Bounded queue of (path, html) items; None marks the end of the crawl.
+        write_raw (bool): Also write new pages to data/raw.
+        cached (iterable): Paths with a record in the parse cache, which count as kept copies of their pages.
+    """
+    def __init__(self, pages, write_raw=True, cached=()):
+        self.pages = pages
+        self.write_raw = write_raw
+        self.cached = set(cached)
+        self.stopped = threading.Event()
+        self.peak = 0
+        if write_raw:
+            os.makedirs(RAW_DIR, exist_ok=True)
+
+    def has_page(self, player):
+        return super().has_page(player) or raw_path(player) in self.cached
+
+    def save(self, player, text):
+        path = raw_path(player)
+        if self.write_raw or os.path.exists(path):
+            super().save(player, text)
+        self._put((path, text))
+        self.peak = max(self.peak, self.pages.qsize())
+
+    def close(self):
+        self._put(None)
+
+    def _put(self, item):
+        while True:
+            if self.stopped.is_set():
+                raise StreamAborted("Page consumer stopped")
+            try:
+                self.pages.put(item, timeout=POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+def _produce(crawl, sink, outcome):
+    try:
+        outcome['error_players'] = crawl(pages=sink)
+    except StreamAborted:
+        return
+    except BaseException as e:
+        outcome['error'] = e
+    try:
+        sink.close()
+    except StreamAborted:
+        pass
+
+# ----------------------
+# Consumer
+# ----------------------
+def parse_page(path, text):
+    """
+    Parses one streamed page in a worker process.
+
+    Returns:
+        tuple: (record, content hash, size in bytes) for the parse cache.
+    """
+    data = text.encode('utf-8')
+    return parse_player_page(text, path), hashlib.sha256(data).hexdigest(), len(data)
+
+def _cache_row(path, record, digest, size):
+    # A page written to data/raw is cached under its file's stamp, so the next scan sees it as unchanged
+    if os.path.exists(path):
+        stat = os.stat(path)
+        return path, stat.st_mtime, stat.st_size, file_hash(path), record
+    return path, None, size, digest, record
+
+def _flush(conn, batch):
+    if batch:
+        with span('sql_write', table='parse_cache', rows=len(batch)):
+            write_parse_cache(conn, batch)
+            conn.commit()
+        count('records_written', len(batch))
+        batch.clear()
+
+def consume_pages(pages, conn, executor, max_in_flight, batch_size=BATCH_SIZE):
+    """
+    Parses queued pages on `executor` until the end marker, writing the records to the parse cache every
+    `batch_size` pages. At most `max_in_flight` pages are being parsed at once.
+
+    Returns:
+        list: Paths of the parsed pages, in arrival order.
+    """
+    parsed = []
+    pending = deque()
+    batch = []
+    finished = False
+    start = time.perf_counter()
+    while not finished or pending:
+        # Collect finished pages in arrival order; wait for the oldest one when too many are in flight
+        while pending and (finished or pending[0][1].done() or len(pending) >= max_in_flight):
+            path, future = pending.popleft()
+            record, digest, size = future.result()
+            batch.append(_cache_row(path, record, digest, size))
+            parsed.append(path)
+            if len(parsed) % PROGRESS_EVERY == 0:
+                elapsed = time.perf_counter() - start
+                logger.info(f"Parsed {len(parsed)} streamed pages ({len(parsed) / elapsed:.1f} pages/sec)")
+            if len(batch) >= batch_size:
+                _flush(conn, batch)
+        if finished:
+            continue
+        try:
+            item = pages.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            continue
+        if item is None:
+            finished = True
+            continue
+        path, text = item
+        pending.append((path, executor.submit(parse_page, path, text)))
+    _flush(conn, batch)
+    count('pages_streamed', len(parsed))
+    return parsed
+
+def _executor(workers):
+    if workers == 1:
+        # Parse in this process: the crawl thread mostly sleeps on its rate limiter
+        return ThreadPoolExecutor(max_workers=1)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    # Start the workers before the crawl thread exists, so no process is forked while it holds a lock
+    for future in [executor.submit(os.getpid) for _ in range(workers)]:
+        future.result()
+    return executor
+
+# ----------------------
+# Gather and Clean
+# ----------------------
+def gather_and_clean(workers=None, full_rebuild=False, write_raw=True, queue_size=QUEUE_SIZE,
+                     batch_size=BATCH_SIZE, crawl=load_data):
+    """
+    Crawls and cleans in one pass: pages are parsed as they arrive instead of after the whole crawl.
+
+    Args:
+        workers (int or None): Parser processes. None uses every core, 1 parses in this process.
+        full_rebuild (bool): Delete the database and the parse cache before crawling.
+        write_raw (bool): Also write the pages to data/raw.
+        queue_size (int): Pages that may wait for a parser before the crawl blocks.
+        batch_size (int): Parsed records per parse-cache transaction.
+        crawl (callable): Producer called as crawl(pages=destination); load_data by default.
+    Returns:
+        list: Names of players whose page could not be downloaded (as returned by the crawl).
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    if full_rebuild:
+        remove_database(DB_PATH)
+        remove_database(PARSE_CACHE_PATH)
+        logger.info(f"Deleted existing database: {DB_PATH}")
+    conn = write_connection(PARSE_CACHE_PATH)
+    sink = StreamedPages(queue.Queue(maxsize=queue_size), write_raw, load_parse_cache(conn))
+    outcome = {'error_players': [], 'error': None}
+    executor = _executor(workers)
+    producer = threading.Thread(target=_produce, args=(crawl, sink, outcome), name='crawl', daemon=True)
+    start = time.perf_counter()
+    try:
+        with span('stream', workers=workers):
+            producer.start()
+            parsed = consume_pages(sink.pages, conn, executor, max_in_flight=2 * workers, batch_size=batch_size)
+            producer.join()
+    except BaseException:
+        # The crawl raises StreamAborted at its next page (within POLL_SECONDS of a blocked put) and stops fetching
+        sink.stopped.set()
+        if producer.is_alive():
+            producer.join()
+        conn.close()
+        raise
+    finally:
+        executor.shutdown()
+    finish_writes(conn, analyze=False)
+    if outcome['error'] is not None:
+        raise outcome['error']
+    logger.info(f"Crawled and parsed {len(parsed)} pages in {time.perf_counter() - start:.1f}s "
+                f"(queue peak {sink.peak} of {queue_size})")
+
+    get_dataframes(workers=workers, parsed_files=parsed)
+    return outcome['error_players']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download and clean player pages in one streaming pass.")
+    parser.add_argument('--no-raw', action='store_true', help='Do not write new pages to data/raw')
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: all cores)')
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help='Pages buffered between crawl and parsers')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Parsed records per database commit')
+    parser.add_argument('--full-rebuild', action='store_true', help='Delete the database before crawling')
+    parser.add_argument('--log-level', default=None, help='DEBUG, INFO (default), WARNING or ERROR')
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+    gather_and_clean(args.workers, args.full_rebuild, not args.no_raw, args.queue_size, args.batch_size)
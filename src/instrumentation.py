@@ -0,0 +1,302 @@
+"""
+Timing, memory and counter instrumentation for the pipeline.
+- Hierarchical timing spans (per thread, so parallel stages nest independently)
+- Current RSS when each span ends, plus the span's own peak RSS and the peak RSS of child processes (parser pool
+  workers) while it was open, sampled in the background
+- Named counters (files parsed, rows written, ...)
+- JSON and CSV run reports, optional cProfile dumps, and log-level based console output
+"""
+
+import cProfile
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# How often open spans sample memory
+SAMPLE_SECONDS = 0.05
+LOG_FORMAT = '%(message)s'
+DEBUG_LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s [%(threadName)s] %(message)s'
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------
+# Memory
+# ----------------------
+def _statm_rss_mb(pid='self'):
+    with open(f'/proc/{pid}/statm', 'r') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def current_rss_mb():
+    """
+    Resident set size of this process in MB, or None where /proc is unavailable.
+    """
+    try:
+        return _statm_rss_mb()
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def children_rss_mb():
+    """
+    Total resident set size of this process's live child processes (e.g. parser pool workers) in MB, or None where
+    /proc does not list children.
+    """
+    try:
+        pids = []
+        for tid in os.listdir('/proc/self/task'):
+            with open(f'/proc/self/task/{tid}/children', 'r') as f:
+                pids += f.read().split()
+    except OSError:
+        return None
+    total = 0
+    for pid in pids:
+        try:
+            total += _statm_rss_mb(pid)
+        except (OSError, ValueError):
+            continue  # exited since it was listed
+    return total
+
+
+def _maxrss_mb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far in MB, or None where the resource module is unavailable.
+    This is the high-water mark of the whole run; spans record their own peaks (see Recorder.span).
+    """
+    return _maxrss_mb(resource.RUSAGE_SELF) if resource else None
+
+
+def children_peak_rss_mb():
+    """
+    Largest peak resident set size of any finished child process so far in MB (RUSAGE_CHILDREN), or None where
+    the resource module is unavailable.
+    """
+    return _maxrss_mb(resource.RUSAGE_CHILDREN) if resource else None
+
+
+def _max(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+class _SpanMemory:
+    """
+    Running memory peaks of one open span.
+    """
+    def __init__(self):
+        self.peak = current_rss_mb()
+        self.children_peak = children_rss_mb()
+        self.children_maxrss = children_peak_rss_mb()
+
+    def sample(self, rss, children):
+        self.peak = _max(self.peak, rss)
+        self.children_peak = _max(self.children_peak, children)
+
+    def finish(self):
+        """
+        Returns:
+            tuple: (rss, peak rss, children peak rss) in MB. Children that finished while the span was open count
+            with their own peak (RUSAGE_CHILDREN rises only when such a child sets a new high-water mark).
+        """
+        rss = current_rss_mb()
+        self.sample(rss, children_rss_mb())
+        children_maxrss = children_peak_rss_mb()
+        if children_maxrss is not None and children_maxrss != self.children_maxrss:
+            self.children_peak = _max(self.children_peak, children_maxrss)
+        return rss, self.peak, self.children_peak
+
+
+# ----------------------
+# Recorder
+# ----------------------
+class Recorder:
+    """
+    Collects spans and counters for one run. Thread-safe; each thread keeps its own span stack.
+    While any span is open, a background thread samples this process's and its children's RSS every
+    SAMPLE_SECONDS and raises the peaks of every open span.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open = set()
+        self._sampler = None
+        self.reset()
+        if hasattr(os, 'register_at_fork'):
+            # A forked pool worker must not inherit a lock held by the sampler, nor the parent's open spans
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._open = set()
+        self._sampler = None
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._origin = time.perf_counter()
+            self.spans = []
+            self.counters = {}
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _open_memory(self):
+        memory = _SpanMemory()
+        with self._lock:
+            self._open.add(memory)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name='memory-sampler', daemon=True)
+                self._sampler.start()
+        return memory
+
+    def _close_memory(self, memory):
+        with self._lock:
+            self._open.discard(memory)
+        return memory.finish()
+
+    def _sample(self):
+        while True:
+            time.sleep(SAMPLE_SECONDS)
+            rss, children = current_rss_mb(), children_rss_mb()
+            with self._lock:
+                if not self._open:
+                    # The next span starts a new sampler
+                    self._sampler = None
+                    return
+                for memory in self._open:
+                    memory.sample(rss, children)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Times the enclosed block as `name`, nested under the thread's enclosing span.
+
+        Args:
+            name (str): Span name (e.g. 'parse', 'fit').
+            **attributes: Extra values stored with the span (e.g. table='batters').
+        """
+        stack = self._stack()
+        path = '/'.join(stack + [name])
+        stack.append(name)
+        memory = self._open_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            rss, peak, children_peak = self._close_memory(memory)
+            record = {
+                'path': path,
+                'name': name,
+                'depth': path.count('/'),
+                'thread': threading.current_thread().name,
+                'start_sec': round(start - self._origin, 6),
+                'duration_sec': round(duration, 6),
+                'rss_mb': rss,
+                'peak_rss_mb': peak,
+                'children_peak_rss_mb': children_peak,
+            }
+            record.update(attributes)
+            with self._lock:
+                self.spans.append(record)
+            logger.debug(f"{path} took {duration:.3f}s")
+
+    def count(self, name, value=1):
+        """
+        Adds `value` to the counter `name`.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self):
+        with self._lock:
+            return {
+                'started_at': self.started,
+                'wall_time_sec': round(time.perf_counter() - self._origin, 6),
+                'peak_rss_mb': peak_rss_mb(),
+                'children_peak_rss_mb': children_peak_rss_mb(),
+                'spans': sorted(self.spans, key=lambda span: span['start_sec']),
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def write_report(self, path):
+        """
+        Writes the run report as JSON to `path` and the spans as CSV next to it (same name, .csv).
+
+        Returns:
+            tuple: (json_path, csv_path)
+        """
+        report = self.report()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        csv_path = os.path.splitext(path)[0] + '.csv'
+        fields = ['path', 'name', 'depth', 'thread', 'start_sec', 'duration_sec', 'rss_mb', 'peak_rss_mb',
+                  'children_peak_rss_mb']
+        extra = sorted({key for span in report['spans'] for key in span} - set(fields))
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields + extra)
+            writer.writeheader()
+            writer.writerows(report['spans'])
+        return path, csv_path
+
+
+RECORDER = Recorder()
+span = RECORDER.span
+count = RECORDER.count
+
+
+# ----------------------
+# Profiling and Logging
+# ----------------------
+@contextmanager
+def profiled(name, profile_dir=None):
+    """
+    Runs the enclosed block under cProfile and dumps the stats to `profile_dir/name.prof`.
+    Does nothing when profile_dir is None. View a dump with `python -m pstats <file>` or snakeviz.
+    """
+    if profile_dir is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(profile_dir, exist_ok=True)
+        dump_path = os.path.join(profile_dir, f"{name}.prof")
+        profiler.dump_stats(dump_path)
+        logger.info(f"Profile of {name} written to {dump_path}")
+
+
+def configure_logging(level=None):
+    """
+    Sends log records to the console. The level defaults to the LOG_LEVEL environment variable, then INFO;
+    INFO shows the usual progress messages, WARNING only problems, DEBUG adds every span's timing.
+    """
+    level = (level or os.environ.get('LOG_LEVEL') or 'INFO').upper()
+    logging.basicConfig(level=level, format=DEBUG_LOG_FORMAT if level == 'DEBUG' else LOG_FORMAT, force=True)
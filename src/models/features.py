@@ -0,0 +1,118 @@
+"""
+Fitted feature transformer saved alongside the WAR models.
+- Records the feature column order, per-column min/max and the target's min/max at training time
+- Scales any number of raw loader rows without reading the rest of the table
+- Saves/loads model files as {'model', 'transformer'} bundles; older files holding a bare estimator still load
+- Replaces model files atomically, so a reader never loads a half-written one
+"""
+
+import os
+import sys
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.clean_data import numeric_columns
+
+
+def constant_safe_maxs(mins, maxs):
+    """
+    Maxima with a unit range for constant columns, which then scale to 0 instead of 0/0.
+    """
+    return np.where(maxs == mins, mins + 1, maxs)
+
+
+class FeatureTransformer:
+    """
+    Min-max scaling fitted on a loader DataFrame, the same scaling get_*_df_normalized applies.
+
+    Args:
+        target (str): WAR column to predict ('b_war' or 'p_war'); it is scaled separately and left out of the features.
+    """
+    def __init__(self, target):
+        self.target = target
+        self.columns = None
+        self.mins = None
+        self.maxs = None
+        self.target_min = None
+        self.target_max = None
+
+    def fit(self, df):
+        """
+        Learns feature columns and min/max from the numeric columns of `df`.
+
+        Returns:
+            FeatureTransformer: self
+        """
+        numeric = numeric_columns(df)
+        self.columns = [col for col in numeric.columns if col != self.target]
+        self.mins = numeric[self.columns].min().to_numpy(dtype=float)
+        self.maxs = constant_safe_maxs(self.mins, numeric[self.columns].max().to_numpy(dtype=float))
+        self.target_min = float(numeric[self.target].min())
+        self.target_max = float(numeric[self.target].max())
+        return self
+
+    def transform(self, df):
+        """
+        Scales the feature columns of raw rows.
+
+        Args:
+            df (pd.DataFrame): Rows with at least the fitted feature columns (extra columns are ignored).
+        Returns:
+            pd.DataFrame: Scaled features in training column order, with the index of `df`.
+        """
+        values = df[self.columns].to_numpy(dtype=float, na_value=np.nan)
+        return pd.DataFrame((values - self.mins) / (self.maxs - self.mins), columns=self.columns, index=df.index)
+
+    def transform_target(self, y):
+        return (y - self.target_min) / (self.target_max - self.target_min)
+
+    def inverse_target(self, y):
+        return y * (self.target_max - self.target_min) + self.target_min
+
+    def to_dict(self):
+        """
+        Plain-data state, so model files load without importing this module.
+        """
+        return {'target': self.target, 'columns': list(self.columns), 'mins': self.mins.tolist(),
+                'maxs': self.maxs.tolist(), 'target_min': self.target_min, 'target_max': self.target_max}
+
+    @classmethod
+    def from_dict(cls, state):
+        transformer = cls(state['target'])
+        transformer.columns = list(state['columns'])
+        transformer.mins = np.asarray(state['mins'], dtype=float)
+        transformer.maxs = np.asarray(state['maxs'], dtype=float)
+        transformer.target_min = state['target_min']
+        transformer.target_max = state['target_max']
+        return transformer
+
+
+def save_model(model, transformer, path):
+    """
+    Saves a fitted estimator together with the transformer its inputs were scaled with. The file is written next
+    to `path` and renamed onto it, so readers polling the model (the service, lookup) never see a partial file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        joblib.dump({'model': model, 'transformer': transformer.to_dict()}, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_model(path):
+    """
+    Loads a model file.
+
+    Returns:
+        tuple: (model, transformer). transformer is None for legacy files that only hold the estimator.
+    """
+    saved = joblib.load(path)
+    if isinstance(saved, dict) and 'model' in saved:
+        return saved['model'], FeatureTransformer.from_dict(saved['transformer'])
+    return saved, None
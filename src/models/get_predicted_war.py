@@ -1,59 +1,86 @@
+import logging
 import sys
 import os
-import pandas as pd
-import joblib
-import numpy as np
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from src.data.clean_data import get_batters_df, get_pitchers_df, get_batters_df_normalized, get_pitchers_df_normalized
+# Only lightweight imports at module level: pandas, sklearn and the data layer are imported when first needed,
+# so a single-player lookup from the command line starts quickly
+from src.models.lookup import MODEL_PATHS, load_player_model, lookup_war
+from src.instrumentation import configure_logging, count, span
 
-# Load models
-BATTERS_MODEL_PATH = 'data/models/batters_model.joblib'
-PITCHERS_MODEL_PATH = 'data/models/pitchers_model.joblib'
+logger = logging.getLogger(__name__)
 
-batters_model = joblib.load(BATTERS_MODEL_PATH)
-pitchers_model = joblib.load(PITCHERS_MODEL_PATH)
+BATTERS_MODEL_PATH = MODEL_PATHS['batter']
+PITCHERS_MODEL_PATH = MODEL_PATHS['pitcher']
 
-# Load data
-batters_df = get_batters_df()
-pitchers_df = get_pitchers_df()
-batters_normalized = get_batters_df_normalized()
-pitchers_normalized = get_pitchers_df_normalized()
+# Player type -> (saved transformer state, FeatureTransformer), rebuilt when the model file is reloaded
+_transformers = {}
+# Legacy models: player type -> (table frame, transformer), refit per cached table
+_legacy_transformers = {}
 
-# Get min and max for denormalization
-b_war_min = batters_df['b_war'].min()
-b_war_max = batters_df['b_war'].max()
-p_war_min = pitchers_df['p_war'].min()
-p_war_max = pitchers_df['p_war'].max()
+def get_model(player_type='batter'):
+    """
+    The player type's model, loaded on first use (and reloaded if its file changes).
+    """
+    return load_player_model(player_type)[0]
 
-def denormalize(normalized_val, min_val, max_val):
-    if pd.isna(normalized_val):
-        return None
-    return normalized_val * (max_val - min_val) + min_val
+def get_transformer(player_type='batter'):
+    """
+    Returns the transformer saved with the player type's model. Legacy model files only hold the estimator,
+    so their scaling is refit on the current table, which matches how those models were scored before.
+    """
+    from src.models.features import FeatureTransformer
+    from src.data.data_access import get_player_data
+
+    _, state = load_player_model(player_type)
+    if state is not None:
+        cached = _transformers.get(player_type)
+        if cached is None or cached[0] is not state:
+            cached = _transformers[player_type] = (state, FeatureTransformer.from_dict(state))
+        return cached[1]
+    table, war_col = ('batters', 'b_war') if player_type == 'batter' else ('pitchers', 'p_war')
+    df = get_player_data().raw(table)
+    cached = _legacy_transformers.get(player_type)
+    if cached is None or cached[0] is not df:
+        cached = _legacy_transformers[player_type] = (df, FeatureTransformer(war_col).fit(df))
+    return cached[1]
+
+def predict_war(rows, player_type='batter'):
+    """
+    Predicts WAR for raw loader rows, scaling only those rows.
+
+    Args:
+        rows (pd.DataFrame): One or more rows from get_batters_df/get_pitchers_df.
+        player_type (str): 'batter' or 'pitcher'.
+    Returns:
+        np.ndarray: Predicted WAR per row, in WAR units.
+    """
+    transformer = get_transformer(player_type)
+    return transformer.inverse_target(get_model(player_type).predict(transformer.transform(rows)))
 
 # Helper to get actual and predicted WAR for a player
 def get_predicted_war(player_name, player_type='batter'):
+    # Models saved with their transformer score one player from an indexed row lookup
+    if load_player_model(player_type)[1] is not None:
+        return lookup_war(player_name, player_type)
+    import numpy as np
+    import pandas as pd
+    from src.data.data_access import get_player_data
+
     if player_type == 'batter':
-        df = batters_df
-        norm_df = batters_normalized
-        model = batters_model
+        table = 'batters'
         war_col = 'b_war'
-        war_min, war_max = b_war_min, b_war_max
     else:
-        df = pitchers_df
-        norm_df = pitchers_normalized
-        model = pitchers_model
+        table = 'pitchers'
         war_col = 'p_war'
-        war_min, war_max = p_war_min, p_war_max
+    df = get_player_data().raw(table)
     # Find player row
     player_row = df[df['fullName'] == player_name]
-    norm_row = norm_df.loc[player_row.index]
-    if player_row.empty or norm_row.empty:
+    if player_row.empty:
         return None, None
-    # Prepare input for prediction (drop WAR column)
-    X = norm_row.drop(columns=[war_col], errors='ignore')
-    predicted_war_norm = model.predict(X)[0]
-    predicted_war = denormalize(predicted_war_norm, war_min, war_max)
+    predicted_war = predict_war(player_row.iloc[:1], player_type)[0]
+    if pd.isna(predicted_war):
+        predicted_war = None
     # Get actual WAR as a scalar value robustly
     actual_war_val = player_row[war_col]
     if isinstance(actual_war_val, pd.Series):
@@ -64,22 +91,44 @@ def get_predicted_war(player_name, player_type='batter'):
         actual_war = actual_war_val
     return actual_war, predicted_war
 
+# Batch version of get_predicted_war for many names at once
+def get_predicted_wars(player_names, player_type='batter'):
+    """
+    Actual and predicted WAR for many players with one table join and one predict call.
+
+    Returns:
+        pd.DataFrame: fullName, actual_war, predicted_war and status ('ok', 'not_found' or 'ambiguous'), one row per name.
+    """
+    from src.data.data_access import get_player_data
+    from src.models.scoring import score_players
+
+    table = 'batters' if player_type == 'batter' else 'pitchers'
+    return score_players(player_names, get_player_data().raw(table), get_model(player_type), get_transformer(player_type))
+
 # Update value_labels CSVs with actual and predicted WAR
 def update_value_labels_csv(csv_path, player_type='batter'):
+    import pandas as pd
+    from src.models.scoring import STATUS_AMBIGUOUS, STATUS_NOT_FOUND
+
     df = pd.read_csv(csv_path)
-    actual_wars = []
-    predicted_wars = []
-    for name in df['fullName']:
-        actual, predicted = get_predicted_war(name, player_type)
-        actual_wars.append(actual)
-        predicted_wars.append(predicted)
-    df['actual_war'] = actual_wars
-    df['predicted_war'] = predicted_wars
-    df.to_csv(csv_path, index=False)
-    print(f"Updated {csv_path} with actual and predicted WAR.")
+    with span('score', player_type=player_type, players=len(df)):
+        scored = get_predicted_wars(df['fullName'], player_type)
+    count('players_scored', len(scored))
+    df['actual_war'] = scored['actual_war'].to_numpy()
+    df['predicted_war'] = scored['predicted_war'].to_numpy()
+    with span('write_csv', player_type=player_type):
+        df.to_csv(csv_path, index=False)
+    not_found = scored.loc[scored['status'] == STATUS_NOT_FOUND, 'fullName'].unique()
+    ambiguous = scored.loc[scored['status'] == STATUS_AMBIGUOUS, 'fullName'].unique()
+    if len(not_found):
+        logger.warning(f"{len(not_found)} players not found, WAR left empty: {', '.join(map(str, not_found))}")
+    if len(ambiguous):
+        logger.warning(f"{len(ambiguous)} players with several rows, first row used: {', '.join(map(str, ambiguous))}")
+    logger.info(f"Updated {csv_path} with actual and predicted WAR.")
 
 if __name__ == "__main__":
     # Example usage: python get_predicted_war.py "Aaron Judge" batter
+    configure_logging()
     if len(sys.argv) > 2:
         name = sys.argv[1]
         ptype = sys.argv[2]
@@ -0,0 +1,311 @@
+"""
+Incremental training of the linear WAR models from sufficient statistics.
+- Keeps the row count, column means and centered cross-product matrix of [features, WAR] next to each model
+  (data/models/<type>_stats.npz), plus each column's min/max with the number of rows at it, and the raw rows
+  (taking a player's old row out of the statistics needs its values)
+- On update, one vectorized pass compares the current table with the stored rows to find added, changed and
+  removed players (O(rows x features)); only those touch the statistics (O(changed rows x features^2)) and the
+  min/max, which rescan a column only when the last row at its min or max leaves
+- The least-squares solution is then solved from the statistics instead of refitting on the whole table
+- Coefficients match LinearRegression fitted on all current rows, with the same min-max scaling, to ~1e-9
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.data_access import get_player_data
+from src.instrumentation import configure_logging, count, span
+from src.models.features import FeatureTransformer, constant_safe_maxs, save_model
+from src.models.train_model import MODEL_TARGETS
+
+STATS_PATH = 'data/models/{player_type}_stats.npz'
+KEY_COLUMN = 'fullName'
+# Relative eigenvalue cutoff of the normal equations; exactly collinear stats (e.g. PA = AB + BB + ...) fall far below
+RCOND = 1e-12
+
+logger = logging.getLogger(__name__)
+
+
+class SufficientStats:
+    """
+    Mergeable moments of a matrix Z whose last column is the target: row count, column means and the centered
+    cross-product matrix sum((z - mean)(z - mean)^T). Batches are added and removed with the pairwise update
+    of Chan et al., so the statistics never need the other rows.
+
+    Args:
+        width (int): Number of columns of Z (features + 1).
+    """
+    def __init__(self, width):
+        self.n = 0
+        self.mean = np.zeros(width)
+        self.comoment = np.zeros((width, width))
+
+    @staticmethod
+    def _moments(Z):
+        mean = Z.mean(axis=0)
+        centered = Z - mean
+        return len(Z), mean, centered.T @ centered
+
+    def add(self, Z):
+        """
+        Folds the rows of Z into the statistics.
+        """
+        if not len(Z):
+            return self
+        n_b, mean_b, comoment_b = self._moments(Z)
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.comoment = self.comoment + comoment_b + np.outer(delta, delta) * (self.n * n_b / n)
+        self.mean = self.mean + delta * (n_b / n)
+        self.n = n
+        return self
+
+    def remove(self, Z):
+        """
+        Takes rows that were previously added out of the statistics.
+        """
+        if not len(Z):
+            return self
+        n_b, mean_b, comoment_b = self._moments(Z)
+        n = self.n - n_b
+        if n < 0:
+            raise ValueError("cannot remove more rows than were added")
+        if n == 0:
+            return self.__init__(len(self.mean)) or self
+        mean = (self.mean * self.n - mean_b * n_b) / n
+        delta = mean_b - mean
+        self.comoment = self.comoment - comoment_b - np.outer(delta, delta) * (n * n_b / self.n)
+        self.mean = mean
+        self.n = n
+        return self
+
+    def solve(self, mins, maxs):
+        """
+        Least-squares fit of the last column on the others, with every column min-max scaled by mins/maxs.
+        Like LinearRegression, rank-deficient features get the minimum-norm solution.
+
+        Returns:
+            tuple: (coefficients, intercept) in scaled units.
+        """
+        ranges = maxs - mins
+        scaled = self.comoment / np.outer(ranges, ranges)
+        coef = np.linalg.pinv(scaled[:-1, :-1], rcond=RCOND, hermitian=True) @ scaled[:-1, -1]
+        scaled_mean = (self.mean - mins) / ranges
+        return coef, scaled_mean[-1] - scaled_mean[:-1] @ coef
+
+    def to_arrays(self):
+        return {'n': self.n, 'mean': self.mean, 'comoment': self.comoment}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        stats = cls(len(arrays['mean']))
+        stats.n = int(arrays['n'])
+        stats.mean = np.asarray(arrays['mean'], dtype=float)
+        stats.comoment = np.asarray(arrays['comoment'], dtype=float)
+        return stats
+
+
+# ----------------------
+# Training State
+# ----------------------
+def row_keys(df):
+    """
+    One key per row: the player's name, with a '#2', '#3', ... suffix on repeated names.
+    """
+    names = df[KEY_COLUMN].astype(str)
+    if names.is_unique:
+        return names.to_numpy(dtype=object)
+    repeat = names.groupby(names, sort=False).cumcount()
+    return np.where(repeat > 0, names + '#' + (repeat + 1).astype(str), names).astype(object)
+
+def training_rows(df, columns, target):
+    """
+    [features, target] matrix of a loader DataFrame, raw (unscaled) values.
+    """
+    Z = df[list(columns) + [target]].to_numpy(dtype=float, na_value=np.nan)
+    if np.isnan(Z).any():
+        raise ValueError(f"{target} training rows contain missing values")
+    return Z
+
+def column_extrema(Z):
+    """
+    Per-column min and max of Z and how many rows hold each.
+
+    Returns:
+        dict: {'mins', 'min_counts', 'maxs', 'max_counts'}
+    """
+    mins, maxs = Z.min(axis=0), Z.max(axis=0)
+    return {'mins': mins, 'min_counts': (Z == mins).sum(axis=0), 'maxs': maxs, 'max_counts': (Z == maxs).sum(axis=0)}
+
+def update_extrema(extrema, removed, added, Z):
+    """
+    Takes the `removed` rows out of and folds the `added` rows into column extrema. A column whose min or max
+    lost its last row is rescanned over Z, the rows after the update; the others never read Z.
+    """
+    extrema['min_counts'] = extrema['min_counts'] - (removed == extrema['mins']).sum(axis=0)
+    extrema['max_counts'] = extrema['max_counts'] - (removed == extrema['maxs']).sum(axis=0)
+    stale = (extrema['min_counts'] == 0) | (extrema['max_counts'] == 0)
+    if len(added):
+        for bound, counts, pick in (('mins', 'min_counts', np.minimum), ('maxs', 'max_counts', np.maximum)):
+            merged = pick(extrema[bound], pick.reduce(added, axis=0))
+            kept = merged == extrema[bound]
+            extrema[counts] = np.where(kept, extrema[counts], 0) + (added == merged).sum(axis=0)
+            extrema[bound] = merged
+    if stale.any():
+        rescanned = column_extrema(Z[:, stale])
+        for name, values in rescanned.items():
+            extrema[name][stale] = values
+    return extrema
+
+def build_state(df, target):
+    """
+    Training state accumulated from every row of `df`.
+
+    Returns:
+        dict: {'columns', 'target', 'keys', 'rows', 'stats', 'extrema'}
+    """
+    columns = FeatureTransformer(target).fit(df.head(1)).columns
+    Z = training_rows(df, columns, target)
+    return {'columns': columns, 'target': target, 'keys': row_keys(df), 'rows': Z,
+            'stats': SufficientStats(Z.shape[1]).add(Z), 'extrema': column_extrema(Z)}
+
+def update_state(state, df):
+    """
+    Brings a training state up to date with the current table. Finding the changes compares every row of the table
+    with the stored rows; only players that were added, removed or whose row changed are then folded into or taken
+    out of the statistics and the column extrema.
+
+    Returns:
+        dict: {'added', 'changed', 'removed'} row counts.
+    """
+    keys = row_keys(df)
+    Z = training_rows(df, state['columns'], state['target'])
+    old = pd.Index(state['keys'])
+    new = pd.Index(keys)
+    old_pos = old.get_indexer(new)
+    matched = old_pos >= 0
+    changed = np.zeros(len(keys), dtype=bool)
+    changed[matched] = (state['rows'][old_pos[matched]] != Z[matched]).any(axis=1)
+    removed = ~old.isin(new)
+
+    superseded = np.concatenate([state['rows'][removed], state['rows'][old_pos[changed]]])
+    added = Z[changed | ~matched]
+    state['stats'].remove(superseded).add(added)
+    update_extrema(state['extrema'], superseded, added, Z)
+    state['keys'] = keys
+    state['rows'] = Z
+    return {'added': int((~matched).sum()), 'changed': int(changed.sum()), 'removed': int(removed.sum())}
+
+def state_model(state):
+    """
+    LinearRegression and FeatureTransformer equivalent to fitting on the state's rows.
+    Min/max come from the tracked column extrema, so the scaling is the one a full refit would learn.
+    """
+    mins, maxs = state['extrema']['mins'].copy(), state['extrema']['maxs'].copy()
+    maxs[:-1] = constant_safe_maxs(mins[:-1], maxs[:-1])
+    transformer = FeatureTransformer(state['target'])
+    transformer.columns = list(state['columns'])
+    transformer.mins, transformer.maxs = mins[:-1], maxs[:-1]
+    transformer.target_min, transformer.target_max = float(mins[-1]), float(maxs[-1])
+
+    coef, intercept = state['stats'].solve(mins, maxs)
+    model = LinearRegression()
+    model.coef_ = coef
+    model.intercept_ = float(intercept)
+    model.n_features_in_ = len(coef)
+    model.feature_names_in_ = np.asarray(transformer.columns, dtype=object)
+    return model, transformer
+
+def save_state(state, path):
+    """
+    Saves a training state as a .npz file (no pickled objects).
+    """
+    np.savez(path, columns=np.asarray(state['columns'], dtype=str), target=state['target'],
+             keys=np.asarray(state['keys'], dtype=str), rows=state['rows'], **state['stats'].to_arrays(),
+             **state['extrema'])
+
+def load_state(path):
+    with np.load(path, allow_pickle=False) as saved:
+        state = {'columns': [str(col) for col in saved['columns']], 'target': str(saved['target']),
+                 'keys': saved['keys'].astype(object), 'rows': saved['rows'], 'stats': SufficientStats.from_arrays(saved)}
+        if 'min_counts' in saved.files:
+            state['extrema'] = {name: saved[name] for name in ('mins', 'min_counts', 'maxs', 'max_counts')}
+        else:
+            # Saved before the extrema were tracked
+            state['extrema'] = column_extrema(state['rows'])
+    return state
+
+
+# ----------------------
+# Incremental Training
+# ----------------------
+def update_model(player_type, rebuild=False):
+    """
+    Updates one player type's WAR model from its saved statistics and saves model and statistics.
+    The first run (or a table whose feature columns changed, or `rebuild`) accumulates every row.
+
+    Unlike train_model, the model is fitted on every row rather than an 80% split, so that an update and a
+    full refit on the same table agree.
+
+    Args:
+        player_type (str): 'batters' or 'pitchers'.
+        rebuild (bool): Recompute the statistics from the table (clears any drift from many updates).
+    Returns:
+        LinearRegression: The updated model.
+    """
+    war_col, model_path = MODEL_TARGETS[player_type]
+    stats_path = STATS_PATH.format(player_type=player_type)
+    with span('load', player_type=player_type):
+        df = get_player_data().raw(player_type)
+    state = None
+    if not rebuild and os.path.exists(stats_path):
+        state = load_state(stats_path)
+        if state['columns'] != FeatureTransformer(war_col).fit(df.head(1)).columns:
+            logger.info(f"{player_type.title()} feature columns changed; rebuilding statistics")
+            state = None
+    with span('update_stats', player_type=player_type):
+        if state is None:
+            state = build_state(df, war_col)
+            changes = {'added': len(state['keys']), 'changed': 0, 'removed': 0}
+        else:
+            changes = update_state(state, df)
+    for change, rows in changes.items():
+        count(f'rows_{change}', rows)
+    with span('solve', player_type=player_type):
+        model, transformer = state_model(state)
+    with span('save_model', player_type=player_type):
+        save_model(model, transformer, model_path)
+        save_state(state, stats_path)
+    logger.info(f"{player_type.title()} model updated: {changes['added']} added, {changes['changed']} changed, "
+                f"{changes['removed']} removed of {state['stats'].n} rows; saved to {model_path}")
+    return model
+
+def refit_difference(player_type, model, transformer):
+    """
+    Largest absolute coefficient difference between `model` and LinearRegression refitted on every row.
+    """
+    df = get_player_data().raw(player_type)
+    refit = LinearRegression().fit(transformer.transform(df), transformer.transform_target(df[transformer.target]))
+    return max(np.abs(refit.coef_ - model.coef_).max(), abs(refit.intercept_ - model.intercept_))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the WAR models from their saved sufficient statistics.")
+    parser.add_argument('--types', nargs='+', default=list(MODEL_TARGETS), choices=list(MODEL_TARGETS))
+    parser.add_argument('--rebuild', action='store_true', help='Recompute the statistics from the whole table')
+    parser.add_argument('--check', action='store_true', help='Compare the coefficients with a full refit')
+    args = parser.parse_args()
+    configure_logging()
+    for player_type in args.types:
+        model = update_model(player_type, args.rebuild)
+        if args.check:
+            from src.models.features import load_model
+            _, transformer = load_model(MODEL_TARGETS[player_type][1])
+            logger.info(f"  max |coefficient - full refit|: {refit_difference(player_type, model, transformer):.2e}")
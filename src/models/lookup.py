@@ -0,0 +1,104 @@
+"""
+Fast single-player WAR lookup.
+- Loads only the requested player type's model, the first time it is needed (and again if the file changes)
+- Reads the player's row with an indexed SQLite query (fullName is indexed) on a reused connection, instead of
+  loading the whole table
+- Scales the row with the transformer saved in the model file, so pandas and the data layer are never imported
+"""
+
+import os
+import warnings
+
+# db.py does not import pandas; clean_data would pull in pandas and BeautifulSoup
+from src.data.db import DB_PATH, player_rows
+
+MODEL_PATHS = {
+    'batter': 'data/models/batters_model.joblib',
+    'pitcher': 'data/models/pitchers_model.joblib',
+}
+# Player type -> (table, WAR column, drop rows with missing values like get_pitchers_df)
+PLAYER_TABLES = {
+    'batter': ('batters', 'b_war', False),
+    'pitcher': ('pitchers', 'p_war', True),
+}
+
+_models = {}
+
+
+def _player_type(player_type):
+    return 'batter' if player_type == 'batter' else 'pitcher'
+
+
+def load_player_model(player_type='batter'):
+    """
+    Loads the model file of one player type, once per process and again only if the file changes.
+
+    Returns:
+        tuple: (model, transformer state dict). The state is None for legacy files holding a bare estimator.
+    """
+    player_type = _player_type(player_type)
+    path = MODEL_PATHS[player_type]
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _models.get(player_type)
+    if cached is None or cached[0] != stamp:
+        # joblib (and the model's sklearn modules) are only imported when a model is actually needed
+        import joblib
+        saved = joblib.load(path)
+        if isinstance(saved, dict) and 'model' in saved:
+            cached = _models[player_type] = (stamp, saved['model'], saved['transformer'])
+        else:
+            cached = _models[player_type] = (stamp, saved, None)
+    return cached[1], cached[2]
+
+
+def fetch_player_row(player_name, player_type='batter', db_path=DB_PATH):
+    """
+    The player's first loader row (salary > 0; pitchers without missing values), via the (fullName, year) index.
+
+    Returns:
+        dict or None: Column -> value, or None if the player is not in the table.
+    """
+    table, _, drop_na = PLAYER_TABLES[_player_type(player_type)]
+    cursor = player_rows(table, player_name, db_path)
+    columns = [description[0] for description in cursor.description]
+    # Fetch every row (a player has a few) so the statement is finished and holds no read snapshot
+    for values in cursor.fetchall():
+        if drop_na and any(value is None for value in values):
+            continue
+        return dict(zip(columns, values))
+    return None
+
+
+def lookup_war(player_name, player_type='batter', db_path=DB_PATH):
+    """
+    Actual and predicted WAR for one player without loading the player tables.
+
+    Returns:
+        tuple: (actual_war, predicted_war), (None, None) if the player is not found.
+    Raises:
+        ValueError: If the model file has no saved transformer (legacy model); use get_predicted_war instead.
+    """
+    import numpy as np
+    from src.data.schema import float32_columns
+
+    model, transformer = load_player_model(player_type)
+    if transformer is None:
+        raise ValueError("Model file has no saved feature transformer; retrain with train_model.py")
+    row = fetch_player_row(player_name, player_type, db_path)
+    if row is None:
+        return None, None
+    values = np.array([[np.nan if row[col] is None else row[col] for col in transformer['columns']]], dtype=float)
+    # Round rate stats to float32 as the loaders do, so this matches batch scoring exactly
+    rates = float32_columns(transformer['columns'])
+    values[:, rates] = values[:, rates].astype(np.float32)
+    mins = np.asarray(transformer['mins'], dtype=float)
+    maxs = np.asarray(transformer['maxs'], dtype=float)
+    with warnings.catch_warnings():
+        # The model was fitted on a DataFrame; the same columns are passed in the same order as a plain array
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        predicted_norm = model.predict((values - mins) / (maxs - mins))[0]
+    predicted_war = predicted_norm * (transformer['target_max'] - transformer['target_min']) + transformer['target_min']
+    if np.isnan(predicted_war):
+        predicted_war = None
+    return row[PLAYER_TABLES[_player_type(player_type)][1]], predicted_war
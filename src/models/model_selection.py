@@ -0,0 +1,205 @@
+"""
+Cross-validated model selection for the WAR regressors.
+- Evaluates linear, ridge, lasso, gradient boosting and random forest regressors with k-fold cross-validation
+- Runs every (model, fold) fit in parallel across cores
+- Fits the scaling of each fold on its training rows only, so held-out rows never shape the features they are scored on
+- Builds each fold split and its scaled matrices once; they are cached for the rest of the process
+- Reports R^2, RMSE and MAE (in WAR) and fit time per model, and saves the best model of each player type
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.data_access import get_player_data
+from src.instrumentation import configure_logging, count, span
+from src.models.features import FeatureTransformer, save_model
+from src.models.train_model import MODEL_TARGETS
+
+# Estimators are cloned for every fit; forests use one core each because the folds already run in parallel
+CANDIDATES = {
+    'linear': LinearRegression(),
+    'ridge': Ridge(alpha=1.0),
+    'lasso': Lasso(alpha=0.0005, max_iter=10000),
+    'gradient_boosting': GradientBoostingRegressor(random_state=42),
+    'random_forest': RandomForestRegressor(n_estimators=200, random_state=42, n_jobs=1),
+}
+DEFAULT_FOLDS = 5
+DEFAULT_JOBS = -1
+REPORT_PATH = 'reports/model_selection_{player_type}.json'
+
+logger = logging.getLogger(__name__)
+
+# Player type -> (source frame, transformer, features frame, X, y); rebuilt when the data layer hands out a new frame
+_matrices = {}
+# (rows, folds, seed) -> list of (train indices, test indices)
+_folds = {}
+# (player type, folds, seed) -> (source frame, list of fold matrices); rebuilt like _matrices
+_fold_matrices = {}
+
+
+# ----------------------
+# Cached Inputs
+# ----------------------
+def training_matrices(player_type):
+    """
+    Scaled feature matrix and target of one player type for the final fit on every row, built once per loaded table.
+
+    Returns:
+        tuple: (FeatureTransformer, scaled features DataFrame, the same as an np.ndarray X, y as an np.ndarray),
+        with y in scaled units. The final fit uses the frame so the model keeps the feature names it is scored with.
+    """
+    war_col, _ = MODEL_TARGETS[player_type]
+    df = get_player_data().raw(player_type)
+    cached = _matrices.get(player_type)
+    if cached is None or cached[0] is not df:
+        with span('scale', player_type=player_type):
+            transformer = FeatureTransformer(war_col).fit(df)
+            features = transformer.transform(df)
+            y = transformer.transform_target(df[war_col]).to_numpy(dtype=float)
+        cached = _matrices[player_type] = (df, transformer, features, features.to_numpy(), y)
+    return cached[1:]
+
+def fold_indices(n_rows, folds=DEFAULT_FOLDS, seed=42):
+    """
+    Shuffled k-fold (train, test) index pairs, built once per (rows, folds, seed).
+    """
+    key = (n_rows, folds, seed)
+    if key not in _folds:
+        splitter = KFold(n_splits=folds, shuffle=True, random_state=seed)
+        _folds[key] = list(splitter.split(np.zeros((n_rows, 1))))
+    return _folds[key]
+
+def fold_matrices(player_type, folds=DEFAULT_FOLDS, seed=42):
+    """
+    Training and test matrices of every CV fold of one player type, built once per loaded table. Each fold gets its
+    own FeatureTransformer fitted on its training rows, so the test rows are scaled as unseen players would be.
+
+    Returns:
+        list: (X_train, y_train, X_test, test WAR, fold transformer) per fold, with y_train in the fold's scaled
+        units and the test WAR unscaled.
+    """
+    war_col, _ = MODEL_TARGETS[player_type]
+    df = get_player_data().raw(player_type)
+    key = (player_type, folds, seed)
+    cached = _fold_matrices.get(key)
+    if cached is None or cached[0] is not df:
+        matrices = []
+        with span('scale_folds', player_type=player_type, folds=folds):
+            for train, test in fold_indices(len(df), folds, seed):
+                train_df, test_df = df.iloc[train], df.iloc[test]
+                transformer = FeatureTransformer(war_col).fit(train_df)
+                matrices.append((transformer.transform(train_df).to_numpy(),
+                                 transformer.transform_target(train_df[war_col]).to_numpy(dtype=float),
+                                 transformer.transform(test_df).to_numpy(),
+                                 test_df[war_col].to_numpy(dtype=float),
+                                 transformer))
+        cached = _fold_matrices[key] = (df, matrices)
+    return cached[1]
+
+
+# ----------------------
+# Evaluation
+# ----------------------
+def _fit_fold(name, estimator, X_train, y_train, X_test, actual_war, transformer):
+    model = clone(estimator)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    # Errors are reported in WAR, not in the fold's scaled target units
+    predicted_war = transformer.inverse_target(model.predict(X_test))
+    return {
+        'model': name,
+        'r2': r2_score(actual_war, predicted_war),
+        'rmse': float(np.sqrt(mean_squared_error(actual_war, predicted_war))),
+        'mae': mean_absolute_error(actual_war, predicted_war),
+        'fit_sec': fit_time,
+    }
+
+def evaluate_models(player_type, candidates=None, folds=DEFAULT_FOLDS, n_jobs=DEFAULT_JOBS, seed=42):
+    """
+    Cross-validates every candidate on one player type.
+
+    Args:
+        player_type (str): 'batters' or 'pitchers'.
+        candidates (dict or None): Name -> unfitted estimator (default: CANDIDATES).
+        folds (int): Number of CV folds.
+        n_jobs (int): Parallel fits (-1 = one per core).
+        seed (int): Fold shuffling seed.
+    Returns:
+        dict: Model name -> {'r2', 'r2_std', 'rmse', 'rmse_std', 'mae', 'fit_sec'} (means over folds), best RMSE first.
+    """
+    candidates = CANDIDATES if candidates is None else candidates
+    matrices = fold_matrices(player_type, folds, seed)
+    with span('cross_validate', player_type=player_type, models=len(candidates), folds=folds):
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_fold)(name, estimator, *fold)
+            for name, estimator in candidates.items() for fold in matrices
+        )
+    count('cv_fits', len(results))
+    summary = {}
+    for name in candidates:
+        rows = [result for result in results if result['model'] == name]
+        summary[name] = {
+            'r2': float(np.mean([row['r2'] for row in rows])),
+            'r2_std': float(np.std([row['r2'] for row in rows])),
+            'rmse': float(np.mean([row['rmse'] for row in rows])),
+            'rmse_std': float(np.std([row['rmse'] for row in rows])),
+            'mae': float(np.mean([row['mae'] for row in rows])),
+            'fit_sec': float(np.mean([row['fit_sec'] for row in rows])),
+        }
+    return dict(sorted(summary.items(), key=lambda item: item[1]['rmse']))
+
+def select_model(player_type, candidates=None, folds=DEFAULT_FOLDS, n_jobs=DEFAULT_JOBS, seed=42, save=True):
+    """
+    Cross-validates the candidates, refits the one with the lowest mean RMSE on every row and saves it (with its
+    transformer) to the player type's model path. The metrics are written to reports/model_selection_<type>.json.
+
+    Returns:
+        tuple: (best model name, fitted estimator, metrics dict as returned by evaluate_models)
+    """
+    candidates = CANDIDATES if candidates is None else candidates
+    metrics = evaluate_models(player_type, candidates, folds, n_jobs, seed)
+    logger.info(f"{player_type.title()} models ({folds}-fold CV, WAR units):")
+    logger.info(f"  {'model':<18} {'R^2':>7} {'RMSE':>7} {'MAE':>7} {'fit (s)':>8}")
+    for name, row in metrics.items():
+        logger.info(f"  {name:<18} {row['r2']:>7.3f} {row['rmse']:>7.3f} {row['mae']:>7.3f} {row['fit_sec']:>8.3f}")
+    best = next(iter(metrics))
+    transformer, features, X, y = training_matrices(player_type)
+    with span('fit', player_type=player_type, model=best):
+        model = clone(candidates[best]).fit(features, y)
+    if save:
+        _, model_path = MODEL_TARGETS[player_type]
+        save_model(model, transformer, model_path)
+        report_path = REPORT_PATH.format(player_type=player_type)
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'best': best, 'folds': folds, 'seed': seed, 'rows': len(X), 'models': metrics}, f, indent=2)
+        logger.info(f"Saved {best} {player_type} model to {model_path} (metrics in {report_path})")
+    return best, model, metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validate WAR regressors and save the best per player type.")
+    parser.add_argument('--types', nargs='+', default=list(MODEL_TARGETS), choices=list(MODEL_TARGETS))
+    parser.add_argument('--models', nargs='+', default=list(CANDIDATES), choices=list(CANDIDATES))
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS)
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Parallel fits (-1 = all cores)')
+    parser.add_argument('--dry-run', action='store_true', help='Only report the metrics, keep the saved models')
+    args = parser.parse_args()
+    configure_logging()
+    for player_type in args.types:
+        select_model(player_type, {name: CANDIDATES[name] for name in args.models}, args.folds, args.jobs,
+                     save=not args.dry_run)
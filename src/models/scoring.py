@@ -0,0 +1,51 @@
+"""
+Batch WAR scoring for lists of player names.
+- Joins the requested names to the player table once instead of scanning it per name
+- Scores every matched player with a single vectorized predict call
+- Reports names missing from the table and names with more than one row explicitly
+"""
+
+import pandas as pd
+
+STATUS_OK = 'ok'
+STATUS_NOT_FOUND = 'not_found'
+STATUS_AMBIGUOUS = 'ambiguous'
+
+
+def score_players(names, df, model, transformer):
+    """
+    Actual and predicted WAR for each name, in the order given (repeated names get the same result).
+
+    A name with several table rows is scored from its first row, as the per-player lookup does, and is
+    flagged 'ambiguous'. A name missing from the table gets NaN WAR and status 'not_found'.
+
+    Args:
+        names (iterable): Player names to score.
+        df (pd.DataFrame): Loader rows for one player type (see get_batters_df/get_pitchers_df).
+        model: Fitted estimator.
+        transformer (FeatureTransformer): Scaling the estimator was trained with.
+    Returns:
+        pd.DataFrame: Columns fullName, actual_war, predicted_war and status, one row per name.
+    """
+    names = pd.Series(list(names), dtype=object, name='fullName')
+    counts = df['fullName'].value_counts()
+    lookup = df.drop_duplicates('fullName', keep='first').set_index('fullName')
+    wanted = pd.Index(names.unique())
+    matched = wanted[wanted.isin(lookup.index)]
+    rows = lookup.loc[matched]
+
+    predicted = pd.Series(dtype=float)
+    if len(rows):
+        predicted = pd.Series(transformer.inverse_target(model.predict(transformer.transform(rows))), index=matched)
+    actual = rows[transformer.target]
+
+    status = pd.Series(STATUS_NOT_FOUND, index=names.index)
+    found = names.isin(matched)
+    status[found] = STATUS_OK
+    status[found & names.map(counts).gt(1)] = STATUS_AMBIGUOUS
+    return pd.DataFrame({
+        'fullName': names,
+        'actual_war': names.map(actual),
+        'predicted_war': names.map(predicted).astype(float),
+        'status': status,
+    })
@@ -0,0 +1,310 @@
+"""
+Resident WAR scoring service over local HTTP/JSON.
+- Keeps both models, their transformers and a per-player prediction index in memory
+- Serves single-player, batch and top-N undervalued requests without re-loading or re-normalizing anything
+- Reports p50/p99 latency and throughput per endpoint
+- Hot-reloads a model when its .joblib file changes, and rebuilds the index when the database changes
+
+Endpoints:
+    GET  /player?name=Aaron+Judge&type=batter
+    POST /batch          {"type": "batter", "names": ["Aaron Judge", ...]}
+    GET  /undervalued?type=pitcher&n=10
+    GET  /stats
+    GET  /health
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.data_access import get_player_data
+from src.models.features import FeatureTransformer, load_model
+from src.models.lookup import MODEL_PATHS
+from src.models.scoring import score_players, STATUS_NOT_FOUND
+from src.instrumentation import configure_logging
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+LATENCY_WINDOW = 10000
+# Largest n accepted by /undervalued
+MAX_UNDERVALUED = 1000
+# Player type -> (table, WAR column)
+PLAYER_TABLES = {'batter': ('batters', 'b_war'), 'pitcher': ('pitchers', 'p_war')}
+
+logger = logging.getLogger(__name__)
+
+
+def _json_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (np.integer, np.floating)):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def parse_batch_request(body):
+    """
+    Reads and validates the JSON body of a /batch request.
+
+    Args:
+        body (bytes): Request body; empty means an empty batch.
+    Returns:
+        tuple: (names, player_type)
+    Raises:
+        ValueError: If the body is not a JSON object with a list of string 'names' and a string 'type'
+            (answered with 400).
+    """
+    request = json.loads(body or b'{}')
+    if not isinstance(request, dict):
+        raise ValueError("request body must be a JSON object")
+    names = request.get('names', [])
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise ValueError("'names' must be a list of player names")
+    player_type = request.get('type', 'batter')
+    if not isinstance(player_type, str):
+        raise ValueError("type must be 'batter' or 'pitcher'")
+    return names, player_type
+
+
+# ----------------------
+# Request Metrics
+# ----------------------
+class LatencyStats:
+    """
+    Per-endpoint request counters and a sliding window of latencies for percentiles.
+    """
+    def __init__(self, window=LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._latencies = {}
+        self._counts = {}
+        self._errors = {}
+        self.started = time.time()
+
+    def record(self, endpoint, seconds, error=False):
+        with self._lock:
+            self._latencies.setdefault(endpoint, deque(maxlen=self._window)).append(seconds)
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            if error:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def summary(self):
+        with self._lock:
+            uptime = time.time() - self.started
+            endpoints = {}
+            for endpoint, latencies in self._latencies.items():
+                values = np.fromiter(latencies, dtype=float) * 1000
+                endpoints[endpoint] = {
+                    'requests': self._counts[endpoint],
+                    'errors': self._errors.get(endpoint, 0),
+                    'p50_ms': round(float(np.percentile(values, 50)), 3),
+                    'p99_ms': round(float(np.percentile(values, 99)), 3),
+                    'requests_per_sec': round(self._counts[endpoint] / uptime, 3) if uptime else None,
+                }
+            total = sum(self._counts.values())
+            return {'uptime_sec': round(uptime, 3), 'requests': total,
+                    'requests_per_sec': round(total / uptime, 3) if uptime else None, 'endpoints': endpoints}
+
+
+# ----------------------
+# Scoring State
+# ----------------------
+class ScoringService:
+    """
+    In-memory models and prediction index. Every request first checks (by file stat) whether a model file or
+    the database changed, so a retrain or a new clean run is picked up without restarting.
+    """
+    def __init__(self, model_paths=None):
+        self.model_paths = dict(model_paths or MODEL_PATHS)
+        self.player_data = get_player_data()
+        self.reloads = 0
+        self._lock = threading.Lock()
+        # Player type -> {'stamp', 'model', 'transformer', 'legacy', 'table', 'index', 'ranked'}
+        self._state = {}
+
+    def _model_stamp(self, player_type):
+        stat = os.stat(self.model_paths[player_type])
+        return stat.st_mtime_ns, stat.st_size
+
+    def _current(self, player_type):
+        """
+        Returns the up-to-date state of one player type, reloading the model and/or the index if needed.
+        """
+        if player_type not in PLAYER_TABLES:
+            raise ValueError("type must be 'batter' or 'pitcher'")
+        table, war_col = PLAYER_TABLES[player_type]
+        with self._lock:
+            state = self._state.get(player_type)
+            stamp = self._model_stamp(player_type)
+            df = self.player_data.raw(table)
+            if state is None or state['stamp'] != stamp:
+                try:
+                    model, transformer = load_model(self.model_paths[player_type])
+                except Exception as e:
+                    if state is None:
+                        raise
+                    # Most likely caught mid-write by a retrain; keep serving the loaded model and retry next request
+                    logger.warning(f"Could not reload {player_type} model from {self.model_paths[player_type]} "
+                                   f"({type(e).__name__}: {e}); serving the previous one")
+                    model = None
+                if model is not None:
+                    if state is not None:
+                        self.reloads += 1
+                        logger.info(f"Reloaded {player_type} model from {self.model_paths[player_type]}")
+                    state = {'stamp': stamp, 'model': model, 'transformer': transformer,
+                             'legacy': transformer is None, 'table': None}
+                    self._state[player_type] = state
+            if state['table'] is not df:
+                if state['legacy']:
+                    # Bare estimators carry no scaling; refit it on the current table as the offline scripts do
+                    state['transformer'] = FeatureTransformer(war_col).fit(df)
+                scored = score_players(df['fullName'].unique(), df, state['model'], state['transformer'])
+                scored['salary'] = scored['fullName'].map(df.drop_duplicates('fullName').set_index('fullName')['salary'])
+                scored['value'] = scored['predicted_war'] / scored['salary']
+                state['index'] = {row['fullName']: row for row in scored.to_dict('records')}
+                state['ranked'] = scored.dropna(subset=['value']).sort_values('value', ascending=False)
+                state['table'] = df
+            return state
+
+    def _result(self, player_type, record, name):
+        if record is None:
+            return {'fullName': name, 'type': player_type, 'actual_war': None, 'predicted_war': None,
+                    'status': STATUS_NOT_FOUND}
+        return {'fullName': name, 'type': player_type, 'actual_war': _json_value(record['actual_war']),
+                'predicted_war': _json_value(record['predicted_war']), 'status': record['status']}
+
+    def player(self, name, player_type='batter'):
+        state = self._current(player_type)
+        return self._result(player_type, state['index'].get(name), name)
+
+    def batch(self, names, player_type='batter'):
+        state = self._current(player_type)
+        index = state['index']
+        return [self._result(player_type, index.get(name), name) for name in names]
+
+    def undervalued(self, player_type='batter', n=10):
+        """
+        The `n` players with the highest predicted WAR per salary dollar.
+
+        Raises:
+            ValueError: If `n` is not between 1 and MAX_UNDERVALUED (answered with 400).
+        """
+        if not 1 <= n <= MAX_UNDERVALUED:
+            raise ValueError(f"'n' must be between 1 and {MAX_UNDERVALUED}")
+        ranked = self._current(player_type)['ranked'].head(n)
+        return [{key: _json_value(value) for key, value in row.items()} for row in ranked.to_dict('records')]
+
+    def info(self):
+        return {'reloads': self.reloads, 'data_cache': self.player_data.stats(),
+                'models': {player_type: {'path': self.model_paths[player_type], 'legacy': state['legacy'],
+                                         'players': len(state['index']) if state['table'] is not None else 0}
+                           for player_type, state in self._state.items()}}
+
+
+# ----------------------
+# HTTP Server
+# ----------------------
+def make_handler(service, stats):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        # Keep-alive, so clients can reuse one connection for many requests; without TCP_NODELAY the separate
+        # header and body writes wait on delayed ACKs (~40 ms per response)
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, method):
+            start = time.perf_counter()
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            try:
+                if method == 'GET' and url.path == '/player':
+                    if 'name' not in query:
+                        raise ValueError("missing 'name' parameter")
+                    status, payload = 200, service.player(query['name'], query.get('type', 'batter'))
+                elif method == 'POST' and url.path == '/batch':
+                    length = int(self.headers.get('Content-Length', 0))
+                    names, player_type = parse_batch_request(self.rfile.read(length))
+                    status, payload = 200, {'results': service.batch(names, player_type)}
+                elif method == 'GET' and url.path == '/undervalued':
+                    n = int(query.get('n', 10))
+                    status, payload = 200, {'results': service.undervalued(query.get('type', 'batter'), n)}
+                elif method == 'GET' and url.path == '/stats':
+                    status, payload = 200, dict(stats.summary(), **service.info())
+                elif method == 'GET' and url.path == '/health':
+                    status, payload = 200, {'status': 'ok'}
+                else:
+                    status, payload = 404, {'error': f"unknown endpoint {method} {url.path}"}
+            except ValueError as e:
+                status, payload = 400, {'error': str(e)}
+            except Exception as e:
+                status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+            self._send(status, payload)
+            if url.path != '/stats':
+                stats.record(url.path, time.perf_counter() - start, status >= 400)
+
+        def do_GET(self):
+            self._handle('GET')
+
+        def do_POST(self):
+            self._handle('POST')
+
+        def log_message(self, format, *args):
+            # Per-request access logs would dominate the console; /stats has the counters
+            pass
+
+    return ScoringHandler
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, model_paths=None):
+    """
+    Builds the HTTP server (not started). Port 0 picks a free port, see server.server_address.
+
+    Returns:
+        ThreadingHTTPServer: Server with `service` and `stats` attributes.
+    """
+    service = ScoringService(model_paths)
+    stats = LatencyStats()
+    server = ThreadingHTTPServer((host, port), make_handler(service, stats))
+    server.service = service
+    server.stats = stats
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve WAR predictions over local HTTP/JSON.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--log-level', default=None, help='DEBUG, INFO (default), WARNING or ERROR')
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+    server = create_server(args.host, args.port)
+    # Load both models and build the indexes before accepting requests
+    for player_type in PLAYER_TABLES:
+        server.service._current(player_type)
+    logger.info(f"Serving WAR predictions on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,82 +1,108 @@
 """
 Train regression models for batters and pitchers using normalized baseball stats.
-- Loads normalized data from clean_data
-- Trains linear regression models for WAR prediction
-- Saves trained models to disk
+- Loads player data through the shared data-access cache and min-max scales it with a fitted FeatureTransformer
+- Trains linear regression models for WAR prediction, or with --select picks the best of several regressors by
+  cross-validation (see model_selection.py)
+- With --incremental, updates the linear models from saved sufficient statistics, touching only changed rows
+  (see incremental.py)
+- Saves trained models to disk together with their transformer
 """
 
-
+import argparse
+import logging
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.metrics import r2_score
 from sklearn.model_selection import train_test_split
-import joblib
 import sys
 import os
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from src.data.clean_data import get_batters_df_normalized, get_pitchers_df_normalized
+from src.data.data_access import get_player_data
+from src.models.features import FeatureTransformer, save_model
+from src.instrumentation import configure_logging, count, span
+
+logger = logging.getLogger(__name__)
+
+# Player type -> (WAR column, model path)
+MODEL_TARGETS = {
+    'batters': ('b_war', "data/models/batters_model.joblib"),
+    'pitchers': ('p_war', "data/models/pitchers_model.joblib"),
+}
 
 # ----------------------
 # Model Training
 # ----------------------
-def train_models():
+def train_model(player_type, select=False, incremental=False):
     """
-    Trains linear regression models for batters and pitchers WAR prediction.
-    Loads normalized numeric data, splits into train/test, fits models, and saves them to disk.
-    
+    Trains the linear regression WAR model for one player type and saves it to disk.
+    Scales numeric data with a FeatureTransformer, splits into train/test, fits the model, and saves it
+    bundled with the transformer (column order, min/max, target scaling) needed to score new rows.
+
+    Args:
+        player_type (str): 'batters' or 'pitchers'.
+        select (bool): Cross-validate several regressors instead and save the best (see model_selection.py).
+        incremental (bool): Update the model from its saved sufficient statistics, fitted on every row
+            (see incremental.py).
     Returns:
-        None. Models are saved to 'data/models/batters_model.joblib' and 'data/models/pitchers_model.joblib'.
+        The fitted model (LinearRegression unless select is set).
     """
-    # Load normalized numeric data
-    batters_normalized_numeric = get_batters_df_normalized()
-    pitchers_normalized_numeric = get_pitchers_df_normalized()
+    if select:
+        from src.models.model_selection import select_model
+        return select_model(player_type)[1]
+    if incremental:
+        from src.models.incremental import update_model
+        return update_model(player_type)
+    war_col, model_path = MODEL_TARGETS[player_type]
+    # Fit the min-max scaling on the full table; it is saved with the model so prediction can reuse it
+    with span('load', player_type=player_type):
+        df = get_player_data().raw(player_type)
+    with span('scale', player_type=player_type):
+        transformer = FeatureTransformer(war_col).fit(df)
 
-    # -----------
-    # Batters Model
-    # -----------
-    # We'll predict 'b_war' using all other numeric columns except 'b_war' itself
-    X_batters = batters_normalized_numeric.drop(columns=['b_war'])
-    y_batters = batters_normalized_numeric['b_war']
+        # We'll predict WAR using all other numeric columns except the WAR column itself
+        X = transformer.transform(df)
+        y = transformer.transform_target(df[war_col])
 
     # Split into train and test sets
-    X_train_batters, X_test_batters, y_train_batters, y_test_batters = train_test_split(
-        X_batters, y_batters, test_size=0.2, random_state=42
-    )
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
     # Train the linear regression model
-    batters_model = LinearRegression()
-    batters_model.fit(X_train_batters, y_train_batters)
+    model = LinearRegression()
+    with span('fit', player_type=player_type, rows=len(X_train)):
+        model.fit(X_train, y_train)
+    count('training_rows', len(X_train))
 
     # Make predictions on the test set
-    predictions_batters = batters_model.predict(X_test_batters)
-
-    # -----------
-    # Pitchers Model
-    # -----------
-    # We'll predict 'p_war' using all other numeric columns except 'p_war' itself
-    X_pitchers = pitchers_normalized_numeric.drop(columns=['p_war'])
-    y_pitchers = pitchers_normalized_numeric['p_war']
-
-    # Split into train and test sets
-    X_train_pitchers, X_test_pitchers, y_train_pitchers, y_test_pitchers = train_test_split(
-        X_pitchers, y_pitchers, test_size=0.2, random_state=42
-    )
+    predictions = model.predict(X_test)
+    logger.info(f"{player_type.title()} model: test R^2 {r2_score(y_test, predictions):.3f} on {len(X_test)} rows")
 
-    # Train the linear regression model
-    pitchers_model = LinearRegression()
-    pitchers_model.fit(X_train_pitchers, y_train_pitchers)
+    with span('save_model', player_type=player_type):
+        save_model(model, transformer, model_path)
+    logger.info(f"Saved {player_type} model to {model_path}")
+    return model
 
-    # Make predictions on the test set
-    predictions_pitchers = pitchers_model.predict(X_test_pitchers)
+def train_models(select=False, incremental=False):
+    """
+    Trains linear regression models for batters and pitchers WAR prediction.
 
-    # -----------
-    # Save Models
-    # -----------
-    joblib.dump(batters_model, "data/models/batters_model.joblib")
-    joblib.dump(pitchers_model, "data/models/pitchers_model.joblib")
+    Args:
+        select (bool): Pick each player type's model by cross-validation instead (see model_selection.py).
+        incremental (bool): Update the models from their saved sufficient statistics (see incremental.py).
+    Returns:
+        None. Models are saved to 'data/models/batters_model.joblib' and 'data/models/pitchers_model.joblib'.
+    """
+    train_model('batters', select, incremental)
+    train_model('pitchers', select, incremental)
 
 if __name__ == "__main__":
-    train_models()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the WAR models for batters and pitchers.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--select', action='store_true',
+                      help='Cross-validate several regressors and save the best per player type')
+    mode.add_argument('--incremental', action='store_true',
+                      help='Update the linear models from their saved statistics, only touching changed rows')
+    args = parser.parse_args()
+    configure_logging()
+    train_models(args.select, args.incremental)
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+In-process pipeline orchestrator.
+- Stages declare the artifacts (files or directories) they read and write; dependencies follow from those artifacts
+- Fingerprints each stage's inputs and outputs in data/pipeline_state.json and skips stages whose fingerprints match
+- Runs independent stages (e.g. batter and pitcher work) in parallel threads, serializing stages that share a lock
+- Times every stage as a top-level instrumentation span, optionally under cProfile
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.instrumentation import count, profiled, span
+
+STATE_PATH = 'data/pipeline_state.json'
+DEFAULT_JOBS = 2
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """
+    One pipeline step.
+
+    Args:
+        name (str): Stage name.
+        func (callable): Runs the stage; takes no arguments.
+        inputs (tuple): Artifacts read by the stage.
+        outputs (tuple): Artifacts written by the stage. An artifact may be both an input and an output
+            (updated in place).
+        always_run (bool): Run even when fingerprints match (e.g. stages reading external data).
+        lock (str or None): Stages sharing a lock name never run at the same time.
+    """
+    def __init__(self, name, func, inputs=(), outputs=(), always_run=False, lock=None):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.always_run = always_run
+        self.lock = lock
+
+
+# ----------------------
+# Fingerprints
+# ----------------------
+def fingerprint(path):
+    """
+    Content hash of a file; for a directory, a hash of its file names, sizes and mtimes (the raw pages are too
+    large to read on every run). None if the artifact does not exist.
+    """
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                stat = os.stat(os.path.join(root, filename))
+                digest.update(f"{os.path.relpath(os.path.join(root, filename), path)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode('utf-8'))
+        return 'dir:' + digest.hexdigest()
+    if os.path.isfile(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    return None
+
+
+def load_state(path=STATE_PATH):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+# ----------------------
+# Scheduling
+# ----------------------
+def stage_dependencies(stages):
+    """
+    Maps each stage name to the earlier stages that write one of its inputs.
+    """
+    dependencies = {}
+    for i, stage in enumerate(stages):
+        dependencies[stage.name] = {
+            earlier.name for earlier in stages[:i] if set(earlier.outputs) & set(stage.inputs)
+        }
+    return dependencies
+
+
+def is_up_to_date(stage, state):
+    """
+    True if the stage ran before with the same inputs and its outputs are still what it wrote.
+    """
+    record = state.get(stage.name)
+    if stage.always_run or record is None:
+        return False
+    artifacts = dict(record['inputs'], **record['outputs'])
+    return all(fingerprint(path) == recorded for path, recorded in artifacts.items()) and \
+        set(record['inputs']) == set(stage.inputs) and set(record['outputs']) == set(stage.outputs)
+
+
+def run_pipeline(stages, jobs=DEFAULT_JOBS, force=(), state_path=STATE_PATH, profile_dir=None):
+    """
+    Runs stages as a dependency graph. A stage starts once every stage it depends on has finished (or was
+    skipped as up to date); up to `jobs` stages run at once.
+
+    Args:
+        stages (list): Stage objects in pipeline order.
+        jobs (int): Maximum stages running in parallel.
+        force (iterable): Names of stages to run even if up to date.
+        state_path (str): Fingerprint state file.
+        profile_dir (str or None): Write a cProfile dump of each stage that runs to this directory.
+    Returns:
+        dict: Stage name -> 'ran', 'skipped', 'failed' or 'not run' (a dependency failed).
+    """
+    force = set(force)
+    state = load_state(state_path)
+    dependencies = stage_dependencies(stages)
+    outcome = {}
+    held_locks = set()
+    state_lock = threading.Lock()
+
+    def execute(stage, input_prints):
+        logger.info(f"\n=== Running step: {stage.name} ===")
+        start = time.perf_counter()
+        with span(stage.name), profiled(stage.name, profile_dir):
+            stage.func()
+        # In-place artifacts are recorded as the stage left them, so the next run does not see them as changed
+        inputs = {path: (fingerprint(path) if path in stage.outputs else input_prints[path]) for path in stage.inputs}
+        outputs = {path: fingerprint(path) for path in stage.outputs}
+        with state_lock:
+            state[stage.name] = {'inputs': inputs, 'outputs': outputs, 'finished_at': time.time()}
+            # The stage that first wrote an in-place artifact should not rerun just because this stage updated it
+            for path in set(stage.inputs) & set(stage.outputs):
+                for name, record in state.items():
+                    if name != stage.name and path in record['outputs']:
+                        record['outputs'][path] = outputs[path]
+            save_state(state, state_path)
+        logger.info(f"=== Step '{stage.name}' completed in {time.perf_counter() - start:.1f}s ===\n")
+
+    pending = list(stages)
+    running = {}
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            progressed = False
+            for stage in list(pending):
+                if failed:
+                    break
+                deps = dependencies[stage.name]
+                if any(outcome.get(dep) in ('failed', 'not run') for dep in deps):
+                    outcome[stage.name] = 'not run'
+                    pending.remove(stage)
+                    progressed = True
+                    continue
+                if not all(outcome.get(dep) in ('ran', 'skipped') for dep in deps):
+                    continue
+                if stage.lock is not None and stage.lock in held_locks:
+                    continue
+                if len(running) >= max(1, jobs):
+                    break
+                pending.remove(stage)
+                progressed = True
+                if stage.name not in force and is_up_to_date(stage, state):
+                    outcome[stage.name] = 'skipped'
+                    count('stages_skipped')
+                    logger.info(f"=== Step '{stage.name}' skipped (inputs unchanged) ===")
+                    continue
+                input_prints = {path: fingerprint(path) for path in stage.inputs}
+                if stage.lock is not None:
+                    held_locks.add(stage.lock)
+                running[pool.submit(execute, stage, input_prints)] = stage
+            if not running:
+                if failed or not progressed:
+                    for stage in pending:
+                        outcome[stage.name] = 'not run'
+                    pending = []
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                held_locks.discard(stage.lock)
+                error = future.exception()
+                if error is None:
+                    outcome[stage.name] = 'ran'
+                    count('stages_run')
+                else:
+                    outcome[stage.name] = 'failed'
+                    failed = True
+                    logger.error(f"Step '{stage.name}' failed: {type(error).__name__}: {error}",
+                                 exc_info=(type(error), error, error.__traceback__))
+    return {stage.name: outcome.get(stage.name, 'not run') for stage in stages}
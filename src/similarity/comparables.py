@@ -0,0 +1,358 @@
+"""
+Comparable-player search: which players are statistically most like a given player (and cheaper).
+- Indexes the same min-max scaled feature vectors as get_*_df_normalized (every numeric column except salary),
+  with the scaling frozen at build time so inserted players are scaled the same way
+- Exact vectorized search: one matrix-vector product against precomputed squared norms per query, with the
+  salary/position filters applied as a mask (under a millisecond for ~20k players). sklearn's KD-tree answers
+  unfiltered queries a little faster, but it is static (an insert means a rebuild) and filtered queries would need
+  over-fetching
+- Queries filter by maximum salary (e.g. cheaper than the player) and primary position
+- Supports incremental inserts (amortized O(1) appends; an existing player's row is replaced in place)
+- Persists to data/processed/{player_type}_comparables.npz together with the database's fingerprint; a stale file
+  is rebuilt on load
+
+Usage:
+    python src/similarity/comparables.py "Aaron Judge" [--type batters] [-k 10] [--cheaper] [--max-salary N]
+                                         [--positions RF CF] [--rebuild]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data.clean_data import DB_PATH, numeric_columns
+from src.data.data_access import get_player_data
+from src.data.snapshot import source_fingerprint
+from src.instrumentation import configure_logging, count, span
+from src.models.features import constant_safe_maxs
+
+INDEX_PATH = 'data/processed/{player_type}_comparables.npz'
+WAR_COLUMNS = {'batters': 'b_war', 'pitchers': 'p_war'}
+# Columns kept out of the distance (salary is a filter, not a skill)
+EXCLUDED_COLUMNS = ('salary',)
+# Baseball-Reference position codes ('*8H/D': mostly CF, also pinch hitter and DH)
+POSITION_CODES = {'1': 'P', '2': 'C', '3': '1B', '4': '2B', '5': '3B', '6': 'SS', '7': 'LF', '8': 'CF', '9': 'RF',
+                  'D': 'DH', 'H': 'PH'}
+INITIAL_CAPACITY = 64
+
+logger = logging.getLogger(__name__)
+
+# player_type -> (file stamp, ComparablesIndex)
+_indexes = {}
+
+
+def primary_position(code, player_type='batters'):
+    """
+    Position a player played most, from a Baseball-Reference position code ('*6/H' -> 'SS'). Pitchers are 'P'.
+    """
+    if player_type == 'pitchers':
+        return 'P'
+    if not isinstance(code, str):
+        return ''
+    for char in code.lstrip('*'):
+        if char in POSITION_CODES:
+            return POSITION_CODES[char]
+    return ''
+
+
+class ComparablesIndex:
+    """
+    Exact nearest-neighbour index over scaled player feature vectors.
+
+    Args:
+        player_type (str): 'batters' or 'pitchers'.
+        columns (list): Feature columns, in vector order.
+        mins (np.ndarray), maxs (np.ndarray): Min-max scaling of each feature column.
+        fill (np.ndarray): Scaled value used for a missing feature (the column mean at build time).
+    """
+    def __init__(self, player_type, columns, mins, maxs, fill):
+        self.player_type = player_type
+        self.columns = list(columns)
+        self.mins = np.asarray(mins, dtype=float)
+        self.maxs = np.asarray(maxs, dtype=float)
+        self.fill = np.asarray(fill, dtype=float)
+        self.size = 0
+        self._vectors = np.empty((INITIAL_CAPACITY, len(self.columns)))
+        self._norms = np.empty(INITIAL_CAPACITY)
+        self._salary = np.empty(INITIAL_CAPACITY)
+        self._war = np.empty(INITIAL_CAPACITY)
+        self._names = np.empty(INITIAL_CAPACITY, dtype=object)
+        self._positions = np.empty(INITIAL_CAPACITY, dtype='U2')
+        self._rows = {}
+
+    # ----------------------
+    # Building
+    # ----------------------
+    @classmethod
+    def build(cls, df, player_type):
+        """
+        Fits the scaling on a loader DataFrame and indexes every row of it.
+
+        Args:
+            df (pd.DataFrame): Loader output (get_batters_df / get_pitchers_df).
+            player_type (str): 'batters' or 'pitchers'.
+        Returns:
+            ComparablesIndex
+        """
+        numeric = numeric_columns(df)
+        columns = [col for col in numeric.columns if col not in EXCLUDED_COLUMNS]
+        values = numeric[columns].to_numpy(dtype=float, na_value=np.nan)
+        mins = np.nanmin(values, axis=0) if len(values) else np.zeros(len(columns))
+        maxs = constant_safe_maxs(mins, np.nanmax(values, axis=0) if len(values) else np.ones(len(columns)))
+        scaled = (values - mins) / (maxs - mins)
+        fill = np.nan_to_num(np.nanmean(scaled, axis=0)) if len(values) else np.zeros(len(columns))
+        index = cls(player_type, columns, mins, maxs, fill)
+        index.add(df)
+        return index
+
+    def _scale(self, df):
+        values = df[self.columns].to_numpy(dtype=float, na_value=np.nan)
+        scaled = (values - self.mins) / (self.maxs - self.mins)
+        return np.where(np.isnan(scaled), self.fill, scaled)
+
+    def _reserve(self, size):
+        capacity = len(self._norms)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('_vectors', '_norms', '_salary', '_war', '_names', '_positions'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def add(self, df):
+        """
+        Inserts players (rows of a loader DataFrame). A player already in the index is replaced.
+        New rows are scaled with the build-time scaling, so values outside it scale beyond [0, 1].
+
+        Returns:
+            int: Number of new players (replaced players are not counted).
+        """
+        if df.empty:
+            return 0
+        vectors = self._scale(df)
+        names = df['fullName'].to_numpy(dtype=object)
+        salary = pd.to_numeric(df['salary'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        war = df[WAR_COLUMNS[self.player_type]].to_numpy(dtype=float, na_value=np.nan)
+        codes = df['pos'] if 'pos' in df.columns else [None] * len(df)
+        positions = np.array([primary_position(code, self.player_type) for code in codes], dtype='U2')
+
+        rows = np.empty(len(df), dtype=int)
+        added = 0
+        for i, name in enumerate(names):
+            row = self._rows.get(name)
+            if row is None:
+                row = self._rows[name] = self.size + added
+                added += 1
+            rows[i] = row
+        self._reserve(self.size + added)
+        self.size += added
+        self._vectors[rows] = vectors
+        self._norms[rows] = np.einsum('ij,ij->i', vectors, vectors)
+        self._salary[rows] = salary
+        self._war[rows] = war
+        self._names[rows] = names
+        self._positions[rows] = positions
+        count('comparables_inserted', added)
+        return added
+
+    # ----------------------
+    # Queries
+    # ----------------------
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, player_name):
+        return player_name in self._rows
+
+    def vector(self, player_name):
+        """
+        Scaled feature vector of an indexed player.
+
+        Raises:
+            KeyError: If the player is not in the index.
+        """
+        return self._vectors[self._rows[player_name]].copy()
+
+    def _mask(self, max_salary, positions, exclude):
+        mask = np.ones(self.size, dtype=bool)
+        if max_salary is not None:
+            # Players without a salary are never "cheaper"
+            mask &= self._salary[:self.size] <= max_salary
+        if positions:
+            wanted = {POSITION_CODES.get(str(position), str(position).upper()) for position in positions}
+            mask &= np.isin(self._positions[:self.size], list(wanted))
+        for name in exclude:
+            row = self._rows.get(name)
+            if row is not None:
+                mask[row] = False
+        return mask
+
+    def nearest(self, vector, k=10, max_salary=None, positions=None, exclude=()):
+        """
+        The k indexed players closest to a scaled feature vector (Euclidean distance).
+
+        Args:
+            vector (np.ndarray): Scaled features in self.columns order.
+            k (int): Number of neighbours.
+            max_salary (float or None): Only players paid at most this much.
+            positions (list or None): Only players whose primary position is one of these ('SS', 'CF' or codes).
+            exclude (iterable): Player names to leave out.
+        Returns:
+            tuple: (row positions, distances), nearest first.
+        """
+        vector = np.asarray(vector, dtype=float)
+        mask = self._mask(max_salary, positions, exclude)
+        k = min(k, int(mask.sum()))
+        if k <= 0:
+            return np.empty(0, dtype=int), np.empty(0)
+        # |x - q|^2 = |x|^2 - 2 x.q + |q|^2, with |x|^2 precomputed at insert time. Every row is scored in one
+        # pass over the contiguous matrix (cheaper than gathering the filtered rows first); filtered rows are inf
+        squared = self._norms[:self.size] - 2 * (self._vectors[:self.size] @ vector) + vector @ vector
+        squared[~mask] = np.inf
+        top = np.argpartition(squared, k - 1)[:k] if k < self.size else np.arange(self.size)
+        top = top[np.argsort(squared[top], kind='stable')]
+        return top, np.sqrt(np.maximum(squared[top], 0))
+
+    def comparables(self, player_name, k=10, cheaper=False, max_salary=None, positions=None):
+        """
+        Players most like `player_name`, optionally only cheaper ones and/or at some positions.
+
+        Args:
+            player_name (str): Indexed player to compare against.
+            k (int): Number of comparables.
+            cheaper (bool): Only players paid less than `player_name`.
+            max_salary (float or None): Only players paid at most this much.
+            positions (list or None): Only players whose primary position is one of these.
+        Returns:
+            pd.DataFrame: fullName, distance, salary, WAR and position, nearest first.
+        Raises:
+            KeyError: If the player is not in the index.
+        """
+        row = self._rows[player_name]
+        if cheaper:
+            # Strictly cheaper: the largest float below the player's salary
+            own = np.nextafter(self._salary[row], -np.inf)
+            max_salary = own if max_salary is None else min(max_salary, own)
+        rows, distances = self.nearest(self._vectors[row], k, max_salary, positions, exclude=(player_name,))
+        return pd.DataFrame({
+            'fullName': self._names[rows],
+            'distance': distances,
+            'salary': self._salary[rows],
+            WAR_COLUMNS[self.player_type]: self._war[rows],
+            'pos': self._positions[rows],
+        })
+
+    # ----------------------
+    # Persistence
+    # ----------------------
+    def save(self, path, source=None):
+        """
+        Saves the index as a .npz file (no pickled objects). `source` is the fingerprint of the database it was
+        built from, checked by load_index.
+        """
+        source = source or {}
+        np.savez(path, player_type=self.player_type, columns=np.array(self.columns, dtype=str), mins=self.mins,
+                 maxs=self.maxs, fill=self.fill, vectors=self._vectors[:self.size], salary=self._salary[:self.size],
+                 war=self._war[:self.size], names=self._names[:self.size].astype(str),
+                 positions=self._positions[:self.size],
+                 source=np.array([source.get('mtime_ns', -1), source.get('size', -1)], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns:
+            tuple: (ComparablesIndex, source fingerprint dict)
+        """
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(str(data['player_type']), data['columns'].tolist(), data['mins'], data['maxs'], data['fill'])
+            size = len(data['names'])
+            index._reserve(size)
+            index.size = size
+            index._vectors[:size] = data['vectors']
+            index._norms[:size] = np.einsum('ij,ij->i', data['vectors'], data['vectors'])
+            index._salary[:size] = data['salary']
+            index._war[:size] = data['war']
+            index._names[:size] = data['names'].tolist()
+            index._positions[:size] = data['positions']
+            mtime_ns, file_size = data['source'].tolist()
+        index._rows = {name: row for row, name in enumerate(index._names[:size])}
+        return index, {'mtime_ns': mtime_ns, 'size': file_size}
+
+
+def build_index(player_type='batters', path=None):
+    """
+    Builds the index from the player table and saves it.
+
+    Returns:
+        ComparablesIndex
+    """
+    path = path or INDEX_PATH.format(player_type=player_type)
+    source = source_fingerprint(DB_PATH)
+    with span('comparables_build', player_type=player_type):
+        index = ComparablesIndex.build(get_player_data().raw(player_type), player_type)
+        index.save(path, source)
+    logger.info(f"Indexed {len(index)} {player_type} for comparable search: {path}")
+    return index
+
+
+def load_index(player_type='batters', rebuild=False):
+    """
+    The saved index of a player type, kept in memory; rebuilt when it is missing or older than the database.
+
+    Returns:
+        ComparablesIndex
+    """
+    if player_type not in WAR_COLUMNS:
+        raise ValueError("player_type must be 'batters' or 'pitchers'")
+    path = INDEX_PATH.format(player_type=player_type)
+    source = source_fingerprint(DB_PATH)
+    cached = _indexes.get(player_type)
+    if not rebuild and cached is not None and cached[0] == source:
+        return cached[1]
+    index = None
+    if not rebuild and os.path.exists(path):
+        index, saved_source = ComparablesIndex.load(path)
+        if saved_source != source:
+            index = None
+    if index is None:
+        index = build_index(player_type, path)
+    _indexes[player_type] = (source, index)
+    return index
+
+
+def find_comparables(player_name, player_type='batters', k=10, cheaper=False, max_salary=None, positions=None):
+    """
+    Players most like `player_name` (see ComparablesIndex.comparables), from the saved index.
+    """
+    return load_index(player_type).comparables(player_name, k, cheaper, max_salary, positions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the players most like a given player.")
+    parser.add_argument('player', help='Player full name, as in the database')
+    parser.add_argument('--type', choices=sorted(WAR_COLUMNS), default='batters')
+    parser.add_argument('-k', type=int, default=10, help='Number of comparables')
+    parser.add_argument('--cheaper', action='store_true', help='Only players paid less than this player')
+    parser.add_argument('--max-salary', type=float, default=None, help='Only players paid at most this much')
+    parser.add_argument('--positions', nargs='+', default=None, help='Primary positions to keep (e.g. SS CF)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index from the database first')
+    args = parser.parse_args()
+    configure_logging()
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database '{DB_PATH}' does not exist. Please run clean_data.py first.")
+        sys.exit(1)
+    index = load_index(args.type, rebuild=args.rebuild)
+    if args.player not in index:
+        print(f"'{args.player}' is not in the {args.type} table.")
+        sys.exit(1)
+    result = index.comparables(args.player, args.k, args.cheaper, args.max_salary, args.positions)
+    print(result.to_string(index=False))
@@ -0,0 +1,70 @@
+"""
+Frozen copy of the baseline extraction logic (the BeautifulSoup parse inside the original get_dataframes).
+- Parses the whole page, then reads salary and the season rows exactly as the baseline did
+- Prints and DataFrame building are left out; the extracted values are returned instead
+- Do not refactor this onto the helpers in src/data/extract.py: it is the reference the extractor is checked against
+"""
+
+import re
+from bs4 import BeautifulSoup
+
+
+def _amount(text):
+    if text.endswith('M'):
+        return float(text[:-1]) * 1_000_000
+    elif text.endswith('k'):
+        return float(text[:-1]) * 1_000
+    elif text.endswith('B'):
+        return float(text[:-1]) * 1_000_000_000
+    return float(text)
+
+
+def baseline_extract(html_content, player_name, seasons=('2024',)):
+    """
+    Returns:
+        tuple: (salary, {'pitching': {season: dict}, 'batting': {season: dict}}). A season is missing when the
+        baseline would have printed "row not found".
+    """
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    salary = 0
+    meta = soup.find(id="meta")
+    if meta:
+        for p in meta.find_all("p"):
+            if "Contract Status" in p.text:
+                contract_text = p.text
+                contract_match = re.search(r'(\d+) yr[s]?/\$(\d+\.?\d*[MBk]?)', contract_text)
+                if contract_match:
+                    years = int(contract_match.group(1))
+                    salary = _amount(contract_match.group(2)) / years
+                else:
+                    salary_match = re.search(r'\$(\d+\.?\d*[MBk]?)', contract_text)
+                    if salary_match:
+                        salary = _amount(salary_match.group(1))
+                    else:
+                        salary = 0
+
+    rows = {'pitching': {}, 'batting': {}}
+    for table in ('pitching', 'batting'):
+        div = soup.find(id=f"div_players_standard_{table}")
+        if not div:
+            continue
+        for season in seasons:
+            row = div.find(id=f"players_standard_{table}.{season}")
+            if not row:
+                continue
+            stats_dict = {}
+            stats_dict['fullName'] = player_name
+            year_th = row.find("th", {"data-stat": "year_id"})
+            if year_th:
+                year = year_th.text.strip()
+            else:
+                year = None
+            stats_dict["year"] = year
+            for cell in row.find_all("td"):
+                stat_name = cell.get("data-stat")
+                stat_value = cell.text.strip()
+                stats_dict[stat_name] = stat_value
+            stats_dict['salary'] = salary
+            rows[table][season] = stats_dict
+    return salary, rows
@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@pytest.fixture
+def mlb_people():
+    """
+    Saved MLB stats API `people` payload (fullName, lastName, nameSlug), as returned by get_active_people.
+    """
+    with open(os.path.join(FIXTURES, 'mlb_people.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)['people']
+
+
+# ----------------------
+# Local HTTP Server
+# ----------------------
+class LocalServer:
+    """
+    Stand-in for a web server on 127.0.0.1. Each path answers from a handler function
+    `handler(request_headers) -> (status, headers, body)`; unknown paths are 404. Every request is logged
+    in `requests` as (monotonic time, path, headers).
+    """
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append((time.monotonic(), self.path, dict(self.headers)))
+                route = server.routes.get(self.path)
+                status, headers, body = route(self.headers) if route else (404, {}, 'Page Not Found (404 error)')
+                data = body.encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def paths(self):
+        with self._lock:
+            return [path for _, path, _ in self.requests]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    server = LocalServer()
+    yield server
+    server.close()
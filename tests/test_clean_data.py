@@ -0,0 +1,108 @@
+"""
+Incremental cleaning (src/data/clean_data.py): what a rerun leaves untouched in the database every later pipeline
+stage fingerprints.
+"""
+
+import os
+import re
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic import player_page
+from src.data.clean_data import DB_PATH, PARSE_CACHE_PATH, PARSE_CACHE_TABLE, get_dataframes, load_parse_cache
+from src.data.db import close_connections, write_connection
+from src.data.load_data import raw_path
+from src.data.snapshot import META_FILE, SNAPSHOT_DIR
+from src.pipeline import fingerprint
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/raw')
+    for name, html in [player_page(i, page_kb=1) for i in range(8)]:
+        with open(raw_path(name), 'w', encoding='utf-8') as f:
+            f.write(html)
+    yield tmp_path
+    close_connections()
+
+
+def artifacts():
+    """
+    What the pipeline and the snapshot staleness check see of the database, plus the snapshot meta files.
+    """
+    stat = os.stat(DB_PATH)
+    metas = {}
+    for name in ('batters', 'pitchers'):
+        with open(os.path.join(SNAPSHOT_DIR, name, META_FILE), 'rb') as f:
+            metas[name] = f.read()
+    return fingerprint(DB_PATH), stat.st_mtime_ns, stat.st_size, metas
+
+
+def table_names(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+
+
+def touch(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_parse_cache_lives_outside_the_stats_database(workspace):
+    get_dataframes(workers=1)
+    assert PARSE_CACHE_TABLE not in table_names(DB_PATH)
+    assert PARSE_CACHE_TABLE in table_names(PARSE_CACHE_PATH)
+
+
+def test_touched_files_leave_the_database_unchanged(workspace):
+    get_dataframes(workers=1)
+    before = artifacts()
+    for filename in os.listdir('data/raw'):
+        touch(os.path.join('data/raw', filename))
+    get_dataframes(workers=1)
+    assert artifacts() == before
+    # The touched files were restamped in the parse cache, so the next scan does not hash them again
+    conn = write_connection(PARSE_CACHE_PATH)
+    cache = load_parse_cache(conn)
+    conn.close()
+    for file, cached in cache.items():
+        assert cached['mtime'] == os.stat(file).st_mtime
+
+
+def test_changed_file_updates_the_database(workspace):
+    get_dataframes(workers=1)
+    before = artifacts()
+    name, html = player_page(3, page_kb=1)
+    with open(raw_path(name), 'w', encoding='utf-8') as f:
+        f.write(re.sub(r'data-stat="b_games" >(\d+)', lambda m: f'data-stat="b_games" >{int(m.group(1)) + 1}', html))
+    touch(raw_path(name))
+    get_dataframes(workers=1)
+    assert artifacts()[0] != before[0]
+
+
+def test_missing_database_is_rebuilt_from_the_cache(workspace):
+    get_dataframes(workers=1)
+    with open('data/processed/batters.csv', 'rb') as f:
+        batters = f.read()
+    close_connections()
+    os.remove(DB_PATH)
+    get_dataframes(workers=1)
+    assert {'batters', 'pitchers'} <= table_names(DB_PATH)
+    with open('data/processed/batters.csv', 'rb') as f:
+        assert f.read() == batters
+
+
+def test_legacy_parse_cache_table_is_dropped(workspace):
+    os.makedirs('data/processed')
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute(f"CREATE TABLE {PARSE_CACHE_TABLE} (file TEXT PRIMARY KEY)")
+    conn.commit()
+    conn.close()
+    get_dataframes(workers=1)
+    assert PARSE_CACHE_TABLE not in table_names(DB_PATH)
+    assert {'batters', 'pitchers'} <= table_names(DB_PATH)
@@ -0,0 +1,58 @@
+"""
+Parity of the fragment extractor with the baseline full-page BeautifulSoup parse (tests/baseline_extract.py).
+- A sample of the real pages in data/raw (every SAMPLE_EVERY-th file plus the largest pages)
+- Synthetic pages covering traded players, missing seasons, two-way players and commented-out markup
+"""
+
+import os
+import re
+
+import pytest
+
+from benchmarks.synthetic import player_page
+from src.data.extract import STATS_SEASON, extract_player_stats
+from tests.baseline_extract import baseline_extract
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
+SAMPLE_EVERY = 40
+LARGEST = 3
+
+
+def raw_sample():
+    if not os.path.isdir(RAW_DIR):
+        return []
+    files = sorted(f for f in os.listdir(RAW_DIR) if f.endswith('.html'))
+    largest = sorted(files, key=lambda f: os.path.getsize(os.path.join(RAW_DIR, f)), reverse=True)[:LARGEST]
+    return sorted(set(files[::SAMPLE_EVERY]) | set(largest))
+
+
+def page_seasons(html, table):
+    """
+    Every season id of a table on the page, in page order (the baseline looks each one up).
+    """
+    return list(dict.fromkeys(re.findall(rf'id="players_standard_{table}\.(\d{{4}})"', html)))
+
+
+def assert_matches_baseline(html, player_name):
+    seasons = sorted(set(page_seasons(html, 'pitching')) | set(page_seasons(html, 'batting')) | {STATS_SEASON})
+    salary, rows = baseline_extract(html, player_name, seasons)
+    record = extract_player_stats(html, player_name)
+    assert record['salary'] == salary
+    for table in ('pitching', 'batting'):
+        assert record[table] == rows[table].get(STATS_SEASON)
+        expected = [rows[table][season] for season in page_seasons(html, table) if season in rows[table]]
+        assert record[f'{table}_seasons'] == expected
+
+
+@pytest.mark.parametrize('filename', raw_sample())
+def test_real_pages_match_baseline(filename):
+    with open(os.path.join(RAW_DIR, filename), 'r', encoding='utf-8') as f:
+        html = f.read()
+    assert_matches_baseline(html, filename[:-len('.html')])
+
+
+@pytest.mark.parametrize('i', range(40))
+def test_synthetic_pages_match_baseline(i):
+    name, html = player_page(i, seasons=6, page_kb=4)
+    assert_matches_baseline(html, name)
+
@@ -0,0 +1,51 @@
+"""
+Model files saved by src/models/features.py.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.models import features
+from src.models.features import FeatureTransformer, load_model, save_model
+
+
+@pytest.fixture
+def fitted():
+    df = pd.DataFrame({'fullName': ['A', 'B', 'C'], 'b_hr': [1.0, 5.0, 9.0], 'b_war': [0.5, 2.0, 4.0]})
+    transformer = FeatureTransformer('b_war').fit(df)
+    model = LinearRegression().fit(transformer.transform(df), transformer.transform_target(df['b_war']))
+    return model, transformer
+
+
+def test_save_model_replaces_the_file(tmp_path, fitted):
+    path = str(tmp_path / 'batters_model.joblib')
+    model, transformer = fitted
+    save_model(model, transformer, path)
+    save_model(model, transformer, path)
+    loaded, loaded_transformer = load_model(path)
+    assert loaded.coef_.tolist() == model.coef_.tolist()
+    assert loaded_transformer.to_dict() == transformer.to_dict()
+    assert os.listdir(tmp_path) == ['batters_model.joblib']
+
+
+def test_failed_save_keeps_the_previous_model(tmp_path, fitted, monkeypatch):
+    path = str(tmp_path / 'batters_model.joblib')
+    model, transformer = fitted
+    save_model(model, transformer, path)
+    with open(path, 'rb') as f:
+        before = f.read()
+
+    def partial_dump(value, filename):
+        with open(filename, 'wb') as f:
+            f.write(before[:10])
+        raise OSError("disk full")
+
+    monkeypatch.setattr(features.joblib, 'dump', partial_dump)
+    with pytest.raises(OSError):
+        save_model(model, transformer, path)
+    with open(path, 'rb') as f:
+        assert f.read() == before
+    assert os.listdir(tmp_path) == ['batters_model.joblib']
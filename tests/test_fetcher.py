@@ -0,0 +1,136 @@
+"""
+Rate limiting and concurrent fetching (src/data/fetcher.py), against a local HTTP server.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.data.fetcher import ConcurrentFetcher, HostRateLimiter, TokenBucket
+
+# Scheduling slack allowed on every timing assertion
+SLACK = 0.02
+
+
+def ok(body='<html>page</html>'):
+    return lambda headers: (200, {}, body)
+
+
+# ----------------------
+# Token Bucket
+# ----------------------
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_token_bucket_spaces_concurrent_callers():
+    rate = 20
+    bucket = TokenBucket(rate, capacity=1)
+    times = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(3):
+            bucket.acquire()
+            with lock:
+                times.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    times.sort()
+    # The first token is available at once and the k-th one no earlier than k/rate after the start. (Gaps between
+    # neighbours are not checked: a caller that wakes up late shortens the gap after it.)
+    assert times[0] - start < 0.5
+    assert all(t - start >= k / rate - SLACK for k, t in enumerate(times))
+
+
+def test_token_bucket_allows_burst_after_idle():
+    bucket = TokenBucket(10, capacity=3)
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=SLACK)
+    assert time.monotonic() - start >= 0.1 - SLACK
+
+
+def test_token_bucket_pause_delays_next_reservation():
+    bucket = TokenBucket(100, capacity=1)
+    bucket.acquire()
+    bucket.pause(0.3)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.3 - SLACK
+
+
+def test_host_rate_limiter_shares_one_bucket_per_host():
+    limiter = HostRateLimiter(rate=1)
+    assert limiter.bucket_for('http://a.example/x') is limiter.bucket_for('http://a.example/y')
+    assert limiter.bucket_for('http://a.example/x') is not limiter.bucket_for('http://b.example/x')
+
+
+# ----------------------
+# Concurrent Fetcher
+# ----------------------
+def test_fetch_many_returns_every_item(http_server):
+    for i in range(6):
+        http_server.routes[f'/p{i}'] = ok(f'page {i}')
+    fetcher = ConcurrentFetcher(max_workers=3, rate=200)
+    results = {key: (response, error) for key, response, error in
+               fetcher.fetch_many([(i, http_server.url(f'/p{i}')) for i in range(6)])}
+    fetcher.close()
+    assert sorted(results) == list(range(6))
+    assert all(error is None and response.text == f'page {key}' for key, (response, error) in results.items())
+    assert fetcher.stats.pages == 6 and fetcher.stats.errors == 0
+
+
+def test_fetch_many_yields_connection_errors(http_server):
+    fetcher = ConcurrentFetcher(max_workers=2, rate=200, timeout=2)
+    # Nothing listens on port 9 of 127.0.0.1 (discard), so the connection is refused
+    results = list(fetcher.fetch_many([('down', 'http://127.0.0.1:9/page')]))
+    fetcher.close()
+    (key, response, error), = results
+    assert key == 'down' and response is None and error is not None
+    assert fetcher.stats.errors == 1
+
+
+def test_fetch_many_is_rate_limited_per_host(http_server):
+    rate = 20
+    for i in range(5):
+        http_server.routes[f'/p{i}'] = ok()
+    fetcher = ConcurrentFetcher(max_workers=5, rate=rate)
+    start = time.monotonic()
+    list(fetcher.fetch_many([(i, http_server.url(f'/p{i}')) for i in range(5)]))
+    fetcher.close()
+    times = sorted(t for t, _, _ in http_server.requests)
+    assert all(t - start >= k / rate - SLACK for k, t in enumerate(times))
+
+
+def test_429_pauses_the_host(http_server):
+    answers = iter([(429, {'Retry-After': '1'}, 'slow down')])
+    http_server.routes['/busy'] = lambda headers: next(answers, (200, {}, 'ok'))
+    fetcher = ConcurrentFetcher(max_workers=1, rate=100)
+    assert fetcher.fetch(http_server.url('/busy')).status_code == 429
+    start = time.monotonic()
+    assert fetcher.fetch(http_server.url('/busy')).status_code == 200
+    fetcher.close()
+    assert time.monotonic() - start >= 1 - SLACK
+
+
+def test_stopping_fetch_many_cancels_queued_fetches(http_server):
+    for i in range(20):
+        http_server.routes[f'/p{i}'] = ok()
+    fetcher = ConcurrentFetcher(max_workers=2, rate=10)
+    results = fetcher.fetch_many([(i, http_server.url(f'/p{i}')) for i in range(20)])
+    start = time.monotonic()
+    next(results)
+    results.close()
+    fetcher.close()
+    # Only fetches already holding a worker finish; the other 17+ are never requested
+    assert time.monotonic() - start < 1.0
+    assert len(http_server.requests) <= 4
@@ -0,0 +1,66 @@
+"""
+Incremental training state of the linear WAR models (src/models/incremental.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.models.incremental import (build_state, column_extrema, load_state, save_state, state_model,
+                                    update_state)
+
+
+def table(seed, n=40):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'fullName': [f'Player {i}' for i in range(n)],
+                       'b_hr': rng.integers(0, 30, n).astype(float), 'b_ops': rng.random(n).round(2)})
+    df['b_war'] = df['b_hr'] / 10 + 2 * df['b_ops'] + rng.normal(0, 0.1, n)
+    return df
+
+
+def assert_matches_refit(state, df):
+    Z = df[state['columns'] + [state['target']]].to_numpy(dtype=float)
+    for name, values in column_extrema(Z).items():
+        assert state['extrema'][name].tolist() == values.tolist(), name
+    model, transformer = state_model(state)
+    refit = LinearRegression().fit(transformer.transform(df), transformer.transform_target(df['b_war']))
+    assert model.coef_ == pytest.approx(refit.coef_, abs=1e-9)
+    assert model.intercept_ == pytest.approx(refit.intercept_, abs=1e-9)
+
+
+def test_update_tracks_extrema_without_rescanning_the_rows():
+    df = table(0)
+    state = build_state(df, 'b_war')
+    # The only row at the max leaves, another row sets a new min, a new player ties the max of b_ops
+    top = df['b_hr'].idxmax()
+    df = df.drop(index=df.index[df['b_hr'] == df.loc[top, 'b_hr']]).reset_index(drop=True)
+    df.loc[3, 'b_ops'] = -0.5
+    df = pd.concat([df, pd.DataFrame({'fullName': ['New Player'], 'b_hr': [5.0],
+                                      'b_ops': [df['b_ops'].max()], 'b_war': [1.0]})], ignore_index=True)
+    assert update_state(state, df)['added'] == 1
+    assert_matches_refit(state, df)
+
+
+def test_repeated_updates_match_a_refit():
+    df = table(1)
+    state = build_state(df, 'b_war')
+    for seed in range(2, 6):
+        changed = table(seed)
+        # Half the players keep their rows, the rest change; a few leave
+        df = pd.concat([df.iloc[:20], changed.iloc[20:35]], ignore_index=True)
+        update_state(state, df)
+        assert_matches_refit(state, df)
+
+
+def test_saved_state_keeps_extrema(tmp_path):
+    df = table(0)
+    state = build_state(df, 'b_war')
+    path = tmp_path / 'stats.npz'
+    save_state(state, path)
+    loaded = load_state(path)
+    for name, values in state['extrema'].items():
+        assert loaded['extrema'][name].tolist() == values.tolist()
+    df = df.iloc[5:].reset_index(drop=True)
+    update_state(loaded, df)
+    assert_matches_refit(loaded, df)
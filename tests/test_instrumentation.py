@@ -0,0 +1,45 @@
+"""
+Per-span memory peaks recorded by the instrumentation Recorder.
+"""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.instrumentation import SAMPLE_SECONDS, Recorder, current_rss_mb
+
+pytestmark = pytest.mark.skipif(current_rss_mb() is None, reason="needs /proc")
+
+ALLOCATION_MB = 200
+
+
+def spans_by_name(recorder):
+    return {span['name']: span for span in recorder.report()['spans']}
+
+
+def test_span_peak_includes_memory_freed_before_it_ends():
+    recorder = Recorder()
+    with recorder.span('heavy'):
+        block = bytearray(ALLOCATION_MB * 1024 * 1024)
+        time.sleep(SAMPLE_SECONDS * 4)
+        del block
+    with recorder.span('light'):
+        time.sleep(SAMPLE_SECONDS * 2)
+    spans = spans_by_name(recorder)
+    assert spans['heavy']['peak_rss_mb'] >= spans['heavy']['rss_mb'] + ALLOCATION_MB * 0.8
+    # A later span reports its own peak, not the process high-water mark
+    assert spans['light']['peak_rss_mb'] < spans['heavy']['peak_rss_mb'] - ALLOCATION_MB * 0.8
+
+
+def test_span_counts_child_processes():
+    recorder = Recorder()
+    code = f"import time; block = bytearray({ALLOCATION_MB} * 1024 * 1024); time.sleep({SAMPLE_SECONDS * 4})"
+    with recorder.span('workers'):
+        subprocess.run([sys.executable, '-c', code], check=True)
+    with recorder.span('after'):
+        pass
+    spans = spans_by_name(recorder)
+    assert spans['workers']['children_peak_rss_mb'] >= ALLOCATION_MB
+    assert not spans['after']['children_peak_rss_mb']
@@ -0,0 +1,203 @@
+"""
+Fetch manifest (src/data/manifest.py): retry backoff, failed-player selection and conditional requests,
+the latter end to end through save_response against a local HTTP server.
+"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.data import manifest as manifest_module
+from src.data.fetcher import ConcurrentFetcher
+from src.data.load_data import RawPages, raw_path, save_response
+from src.data.manifest import (BACKOFF_BASE, BACKOFF_MAX, STATUS_ERROR, STATUS_NOT_FOUND, STATUS_NOT_MODIFIED,
+                               STATUS_OK, FetchManifest, content_hash)
+
+PAGE = '<html><h1><span>Aaron Judge</span></h1>stats</html>'
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = FetchManifest(str(tmp_path / 'fetch_manifest.db'))
+    yield manifest
+    manifest.close()
+
+
+class Clock:
+    """
+    Stand-in for the manifest module's clock (only its `time` module is replaced, not the global one).
+    """
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(manifest_module, 'time', SimpleNamespace(time=clock))
+    return clock
+
+
+# ----------------------
+# Backoff
+# ----------------------
+def test_backoff_doubles_per_attempt_up_to_the_cap(manifest, clock):
+    delays = []
+    for _ in range(12):
+        manifest.record_failure('Aaron Judge', 'http://x/judgeaa01.shtml', STATUS_ERROR, 'HTTP 503')
+        entry = manifest.get('Aaron Judge')
+        delays.append(entry['next_retry_at'] - entry['fetched_at'])
+    assert delays[:4] == [BACKOFF_BASE, 2 * BACKOFF_BASE, 4 * BACKOFF_BASE, 8 * BACKOFF_BASE]
+    assert all(later >= earlier for earlier, later in zip(delays, delays[1:]))
+    assert max(delays) == BACKOFF_MAX
+    assert delays[-1] == BACKOFF_MAX
+    assert manifest.get('Aaron Judge')['attempts'] == 12
+    assert manifest.get('Aaron Judge')['last_error'] == 'HTTP 503'
+
+
+def test_success_resets_attempts(manifest, clock, http_server):
+    http_server.routes['/judge'] = lambda headers: (200, {'ETag': '"v1"'}, PAGE)
+    manifest.record_failure('Aaron Judge', None, STATUS_ERROR, 'timeout')
+    manifest.record_failure('Aaron Judge', None, STATUS_ERROR, 'timeout')
+    fetcher = ConcurrentFetcher(rate=100)
+    response = fetcher.fetch(http_server.url('/judge'))
+    fetcher.close()
+    manifest.record_success('Aaron Judge', http_server.url('/judge'), response, content_hash(response.text))
+    entry = manifest.get('Aaron Judge')
+    assert (entry['status'], entry['attempts'], entry['next_retry_at'], entry['last_error']) == (STATUS_OK, 0, None, None)
+    manifest.record_failure('Aaron Judge', None, STATUS_ERROR, 'timeout')
+    assert manifest.get('Aaron Judge')['next_retry_at'] - clock.now == BACKOFF_BASE
+
+
+# ----------------------
+# Failed Players
+# ----------------------
+def test_failed_players_due_only(manifest, clock):
+    manifest.record_failure('Aaron Judge', None, STATUS_ERROR, 'timeout')
+    manifest.record_failure('Shohei Ohtani', None, STATUS_NOT_FOUND, 'Page Not Found (404 error)')
+    for _ in range(3):
+        manifest.record_failure('Juan Soto', None, STATUS_ERROR, 'timeout')
+
+    assert manifest.failed_players() == []
+    assert sorted(manifest.failed_players(due_only=False)) == ['Aaron Judge', 'Juan Soto', 'Shohei Ohtani']
+
+    # One attempt waits BACKOFF_BASE, three attempts four times as long
+    clock.now += BACKOFF_BASE
+    assert sorted(manifest.failed_players()) == ['Aaron Judge', 'Shohei Ohtani']
+    clock.now += 3 * BACKOFF_BASE
+    assert sorted(manifest.failed_players()) == ['Aaron Judge', 'Juan Soto', 'Shohei Ohtani']
+
+
+def test_failed_players_excludes_fetched_pages(manifest, clock):
+    manifest.record_failure('Aaron Judge', None, STATUS_ERROR, 'timeout')
+    manifest.conn.execute("INSERT INTO fetches (player, status) VALUES ('Juan Soto', ?)", (STATUS_OK,))
+    manifest.conn.execute("INSERT INTO fetches (player, status) VALUES ('Shohei Ohtani', ?)", (STATUS_NOT_MODIFIED,))
+    clock.now += BACKOFF_MAX
+    assert manifest.failed_players() == ['Aaron Judge']
+    assert manifest.failed_players(due_only=False) == ['Aaron Judge']
+
+
+def test_manifest_persists_across_instances(tmp_path, clock):
+    path = str(tmp_path / 'fetch_manifest.db')
+    manifest = FetchManifest(path)
+    manifest.record_failure('Aaron Judge', None, STATUS_ERROR, 'timeout')
+    manifest.close()
+    reopened = FetchManifest(path)
+    assert reopened.failed_players(due_only=False) == ['Aaron Judge']
+    reopened.close()
+
+
+# ----------------------
+# Conditional Requests
+# ----------------------
+def validating_route(etag='"v1"', last_modified='Tue, 01 Oct 2024 00:00:00 GMT', body=PAGE):
+    """
+    Answers 304 when the request carries the current validators, otherwise the page with them.
+    """
+    def route(headers):
+        if headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, ''
+        return 200, {'ETag': etag, 'Last-Modified': last_modified}, body
+    return route
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/raw')
+    return tmp_path
+
+
+def test_unfetched_page_has_no_conditional_headers(manifest):
+    assert manifest.conditional_headers('Aaron Judge') is None
+    manifest.record_failure('Aaron Judge', None, STATUS_ERROR, 'timeout')
+    assert manifest.conditional_headers('Aaron Judge') is None
+
+
+def test_304_leaves_the_saved_page_alone(workspace, manifest, http_server):
+    http_server.routes['/judge'] = validating_route()
+    url = http_server.url('/judge')
+    fetcher = ConcurrentFetcher(rate=100)
+
+    response = fetcher.fetch(url)
+    assert save_response(manifest, 'Aaron Judge', url, response, None) == 'downloaded'
+    with open(raw_path('Aaron Judge'), 'r', encoding='utf-8') as f:
+        assert f.read() == PAGE
+    mtime = os.stat(raw_path('Aaron Judge')).st_mtime_ns
+
+    headers = manifest.conditional_headers('Aaron Judge')
+    assert headers == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Tue, 01 Oct 2024 00:00:00 GMT'}
+    response = fetcher.fetch(url, headers)
+    fetcher.close()
+    assert response.status_code == 304
+    assert http_server.requests[-1][2].get('If-None-Match') == '"v1"'
+    assert save_response(manifest, 'Aaron Judge', url, response, None) == 'unchanged'
+
+    assert os.stat(raw_path('Aaron Judge')).st_mtime_ns == mtime
+    entry = manifest.get('Aaron Judge')
+    assert entry['status'] == STATUS_NOT_MODIFIED
+    assert entry['content_hash'] == content_hash(PAGE)
+    assert entry['etag'] == '"v1"'
+
+
+def test_server_ignoring_validators_is_caught_by_content_hash(workspace, manifest, http_server):
+    http_server.routes['/judge'] = lambda headers: (200, {}, PAGE)
+    url = http_server.url('/judge')
+    fetcher = ConcurrentFetcher(rate=100)
+    assert save_response(manifest, 'Aaron Judge', url, fetcher.fetch(url), None) == 'downloaded'
+    assert save_response(manifest, 'Aaron Judge', url, fetcher.fetch(url), None) == 'unchanged'
+    # Without a saved copy the page is written again
+    os.remove(raw_path('Aaron Judge'))
+    assert save_response(manifest, 'Aaron Judge', url, fetcher.fetch(url), None) == 'downloaded'
+    fetcher.close()
+    assert RawPages().has_page('Aaron Judge')
+
+
+def test_changed_page_is_downloaded_again(workspace, manifest, http_server):
+    http_server.routes['/judge'] = validating_route()
+    url = http_server.url('/judge')
+    fetcher = ConcurrentFetcher(rate=100)
+    save_response(manifest, 'Aaron Judge', url, fetcher.fetch(url), None)
+    http_server.routes['/judge'] = validating_route(etag='"v2"', body=PAGE + 'new season')
+    response = fetcher.fetch(url, manifest.conditional_headers('Aaron Judge'))
+    fetcher.close()
+    assert response.status_code == 200
+    assert save_response(manifest, 'Aaron Judge', url, response, None) == 'downloaded'
+    with open(raw_path('Aaron Judge'), 'r', encoding='utf-8') as f:
+        assert f.read().endswith('new season')
+    assert manifest.get('Aaron Judge')['etag'] == '"v2"'
+
+
+def test_404_and_errors_are_recorded_as_failures(workspace, manifest, http_server):
+    fetcher = ConcurrentFetcher(rate=100)
+    url = http_server.url('/missing')
+    assert save_response(manifest, 'Aaron Judge', url, fetcher.fetch(url), None) == 'failed'
+    fetcher.close()
+    assert manifest.get('Aaron Judge')['status'] == STATUS_NOT_FOUND
+    assert save_response(manifest, 'Juan Soto', url, None, ConnectionError('refused')) == 'failed'
+    assert manifest.get('Juan Soto')['status'] == STATUS_ERROR
+    assert not os.path.exists(raw_path('Aaron Judge'))
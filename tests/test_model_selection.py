@@ -0,0 +1,56 @@
+"""
+Cross-validation inputs of model selection (src/models/model_selection.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.models import model_selection
+
+
+class StubPlayerData:
+    def __init__(self, df):
+        self.df = df
+
+    def raw(self, player_type):
+        return self.df
+
+
+@pytest.fixture
+def batters(monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'fullName': [f'Player {i}' for i in range(50)],
+                       'b_hr': rng.integers(0, 50, 50), 'b_ops': rng.random(50)})
+    # One extreme player, so a scaler fitted on every row would squeeze the others
+    df.loc[7, 'b_hr'] = 500
+    df['b_war'] = df['b_hr'] / 10 + df['b_ops']
+    monkeypatch.setattr(model_selection, 'get_player_data', lambda: StubPlayerData(df))
+    monkeypatch.setattr(model_selection, '_fold_matrices', {})
+    return df
+
+
+def test_fold_scaling_is_fitted_on_training_rows_only(batters):
+    splits = model_selection.fold_indices(len(batters), 5, 42)
+    matrices = model_selection.fold_matrices('batters', 5, 42)
+    assert len(matrices) == 5
+    for (train, test), (X_train, y_train, X_test, actual_war, transformer) in zip(splits, matrices):
+        assert transformer.mins.tolist() == batters.iloc[train][['b_hr', 'b_ops']].min().tolist()
+        assert transformer.target_max == batters['b_war'].iloc[train].max()
+        assert X_train.min() == 0 and X_train.max() == 1
+        assert actual_war.tolist() == batters['b_war'].iloc[test].tolist()
+        if 7 in test:
+            # The held-out extreme player falls outside the range learned from the training rows
+            assert X_test[list(test).index(7), 0] > 1
+
+
+def test_fold_matrices_are_cached_per_table(batters):
+    assert model_selection.fold_matrices('batters', 5, 42) is model_selection.fold_matrices('batters', 5, 42)
+
+
+def test_evaluate_models_reports_errors_in_war(batters):
+    metrics = model_selection.evaluate_models('batters', {'linear': LinearRegression()}, folds=5, n_jobs=1)
+    # b_war is linear in the features, so every fold's predictions are exact once mapped back to WAR
+    assert metrics['linear']['rmse'] == pytest.approx(0, abs=1e-9)
+    assert metrics['linear']['r2'] == pytest.approx(1)
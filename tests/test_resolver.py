@@ -0,0 +1,150 @@
+"""
+Offline tests for the Baseball-Reference ID resolver against a saved MLB `people` payload.
+"""
+
+import pytest
+
+from src.data.resolver import PlayerResolver, id_stem, name_tokens, split_suffix, verify_page
+
+
+def page(header, player_id=None):
+    canonical = ''
+    if player_id:
+        canonical = (f'<link rel="canonical" href="https://www.baseball-reference.com/players/{player_id[0]}/'
+                     f'{player_id}.shtml">')
+    return f'<html><head>{canonical}</head><body><div id="meta"><div><h1>\n<span>{header}</span>\n</h1></div></div>'
+
+
+@pytest.fixture
+def resolver(tmp_path, mlb_people):
+    resolver = PlayerResolver(str(tmp_path / 'player_index.json'))
+    resolver.build(mlb_people)
+    return resolver
+
+
+# ----------------------
+# Name Normalization
+# ----------------------
+def test_name_tokens_strip_accents_and_punctuation():
+    assert name_tokens('José Ramírez') == ['jose', 'ramirez']
+    assert name_tokens('J.D. Martinez') == ['jd', 'martinez']
+    assert name_tokens("Logan O'Hoppe") == ['logan', 'ohoppe']
+    assert name_tokens('AJ Smith-Shawver') == ['aj', 'smith', 'shawver']
+    # UTF-8 decoded as Latin-1 on some saved pages
+    assert name_tokens('JosÃ© RamÃ­rez') == ['jose', 'ramirez']
+
+
+def test_split_suffix():
+    assert split_suffix(['bobby', 'witt', 'jr']) == (['bobby', 'witt'], 'jr')
+    assert split_suffix(['ken', 'griffey', 'iii']) == (['ken', 'griffey'], 'iii')
+    assert split_suffix(['aaron', 'judge']) == (['aaron', 'judge'], None)
+    # A lone token is a name, not a suffix
+    assert split_suffix(['v']) == (['v'], None)
+
+
+def test_id_stem():
+    assert id_stem(['aaron'], ['judge']) == 'judgeaa'
+    assert id_stem(['elly'], ['de', 'la', 'cruz']) == 'delacel'
+    assert id_stem(['aj'], ['smith', 'shawver']) == 'smithaj'
+
+
+# ----------------------
+# Building From the API Payload
+# ----------------------
+@pytest.mark.parametrize('name, stem, mlb_id, suffix', [
+    ('Aaron Judge', 'judgeaa', '592450', None),
+    ('Bobby Witt Jr.', 'wittbo', '677951', 'jr'),
+    ('Vladimir Guerrero Jr.', 'guerrvl', '665489', 'jr'),
+    ('Ronald Acuña Jr.', 'acunaro', '660670', 'jr'),
+    ('José Ramírez', 'ramirjo', '608070', None),
+    ('Elly De La Cruz', 'delacel', '682829', None),
+    ('AJ Smith-Shawver', 'smithaj', '700363', None),
+    ('J.D. Martinez', 'martijd', '502110', None),
+    ("Logan O'Hoppe", 'ohopplo', '681351', None),
+])
+def test_build_derives_stem_from_name_slug(resolver, name, stem, mlb_id, suffix):
+    entry = resolver.entries[name]
+    assert entry['stem'] == stem
+    assert entry['mlb_id'] == mlb_id
+    assert entry['suffix'] == suffix
+    assert entry['player_id'] is None
+
+
+def test_build_keeps_confirmed_and_rejected_ids(resolver, mlb_people):
+    resolver.confirm('Aaron Judge', 'judgeaa01')
+    resolver.reject('Bobby Witt Jr.', 'wittbo02')
+    resolver.build(mlb_people)
+    assert resolver.entries['Aaron Judge']['player_id'] == 'judgeaa01'
+    assert resolver.entries['Bobby Witt Jr.']['rejected'] == ['wittbo02']
+
+
+# ----------------------
+# Candidate Ordering
+# ----------------------
+def test_candidates_in_number_order(resolver):
+    assert resolver.candidates('Aaron Judge') == ['judgeaa01', 'judgeaa02', 'judgeaa03']
+
+
+def test_suffixed_player_tries_02_first(resolver):
+    assert resolver.candidates('Bobby Witt Jr.') == ['wittbo02', 'wittbo01', 'wittbo03']
+    assert resolver.candidates('Ronald Acuña Jr.') == ['acunaro02', 'acunaro01', 'acunaro03']
+
+
+def test_candidates_skip_ids_claimed_by_another_player(resolver):
+    # Josh and Johan Rojas share the stem 'rojasjo'
+    resolver.confirm('Josh Rojas', 'rojasjo01')
+    assert resolver.candidates('Johan Rojas') == ['rojasjo02', 'rojasjo03']
+    resolver.reject('Johan Rojas', 'rojasjo02')
+    assert resolver.candidates('Johan Rojas') == ['rojasjo03']
+    resolver.reject('Johan Rojas', 'rojasjo03')
+    assert resolver.candidates('Johan Rojas') == []
+
+
+def test_resolved_player_has_url_and_no_candidates(resolver):
+    resolver.confirm('Aaron Judge', 'judgeaa01')
+    assert resolver.resolve('Aaron Judge') == 'https://www.baseball-reference.com/players/j/judgeaa01.shtml'
+    assert resolver.candidates('Aaron Judge') == []
+    assert 'Aaron Judge' not in resolver.unresolved()
+    assert resolver.resolve('Unknown Player') is None
+    assert resolver.candidates('Unknown Player') == []
+
+
+# ----------------------
+# Page Verification
+# ----------------------
+def test_verify_page_accepts_the_players_page():
+    assert verify_page('Aaron Judge', page('Aaron Judge'))
+    assert verify_page('Jose Ramirez', page('José Ramírez'))
+    assert verify_page('José Ramírez', page('JosÃ© RamÃ­rez'))
+    assert verify_page('JD Martinez', page('J.D. Martinez'))
+
+
+def test_verify_page_rejects_another_players_page():
+    assert verify_page('Bryce Harper', page('Brian Harper')) is False
+    assert verify_page('Bobby Witt Jr.', page('Bobby Witt')) is False
+
+
+def test_verify_page_without_header_is_undecided():
+    assert verify_page('Aaron Judge', '<html><body>Checking your browser...</body></html>') is None
+
+
+def test_seed_from_raw_confirms_and_rejects(tmp_path, resolver):
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    (raw_dir / 'Aaron Judge.html').write_text(page('Aaron Judge', 'judgeaa01'), encoding='utf-8')
+    (raw_dir / 'Bobby Witt Jr..html').write_text(page('Bobby Witt', 'wittbo01'), encoding='utf-8')
+    (raw_dir / 'Johan Rojas.html').write_text('<html>no header</html>', encoding='utf-8')
+
+    assert resolver.seed_from_raw(str(raw_dir)) == 1
+    assert resolver.entries['Aaron Judge']['player_id'] == 'judgeaa01'
+    assert resolver.entries['Bobby Witt Jr.']['player_id'] is None
+    assert resolver.candidates('Bobby Witt Jr.') == ['wittbo02', 'wittbo03']
+    assert resolver.entries['Johan Rojas']['rejected'] == []
+
+
+def test_index_round_trip(tmp_path, resolver):
+    resolver.confirm('Aaron Judge', 'judgeaa01')
+    resolver.reject('Johan Rojas', 'rojasjo01')
+    resolver.save()
+    loaded = PlayerResolver(resolver.path)
+    assert loaded.entries == resolver.entries
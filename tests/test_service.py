@@ -0,0 +1,206 @@
+"""
+WAR scoring service (src/models/service.py): request validation, and every endpoint served on localhost from stub
+tables and freshly fitted model files.
+"""
+
+import http.client
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression
+
+from src.models import service
+from src.models.features import FeatureTransformer, save_model
+from src.models.service import parse_batch_request
+
+
+def test_batch_request_defaults():
+    assert parse_batch_request(b'') == ([], 'batter')
+    assert parse_batch_request(b'{}') == ([], 'batter')
+
+
+def test_batch_request_fields():
+    body = b'{"type": "pitcher", "names": ["Tarik Skubal", "Paul Skenes"]}'
+    assert parse_batch_request(body) == (['Tarik Skubal', 'Paul Skenes'], 'pitcher')
+
+
+@pytest.mark.parametrize('body, message', [
+    (b'["Aaron Judge"]', 'JSON object'),
+    (b'"Aaron Judge"', 'JSON object'),
+    (b'null', 'JSON object'),
+    (b'{"names": "Aaron Judge"}', "'names' must be a list"),
+    (b'{"names": {"Aaron Judge": 1}}', "'names' must be a list"),
+    (b'{"names": ["Aaron Judge", 99]}', "'names' must be a list"),
+    (b'{"names": [], "type": ["batter"]}', 'type must be'),
+    (b'{"names": [', 'Expecting'),
+])
+def test_malformed_batch_request_is_a_value_error(body, message):
+    # The handler answers ValueError with 400 and the message
+    with pytest.raises(ValueError, match=message):
+        parse_batch_request(body)
+
+
+# ----------------------
+# Service on Localhost
+# ----------------------
+class StubPlayerData:
+    """
+    Fixed tables in place of the database-backed data layer.
+    """
+    def __init__(self, tables):
+        self.tables = tables
+
+    def raw(self, table):
+        return self.tables[table]
+
+    def stats(self):
+        return {}
+
+
+def player_table(prefix, war_col):
+    # WAR is linear in the one feature, so a LinearRegression predicts it exactly
+    df = pd.DataFrame({'fullName': [f'{prefix} {i}' for i in range(6)], 'hr': [0.0, 4.0, 8.0, 12.0, 16.0, 20.0],
+                       'salary': [1e6, 8e6, 2e6, 30e6, 5e6, 10e6]})
+    df[war_col] = df['hr'] / 4
+    return df
+
+
+def save_fitted(df, war_col, path, model=None):
+    transformer = FeatureTransformer(war_col).fit(df)
+    if model is None:
+        model = LinearRegression().fit(transformer.transform(df), transformer.transform_target(df[war_col]))
+    save_model(model, transformer, path)
+
+
+@pytest.fixture
+def scoring(tmp_path, monkeypatch):
+    tables = {'batters': player_table('Batter', 'b_war'), 'pitchers': player_table('Pitcher', 'p_war')}
+    monkeypatch.setattr(service, 'get_player_data', lambda: StubPlayerData(tables))
+    paths = {'batter': str(tmp_path / 'batters_model.joblib'), 'pitcher': str(tmp_path / 'pitchers_model.joblib')}
+    save_fitted(tables['batters'], 'b_war', paths['batter'])
+    save_fitted(tables['pitchers'], 'p_war', paths['pitcher'])
+    server = service.create_server(port=0, model_paths=paths)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.tables = tables
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def call(server, method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_player_found_and_not_found(scoring):
+    status, payload = call(scoring, 'GET', '/player?name=Batter+3&type=batter')
+    assert status == 200
+    assert payload['status'] == 'ok'
+    assert payload['actual_war'] == 3.0
+    assert payload['predicted_war'] == pytest.approx(3.0)
+    status, payload = call(scoring, 'GET', '/player?name=Nobody&type=pitcher')
+    assert status == 200
+    assert payload == {'fullName': 'Nobody', 'type': 'pitcher', 'actual_war': None, 'predicted_war': None,
+                       'status': 'not_found'}
+
+
+def test_batch_keeps_request_order(scoring):
+    body = json.dumps({'type': 'pitcher', 'names': ['Pitcher 5', 'Nobody', 'Pitcher 1']})
+    status, payload = call(scoring, 'POST', '/batch', body)
+    assert status == 200
+    results = payload['results']
+    assert [row['fullName'] for row in results] == ['Pitcher 5', 'Nobody', 'Pitcher 1']
+    assert [row['status'] for row in results] == ['ok', 'not_found', 'ok']
+    assert results[0]['predicted_war'] == pytest.approx(5.0)
+
+
+def test_undervalued_orders_by_war_per_dollar(scoring):
+    df = scoring.tables['batters']
+    expected = (df['b_war'] / df['salary']).sort_values(ascending=False).index
+    status, payload = call(scoring, 'GET', '/undervalued?type=batter&n=3')
+    assert status == 200
+    assert [row['fullName'] for row in payload['results']] == df.loc[expected[:3], 'fullName'].tolist()
+    values = [row['value'] for row in payload['results']]
+    assert values == sorted(values, reverse=True)
+    status, payload = call(scoring, 'GET', f'/undervalued?type=batter&n={service.MAX_UNDERVALUED}')
+    assert len(payload['results']) == len(df)
+
+
+@pytest.mark.parametrize('method, path, body, message', [
+    ('GET', '/player?name=Batter+1&type=catcher', None, 'type must be'),
+    ('GET', '/player?type=batter', None, "missing 'name'"),
+    ('POST', '/batch', b'["Batter 1"]', 'JSON object'),
+    ('POST', '/batch', b'{"names": "Batter 1"}', "'names' must be a list"),
+    ('GET', '/undervalued?type=batter&n=-3', None, "'n' must be between"),
+    ('GET', '/undervalued?type=batter&n=0', None, "'n' must be between"),
+    ('GET', f'/undervalued?type=batter&n={service.MAX_UNDERVALUED + 1}', None, "'n' must be between"),
+    ('GET', '/undervalued?type=batter&n=ten', None, 'invalid literal'),
+])
+def test_bad_requests_are_400(scoring, method, path, body, message):
+    status, payload = call(scoring, method, path, body)
+    assert status == 400
+    assert message in payload['error']
+
+
+def test_stats_counts_requests(scoring):
+    for _ in range(3):
+        call(scoring, 'GET', '/player?name=Batter+1&type=batter')
+    call(scoring, 'GET', '/player?type=batter')
+    call(scoring, 'GET', '/health')
+    status, payload = call(scoring, 'GET', '/stats')
+    assert status == 200
+    assert payload['requests'] == 5
+    player = payload['endpoints']['/player']
+    assert player['requests'] == 4
+    assert player['errors'] == 1
+    assert {'p50_ms', 'p99_ms', 'requests_per_sec'} <= set(player)
+    assert player['p50_ms'] <= player['p99_ms']
+    assert '/stats' not in payload['endpoints']
+
+
+def bump_mtime(path):
+    # The reload check compares mtime and size; make sure a rewrite within the same clock tick still registers
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_hot_reload_after_model_file_is_replaced(scoring):
+    path = scoring.service.model_paths['batter']
+    assert call(scoring, 'GET', '/player?name=Batter+3&type=batter')[1]['predicted_war'] == pytest.approx(3.0)
+    # A model predicting the top of the scaled range for everyone
+    df = scoring.tables['batters']
+    constant = DummyRegressor(strategy='constant', constant=1.0).fit(np.zeros((len(df), 1)), np.ones(len(df)))
+    save_fitted(df, 'b_war', path, constant)
+    bump_mtime(path)
+    assert call(scoring, 'GET', '/player?name=Batter+3&type=batter')[1]['predicted_war'] == pytest.approx(5.0)
+    assert call(scoring, 'GET', '/stats')[1]['reloads'] == 1
+
+
+def test_unreadable_model_file_keeps_the_loaded_model(scoring):
+    path = scoring.service.model_paths['batter']
+    assert call(scoring, 'GET', '/player?name=Batter+3&type=batter')[1]['predicted_war'] == pytest.approx(3.0)
+    with open(path, 'rb') as f:
+        data = f.read()
+    # As if a retrain were caught halfway through writing the file
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    bump_mtime(path)
+    status, payload = call(scoring, 'GET', '/player?name=Batter+3&type=batter')
+    assert status == 200
+    assert payload['predicted_war'] == pytest.approx(3.0)
+    # The next request retries once the file is whole again
+    save_fitted(scoring.tables['batters'], 'b_war', path)
+    bump_mtime(path)
+    assert call(scoring, 'GET', '/player?name=Batter+3&type=batter')[0] == 200
+    assert call(scoring, 'GET', '/stats')[1]['reloads'] == 1
@@ -0,0 +1,124 @@
+"""
+Streaming gather -> clean (src/data/stream.py): arrival order, batched cache writes and shutdown when either the
+crawl or the parsers fail.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.synthetic import player_page
+from src.data import stream
+from src.data.clean_data import DB_PATH, PARSE_CACHE_PATH, load_parse_cache
+from src.data.db import write_connection
+from src.data.load_data import raw_path
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/processed')
+    return tmp_path
+
+
+def pages(count):
+    return [player_page(i, page_kb=1) for i in range(count)]
+
+
+def stub_crawl(corpus, fail_after=None, seen=None):
+    """
+    crawl(pages=...) stand-in that hands the corpus to the destination and optionally raises partway through.
+    """
+    def crawl(pages=None):
+        for i, (name, html) in enumerate(corpus):
+            if fail_after is not None and i == fail_after:
+                raise RuntimeError("connection reset")
+            pages.save(name, html)
+            if seen is not None:
+                seen.append(name)
+        return []
+    return crawl
+
+
+def crawl_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'crawl']
+
+
+# ----------------------
+# Consumer
+# ----------------------
+def test_consume_pages_keeps_arrival_order_and_writes_every_batch(workspace, monkeypatch):
+    corpus = pages(7)
+
+    def slow_parse(path, text):
+        # Later pages finish first
+        time.sleep(0.01 * (len(corpus) - int(path.split('#')[1])))
+        return {'salary': 0, 'messages': []}, path, len(text)
+
+    monkeypatch.setattr(stream, 'parse_page', slow_parse)
+    items = queue.Queue()
+    for i, (_, html) in enumerate(corpus):
+        items.put((f'page#{i}', html))
+    items.put(None)
+    conn = write_connection(PARSE_CACHE_PATH)
+    load_parse_cache(conn)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parsed = stream.consume_pages(items, conn, executor, max_in_flight=4, batch_size=3)
+    assert parsed == [f'page#{i}' for i in range(len(corpus))]
+    assert sorted(load_parse_cache(conn)) == sorted(parsed)
+    conn.close()
+
+
+# ----------------------
+# Gather and Clean
+# ----------------------
+@pytest.mark.parametrize('workers, write_raw', [(1, True), (1, False), (2, True)])
+def test_stream_builds_tables_from_every_page(workspace, workers, write_raw):
+    corpus = pages(12)
+    errors = stream.gather_and_clean(workers=workers, write_raw=write_raw, queue_size=2, batch_size=5,
+                                     crawl=stub_crawl(corpus))
+    assert errors == []
+    conn = write_connection(PARSE_CACHE_PATH)
+    cache = load_parse_cache(conn)
+    conn.close()
+    assert sorted(cache) == sorted(raw_path(name) for name, _ in corpus)
+    assert all((cached['mtime'] is None) != write_raw for cached in cache.values())
+    assert os.path.exists('data/processed/batters.csv') and os.path.exists('data/processed/pitchers.csv')
+    assert os.path.exists('data/raw') == write_raw
+    assert not crawl_threads()
+
+
+def test_crawl_failure_stops_the_consumer_and_keeps_parsed_pages(workspace):
+    corpus = pages(10)
+    seen = []
+    with pytest.raises(RuntimeError, match="connection reset"):
+        stream.gather_and_clean(workers=1, queue_size=2, batch_size=3, crawl=stub_crawl(corpus, 6, seen))
+    assert not crawl_threads()
+    assert len(seen) == 6
+    # Pages parsed before the failure are committed to the parse cache; the tables are not built
+    conn = write_connection(PARSE_CACHE_PATH)
+    assert sorted(load_parse_cache(conn)) == sorted(raw_path(name) for name in seen)
+    conn.close()
+    assert not os.path.exists(DB_PATH)
+    assert not os.path.exists('data/processed/batters.csv')
+
+
+def test_parser_failure_stops_a_blocked_crawl(workspace, monkeypatch):
+    corpus = pages(50)
+    seen = []
+
+    def failing_parse(path, text):
+        raise ValueError(f"cannot parse {path}")
+
+    monkeypatch.setattr(stream, 'parse_page', failing_parse)
+    start = time.monotonic()
+    with pytest.raises(ValueError, match="cannot parse"):
+        stream.gather_and_clean(workers=1, queue_size=2, crawl=stub_crawl(corpus, seen=seen))
+    # The crawl was blocked on the full queue and gave up instead of handing over all 50 pages
+    assert not crawl_threads()
+    assert len(seen) < len(corpus)
+    assert time.monotonic() - start < 5 * stream.POLL_SECONDS